@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Benchmark cho lớp lưu trữ từ vựng
+
+Chạy:
+python scripts/benchmark_vocabulary.py connections --sizes 10000 100000
+python scripts/benchmark_vocabulary.py random --sizes 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Thêm src vào path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hello_world_app.core.prefix_index import PrefixIndex
+from hello_world_app.core.vocabulary_cache import VocabularyCache
+from hello_world_app.core.vocabulary_io import export_vocabulary_file
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+from hello_world_app.core.vocabulary_record import VocabularyRecord
+from hello_world_app.core.write_buffer import WriteBuffer
+
+DEFAULT_SIZES = [10000, 100000]
+
+
+def seed_database(db_path: str, size: int) -> VocabularyManager:
+    """Tạo database với `size` từ vựng giả lập"""
+    manager = VocabularyManager(db_path)
+    conn = manager.db.get_connection()
+    with conn:
+        conn.executemany('''
+            INSERT INTO vocabulary (word, definition, example, pronunciation, part_of_speech,
+                                    context_sentences, synonyms, antonyms, word_key, due_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (
+            (f"word{i:07d}", f"definition {i}", f"example sentence for word {i}",
+             f"/w{i}/", "noun", f"context sentence number {i}. " * 5,
+             f"syn{i}", f"ant{i}", f"word{i:07d}")
+            for i in range(size)
+        ))
+    return manager
+
+
+def measure(label: str, func, iterations: int) -> float:
+    """Chạy func `iterations` lần và in số thao tác/giây"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    ops = iterations / elapsed if elapsed > 0 else float('inf')
+    print(f"  {label:<40} {ops:>12,.0f} ops/s")
+    return ops
+
+
+def bench_connections(size: int, workdir: str):
+    """So sánh kết nối lâu dài với mở/đóng kết nối cho mỗi thao tác"""
+    db_path = os.path.join(workdir, f'connections_{size}.db')
+    manager = seed_database(db_path, size)
+
+    def per_call_lookup(i):
+        conn = sqlite3.connect(db_path)
+        conn.execute('SELECT * FROM vocabulary WHERE word = ?', (f"word{i % size:07d}",)).fetchone()
+        conn.close()
+
+    def persistent_lookup(i):
+        conn = manager.db.get_connection()
+        conn.execute('SELECT * FROM vocabulary WHERE word = ?', (f"word{i % size:07d}",)).fetchone()
+
+    def per_call_review(i):
+        conn = sqlite3.connect(db_path)
+        conn.execute('''
+            UPDATE vocabulary SET last_reviewed = CURRENT_TIMESTAMP,
+                                  review_count = review_count + 1
+            WHERE id = ?
+        ''', (i % size + 1,))
+        conn.commit()
+        conn.close()
+
+    def persistent_review(i):
+        manager.mark_as_reviewed(i % size + 1)
+
+    print(f"\n[connections] {size:,} từ")
+    measure("point lookup (connect mỗi lần)", per_call_lookup, 2000)
+    measure("point lookup (kết nối lâu dài)", persistent_lookup, 2000)
+    measure("mark_as_reviewed (connect mỗi lần)", per_call_review, 500)
+    measure("mark_as_reviewed (kết nối lâu dài)", persistent_review, 500)
+    manager.close()
+
+
+def bench_search(size: int, workdir: str):
+    """So sánh tìm kiếm FTS5 với quét LIKE toàn bảng"""
+    db_path = os.path.join(workdir, f'search_{size}.db')
+    manager = seed_database(db_path, size)
+    terms = [f"word{i:07d}"[-6:] for i in range(0, size, max(1, size // 50))]
+
+    mismatches = 0
+    for term in terms:
+        fts_ids = {v['id'] for v in manager.search_vocabulary(term)}
+        manager.fts_enabled = False
+        like_ids = {v['id'] for v in manager.search_vocabulary(term)}
+        manager.fts_enabled = True
+        mismatches += fts_ids != like_ids
+
+    print(f"\n[search] {size:,} từ ({len(terms)} truy vấn, {mismatches} kết quả khác nhau)")
+    manager.fts_enabled = False
+    like_ops = measure("search_vocabulary (LIKE)", lambda i: manager.search_vocabulary(terms[i % len(terms)]), 20)
+    manager.fts_enabled = True
+    fts_ops = measure("search_vocabulary (FTS5)", lambda i: manager.search_vocabulary(terms[i % len(terms)]), 200)
+    print(f"  độ trễ trung bình: LIKE {1000 / like_ops:.2f} ms, FTS5 {1000 / fts_ops:.2f} ms")
+    manager.close()
+
+
+def first_rows(func, count: int = 50):
+    """Đo thời gian có `count` hàng đầu và bộ nhớ đỉnh khi đọc hết kết quả"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func()
+    iterator = iter(rows)
+    for _ in range(count):
+        next(iterator, None)
+    first = time.perf_counter() - start
+    for _ in iterator:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, peak
+
+
+def bench_pagination(size: int, workdir: str):
+    """So sánh get_all_vocabulary với iter_vocabulary / get_vocabulary_page"""
+    db_path = os.path.join(workdir, f'pagination_{size}.db')
+    manager = seed_database(db_path, size)
+
+    print(f"\n[pagination] {size:,} từ")
+    for label, func in (
+        ("get_all_vocabulary()", manager.get_all_vocabulary),
+        ("iter_vocabulary()", manager.iter_vocabulary),
+        ("get_vocabulary_page(limit=50)", lambda: manager.get_vocabulary_page(limit=50)),
+    ):
+        first, peak = first_rows(func)
+        print(f"  {label:<40} 50 hàng đầu: {first * 1000:8.2f} ms   bộ nhớ đỉnh: {peak / 1024 / 1024:8.2f} MiB")
+    manager.close()
+
+
+def bench_records(size: int, workdir: str):
+    """Bộ nhớ mỗi hàng: dict đủ các cột (cách cũ) so với VocabularyRecord nạp lười"""
+    db_path = os.path.join(workdir, f'records_{size}.db')
+    manager = seed_database(db_path, size)
+    conn = manager.db.get_connection()
+    columns = VocabularyRecord.FIELDS
+
+    def legacy_dicts():
+        rows = conn.execute(f"SELECT {', '.join(columns)} FROM vocabulary").fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    print(f"\n[records] {size:,} từ")
+    for label, func in ((f"dict {len(columns)} khóa", legacy_dicts),
+                        ("VocabularyRecord", manager.get_all_vocabulary)):
+        tracemalloc.start()
+        rows = func()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:<40} {current / len(rows):8.0f} byte/hàng   tổng {current / 1024 / 1024:8.2f} MiB")
+        del rows
+    manager.close()
+
+
+def bench_import(size: int, workdir: str):
+    """Nhập `size` từ: add_vocabulary từng từ so với add_vocabulary_many"""
+    records = [{'word': f"import{i:07d}", 'definition': f"definition {i}"} for i in range(size)]
+
+    print(f"\n[import] {size:,} từ")
+    manager = VocabularyManager(os.path.join(workdir, f'import_single_{size}.db'))
+    start = time.perf_counter()
+    for record in records:
+        manager.add_vocabulary(record['word'], record['definition'])
+    single = time.perf_counter() - start
+    manager.close()
+
+    manager = VocabularyManager(os.path.join(workdir, f'import_many_{size}.db'))
+    start = time.perf_counter()
+    manager.add_vocabulary_many(records)
+    many = time.perf_counter() - start
+    manager.close()
+
+    print(f"  {'add_vocabulary (mỗi từ một commit)':<40} {size / single:>12,.0f} từ/s")
+    print(f"  {'add_vocabulary_many (một transaction)':<40} {size / many:>12,.0f} từ/s")
+
+
+def bench_random(size: int, workdir: str):
+    """Lấy mẫu ngẫu nhiên: ORDER BY RANDOM() so với dò id theo khóa chính"""
+    db_path = os.path.join(workdir, f'random_{size}.db')
+    manager = seed_database(db_path, size)
+    conn = manager.db.get_connection()
+
+    def order_by_random(_):
+        conn.execute(f'''
+            SELECT {manager.LIST_COLUMNS} FROM vocabulary ORDER BY RANDOM() LIMIT 20
+        ''').fetchall()
+
+    print(f"\n[random] {size:,} từ, 20 từ mỗi lần")
+    measure("ORDER BY RANDOM() LIMIT 20", order_by_random, 5)
+    measure("get_random_vocabulary(20)", lambda _: manager.get_random_vocabulary(20), 500)
+    measure("get_random_vocabulary(20, weighted=True)",
+            lambda _: manager.get_random_vocabulary(20, weighted=True), 500)
+    manager.close()
+
+
+def bench_due(size: int, workdir: str):
+    """Hàng đợi ôn tập: get_due theo chỉ mục due_at so với sắp xếp toàn bảng"""
+    db_path = os.path.join(workdir, f'due_{size}.db')
+    manager = seed_database(db_path, size)
+    conn = manager.db.get_connection()
+    # Rải thời điểm đến hạn trong 60 ngày quanh hiện tại
+    with conn:
+        conn.execute("UPDATE vocabulary SET due_at = datetime('now', ((id * 7919) % 86400 - 43200) || ' minutes')")
+
+    def full_sort(_):
+        conn.execute(f'''
+            SELECT {manager.LIST_COLUMNS} FROM vocabulary NOT INDEXED
+            WHERE due_at <= datetime('now') ORDER BY due_at LIMIT 20
+        ''').fetchall()
+
+    print(f"\n[due] {size:,} từ, 20 từ mỗi lần")
+    measure("quét toàn bảng + sắp xếp", full_sort, 20)
+    due_ops = measure("get_due(20)", lambda _: manager.get_due(20), 2000)
+    print(f"  độ trễ trung bình get_due: {1000 / due_ops:.3f} ms")
+    measure("grade", lambda i: manager.grade(i % size + 1, 3 + i % 3), 500)
+    manager.close()
+
+
+def bench_cache(size: int, workdir: str):
+    """Làm mới danh sách khi dữ liệu không đổi: đọc lại từ đĩa so với bộ nhớ đệm"""
+    db_path = os.path.join(workdir, f'cache_{size}.db')
+    seed_database(db_path, size).close()
+    plain = VocabularyManager(db_path)
+    cached = VocabularyManager(db_path, cache=VocabularyCache())
+    cached.get_all_vocabulary()
+
+    def refresh(manager):
+        for _ in manager.iter_vocabulary():
+            pass
+        manager.get_vocabulary_stats()
+
+    print(f"\n[cache] {size:,} từ, làm mới danh sách + thống kê")
+    measure("không có bộ nhớ đệm", lambda _: refresh(plain), 5)
+    measure("bộ nhớ đệm (chỉ lấy iterator + thống kê)",
+            lambda _: (cached.iter_vocabulary(), cached.get_vocabulary_stats()), 20000)
+    measure("bộ nhớ đệm (duyệt hết danh sách)", lambda _: refresh(cached), 50)
+    plain.close()
+    cached.close()
+
+
+def bench_buffer(size: int, workdir: str):
+    """Ôn tập liên tiếp: một commit mỗi lần so với gom qua WriteBuffer"""
+    db_path = os.path.join(workdir, f'buffer_{size}.db')
+    manager = seed_database(db_path, size)
+    reviews = 2000
+
+    print(f"\n[buffer] {size:,} từ, {reviews:,} lần ôn tập")
+    measure("mỗi lần ôn một commit", lambda i: manager.mark_as_reviewed(i % size + 1), reviews)
+    for durability in ('normal', 'full'):
+        buffer = WriteBuffer(manager, flush_interval_ms=250, max_operations=100, durability=durability)
+        measure(f"write buffer ({durability}, gồm cả flush)",
+                lambda i: buffer.mark_as_reviewed(i % size + 1) if i < reviews - 1 else buffer.close(),
+                reviews)
+        print(f"  {'số lần commit':<40} {buffer.commits:>12,}")
+    manager.close()
+
+
+def bench_prefix(size: int, workdir: str):
+    """Gợi ý khi gõ: PrefixIndex trong bộ nhớ so với LIKE 'tiền tố%' trên SQLite"""
+    db_path = os.path.join(workdir, f'prefix_{size}.db')
+    manager = seed_database(db_path, size)
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.load(manager.get_word_keys())
+    print(f"\n[prefix] {size:,} từ, nạp chỉ mục {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    prefixes = [f"word{i % size:07d}"[:-2] for i in range(0, size, max(1, size // 1000))]
+    cursor = manager.db.get_connection().cursor()
+    measure("SQLite word LIKE 'prefix%' LIMIT 10",
+            lambda i: cursor.execute("SELECT word FROM vocabulary WHERE word LIKE ? LIMIT 10",
+                                     (prefixes[i % len(prefixes)] + '%',)).fetchall(), 200)
+    ops = measure("PrefixIndex.complete", lambda i: index.complete(prefixes[i % len(prefixes)]), 20000)
+    print(f"  {'độ trễ mỗi lần gõ':<40} {1e6 / ops:>9,.1f} µs")
+    measure("PrefixIndex.lookup (kiểm tra trùng)", lambda i: index.lookup(prefixes[i % len(prefixes)]), 20000)
+    manager.close()
+
+
+def random_words(count: int, seed: int = 42) -> list:
+    """Từ giả lập ghép từ âm tiết, phân bố trigram gần với từ thật hơn 'wordNNNN'"""
+    rng = random.Random(seed)
+    onsets = ['', 'b', 'c', 'd', 'f', 'g', 'h', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v',
+              'br', 'cl', 'dr', 'pr', 'st', 'tr', 'ch', 'sh', 'th']
+    vowels = ['a', 'e', 'i', 'o', 'u', 'ea', 'ie', 'ou', 'ai']
+    codas = ['', '', 'n', 'r', 's', 't', 'l', 'm', 'nd', 'st', 'ck', 'ng']
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(onsets) + rng.choice(vowels) + rng.choice(codas)
+                          for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Một lỗi gõ: hoán vị, thay, thiếu hoặc thừa một ký tự"""
+    position = rng.randrange(len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    if kind == 1:
+        return word[:position] + rng.choice('aeiourst') + word[position + 1:]
+    if kind == 2:
+        return word[:position] + word[position + 1:]
+    return word[:position] + rng.choice('aeiourst') + word[position:]
+
+
+def bench_fuzzy(size: int, workdir: str):
+    """Tìm kiếm gần đúng: chỉ mục trigram + edit distance có giới hạn"""
+    db_path = os.path.join(workdir, f'fuzzy_{size}.db')
+    manager = VocabularyManager(db_path)
+    words = random_words(size)
+    manager.add_vocabulary_many({'word': word, 'definition': f"definition of {word}"} for word in words)
+
+    start = time.perf_counter()
+    manager.search_vocabulary_fuzzy("warmup")
+    print(f"\n[fuzzy] {size:,} từ, dựng chỉ mục {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(7)
+    queries = [(word, typo(word, rng)) for word in rng.sample(words, 200)]
+    found = sum(1 for word, query in queries
+                if word in [v['word'] for v in manager.search_vocabulary_fuzzy(query)])
+    print(f"  {'tìm thấy từ đúng':<40} {found:>9}/{len(queries)}")
+
+    fuzzy_index = manager._get_fuzzy_index()
+    latencies = []
+    for _, query in queries:
+        started = time.perf_counter()
+        manager.search_vocabulary_fuzzy(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"  {'search_vocabulary_fuzzy trung vị':<40} {latencies[len(latencies) // 2]:>9.2f} ms")
+    print(f"  {'search_vocabulary_fuzzy p95':<40} {latencies[int(len(latencies) * 0.95)]:>9.2f} ms")
+    measure("FuzzyIndex.search", lambda i: fuzzy_index.search(queries[i % len(queries)][1]), 1000)
+    manager.close()
+
+
+def bench_export(size: int, workdir: str):
+    """Xuất `size` từ ra từng định dạng: thông lượng và đỉnh bộ nhớ Python"""
+    manager = seed_database(os.path.join(workdir, f'export_{size}.db'), size)
+
+    print(f"\n[export] {size:,} từ")
+    for file_format, extension in (('csv', 'csv'), ('jsonl', 'jsonl'), ('anki', 'txt')):
+        path = os.path.join(workdir, f'export_{size}.{extension}')
+        start = time.perf_counter()
+        export_vocabulary_file(manager, path, file_format)
+        elapsed = time.perf_counter() - start
+        # Đo bộ nhớ ở lần chạy riêng vì tracemalloc làm chậm đáng kể
+        tracemalloc.start()
+        export_vocabulary_file(manager, path, file_format)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {file_format:<8} {size / elapsed:>12,.0f} từ/s   đỉnh bộ nhớ {peak / 1024:>10,.0f} KiB")
+        os.remove(path)
+    manager.close()
+
+
+def bench_tags(size: int, workdir: str):
+    """Lọc theo nhãn: phép toán bit trong bộ nhớ so với truy vấn SQL tương đương"""
+    manager = seed_database(os.path.join(workdir, f'tags_{size}.db'), size)
+    conn = manager.db.get_connection()
+    rng = random.Random(3)
+    # travel ~20%, mastered ~30%, ielts ~5%
+    with conn:
+        conn.executemany('INSERT INTO tags (name) VALUES (?)', [('travel',), ('mastered',), ('ielts',)])
+        tag_ids = dict(conn.execute('SELECT name, id FROM tags'))
+        conn.executemany('INSERT INTO vocabulary_tags (tag_id, vocab_id) VALUES (?, ?)', (
+            (tag_ids[tag], vocab_id) for vocab_id in range(1, size + 1)
+            for tag, share in (('travel', 0.2), ('mastered', 0.3), ('ielts', 0.05))
+            if rng.random() < share))
+
+    start = time.perf_counter()
+    tag_index = manager._get_tag_index()
+    print(f"\n[tags] {size:,} từ, dựng chỉ mục {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    query = "tag:travel AND NOT tag:mastered"
+    measure("TagIndex.match (ids)", lambda i: tag_index.match(query), 200)
+    measure("TagIndex.match (50 id đầu)", lambda i: tag_index.match(query, 50), 2000)
+    measure("filter_by_tags (50 từ, get_many)", lambda i: manager.filter_by_tags(query, 50), 500)
+    sql = '''
+        SELECT vt.vocab_id FROM vocabulary_tags vt
+        WHERE vt.tag_id = ? AND NOT EXISTS (
+            SELECT 1 FROM vocabulary_tags m WHERE m.tag_id = ? AND m.vocab_id = vt.vocab_id)
+        ORDER BY vt.vocab_id DESC
+    '''
+    measure("SQL tương đương (ids)",
+            lambda i: conn.execute(sql, (tag_ids['travel'], tag_ids['mastered'])).fetchall(), 20)
+    manager.close()
+
+
+# Từ chức năng thường gặp, chiếm khoảng một nửa số từ trong câu thật
+COMMON_WORDS = ('the of and to a in is that it for was on are as with his they at be this have '
+                'from or one had by but not what all were we when your can said there use an each '
+                'which she do how their if will up other about out many then them these so some her '
+                'would make like him into time has look two more write go see number no way could '
+                'people my than first been call who its now find long down day did get come made '
+                'may part over new sound take only little work know place year live me back give '
+                'most very after thing our just name good sentence man think say great where help').split()
+
+
+def random_text(rng: random.Random, content_words: list, sentences: int) -> str:
+    """Văn bản giả lập: câu 8-16 từ, một nửa là từ chức năng theo phân bố Zipf"""
+    weights = [1 / (rank + 1) for rank in range(len(COMMON_WORDS))]
+    parts = []
+    for _ in range(sentences):
+        length = rng.randint(8, 16)
+        common = rng.choices(COMMON_WORDS, weights, k=length)
+        words = [word if rng.random() < 0.5 else rng.choice(content_words) for word in common]
+        parts.append(' '.join(words).capitalize() + '.')
+    return ' '.join(parts)
+
+
+def drop_file_cache(db_path: str):
+    """Bỏ database khỏi page cache của hệ điều hành (Linux) để lần đọc sau thật sự nguội"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in (db_path, db_path + '-wal'):
+        if os.path.exists(path):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def bench_compression(size: int, workdir: str):
+    """Nén cột văn bản dài: kích thước file và thời gian đọc nguội trước/sau khi nén"""
+    rng = random.Random(11)
+    words = random_words(size)
+    content_words = random_words(5000, seed=5)
+    records = [{'word': word,
+                'definition': random_text(rng, content_words, rng.randint(1, 2)),
+                'example': random_text(rng, content_words, rng.randint(1, 2)),
+                'context_sentences': random_text(rng, content_words, rng.randint(3, 5))}
+               for word in words]
+    paths = {}
+    for label in ('text', 'zlib'):
+        paths[label] = os.path.join(workdir, f'compression_{label}_{size}.db')
+        manager = VocabularyManager(paths[label])
+        manager.add_vocabulary_many(records)
+        manager.close()
+
+    print(f"\n[compression] {size:,} từ")
+    manager = VocabularyManager(paths['zlib'])
+    start = time.perf_counter()
+    manager.train_text_dictionary()
+    trained = time.perf_counter() - start
+    start = time.perf_counter()
+    manager.rewrite_text_storage()
+    print(f"  {'huấn luyện từ điển / nén lại':<40} {trained * 1000:>9,.0f} ms / {time.perf_counter() - start:,.1f} s")
+    manager.close()
+
+    for label, db_path in paths.items():
+        conn = sqlite3.connect(db_path)
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        try:
+            # dbstat chỉ có khi SQLite được build với SQLITE_ENABLE_DBSTAT_VTAB
+            table_size = conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = 'vocabulary'").fetchone()[0]
+        except sqlite3.OperationalError:
+            table_size = 0
+        conn.close()
+
+        # "Nguội": kết nối mới (page cache SQLite trống) và file đã bị bỏ khỏi cache hệ điều hành
+        def cold(func):
+            drop_file_cache(db_path)
+            cold_manager = VocabularyManager(db_path)
+            started = time.perf_counter()
+            func(cold_manager)
+            elapsed = (time.perf_counter() - started) * 1000
+            cold_manager.close()
+            return elapsed
+
+        def list_view(cold_manager):
+            for vocab in cold_manager.get_all_vocabulary():
+                for field in ('definition', 'example', 'context_sentences'):
+                    vocab.preview(field)
+
+        def full_text(cold_manager):
+            for batch in cold_manager.iter_export_batches(('word', 'definition', 'example',
+                                                           'context_sentences')):
+                pass
+
+        ids = rng.sample(range(1, size + 1), min(1000, size))
+
+        def detail_view(cold_manager):
+            for vocab_id in ids:
+                vocab = cold_manager.get_vocabulary_by_id(vocab_id)
+                vocab.definition, vocab.example, vocab.context_sentences
+
+        print(f"  {label:<6} file {os.path.getsize(db_path) / 1024 / 1024:>8.1f} MiB   "
+              f"bảng vocabulary {table_size / 1024 / 1024:>7.1f} MiB   "
+              f"danh sách {cold(list_view):>7,.0f} ms   "
+              f"toàn văn {cold(full_text):>7,.0f} ms   "
+              f"{len(ids)} chi tiết {cold(detail_view):>6,.0f} ms")
+
+
+def bench_reviews(size: int, workdir: str):
+    """Số lần ôn mỗi ngày trong một năm: bảng tổng hợp so với gom nhóm nhật ký"""
+    manager = seed_database(os.path.join(workdir, f'reviews_{size}.db'), size)
+    conn = manager.db.get_connection()
+    rng = random.Random(9)
+    per_day = max(1, size // 100)
+    start_day = time.time() - 365 * 86400
+    log_rows = [(rng.randint(1, size), 1,
+                 time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(start_day + day * 86400 + rng.randrange(86400))),
+                 rng.randint(0, 5), rng.randint(500, 15000))
+                for day in range(365) for _ in range(per_day)]
+    started = time.perf_counter()
+    with conn:
+        conn.executemany('''
+            INSERT INTO review_log (vocab_id, deck_id, ts, grade, latency_ms) VALUES (?, ?, ?, ?, ?)
+        ''', log_rows)
+    elapsed = time.perf_counter() - started
+    print(f"\n[reviews] {size:,} từ, {len(log_rows):,} lần ôn trong 365 ngày")
+    print(f"  {'ghi nhật ký + tổng hợp (trigger)':<40} {len(log_rows) / elapsed:>12,.0f} hàng/s")
+
+    first_day = time.strftime('%Y-%m-%d', time.gmtime(time.time() - 364 * 86400))
+    sql = '''
+        SELECT DATE(ts), COUNT(*), SUM(grade < 3) FROM review_log
+        WHERE deck_id = ? AND ts >= ? GROUP BY 1 ORDER BY 1
+    '''
+    measure("get_daily_reviews(365) (review_daily)", lambda i: manager.get_daily_reviews(365), 500)
+    measure("gom nhóm review_log tương đương", lambda i: conn.execute(sql, (1, first_day)).fetchall(), 5)
+    ids = list(range(1, size + 1))
+    measure("grade (lịch ôn + nhật ký + tổng hợp)", lambda i: manager.grade(ids[i % size], 4, 1200), 2000)
+    manager.close()
+
+BENCHMARKS = {
+    'connections': bench_connections,
+    'search': bench_search,
+    'pagination': bench_pagination,
+    'records': bench_records,
+    'import': bench_import,
+    'random': bench_random,
+    'due': bench_due,
+    'cache': bench_cache,
+    'buffer': bench_buffer,
+    'prefix': bench_prefix,
+    'fuzzy': bench_fuzzy,
+    'export': bench_export,
+    'tags': bench_tags,
+    'compression': bench_compression,
+    'reviews': bench_reviews,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VocabularyManager")
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help=f"Benchmark cần chạy: {', '.join(sorted(BENCHMARKS))} (mặc định: tất cả)")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help="Số lượng từ vựng cần sinh")
+    args = parser.parse_args()
+
+    names = args.benchmarks or sorted(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Benchmark không tồn tại: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            for size in args.sizes:
+                BENCHMARKS[name](size, workdir)
+
+
+if __name__ == "__main__":
+    main()
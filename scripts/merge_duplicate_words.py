@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Gộp các từ vựng trùng nhau (khác hoa/thường, khoảng trắng hoặc dạng Unicode)
+
+Khi nâng cấp lên word_key, các bản trùng chỉ được đánh dấu (word_key NULL);
+script này gộp chúng vào bản cũ nhất sau khi sao lưu database.
+
+Chạy:
+python scripts/merge_duplicate_words.py            # chỉ liệt kê các nhóm trùng
+python scripts/merge_duplicate_words.py --apply    # sao lưu rồi gộp
+"""
+
+import argparse
+import os
+import sys
+
+# Thêm src vào path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hello_world_app.core.backup import BackupService
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+from hello_world_app.core.word_key import find_duplicate_groups, merge_duplicates
+from hello_world_app.core.word_relations import rewrite_relations
+
+DEFAULT_DB_PATH = os.path.expanduser('~/.local/share/hello-world-app/vocabulary.db')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gộp từ vựng trùng theo khóa chuẩn hóa")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Đường dẫn database từ vựng")
+    parser.add_argument('--apply', action='store_true',
+                        help="Sao lưu rồi gộp thật (mặc định chỉ liệt kê các nhóm trùng)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"Không tìm thấy database: {args.db}")
+
+    # Mở qua manager để database ở schema mới nhất (và có hàm vocab_text cho trigger FTS)
+    manager = VocabularyManager(args.db)
+    try:
+        conn = manager.db.get_connection()
+        groups = find_duplicate_groups(conn.cursor())
+        for key, count, words in groups:
+            print(f"{key!r}: {count} bản ghi ({words})")
+        print(f"{len(groups)} nhóm trùng, {sum(count - 1 for _, count, _ in groups)} bản ghi sẽ bị gộp")
+
+        if not args.apply or not groups:
+            return 0
+
+        backup = BackupService(args.db).backup_now()
+        if not backup:
+            print("Không sao lưu được database, chưa gộp gì", file=sys.stderr)
+            return 1
+        print(f"Đã sao lưu vào {backup}")
+
+        kept = []
+        with conn:
+            cursor = conn.cursor()
+            keepers = merge_duplicates(cursor)
+            # Bản giữ lại có thể vừa nhận đồng nghĩa/trái nghĩa từ bản trùng
+            for start in range(0, len(keepers), manager.MAX_QUERY_PARAMS):
+                chunk = keepers[start:start + manager.MAX_QUERY_PARAMS]
+                cursor.execute(f'''
+                    SELECT id, word_key, synonyms, antonyms, word FROM vocabulary
+                    WHERE id IN ({', '.join('?' * len(chunk))})
+                ''', chunk)
+                rows = cursor.fetchall()
+                rewrite_relations(cursor, [row[:4] for row in rows])
+                kept.extend(rows)
+
+        for vocab_id, _, _, _, word in kept:
+            print(f"Đã gộp vào {word!r} (id {vocab_id})")
+        print(f"Đã gộp {len(keepers)} nhóm trùng")
+        return 0
+    finally:
+        manager.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -55,6 +55,7 @@ setup(
     entry_points={
         "console_scripts": [
             "hello-world-app=hello_world_app.main:main",
+            "hello-world-vocab=hello_world_app.cli:main",
         ],
     },
     include_package_data=True,
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Dòng lệnh quản lý kho từ vựng (không cần GTK)
+
+hello-world-vocab export vocabulary.csv
+hello-world-vocab export deck.txt --format anki
+hello-world-vocab import words.jsonl --on-conflict update
+hello-world-vocab --deck IELTS import ielts.csv
+hello-world-vocab backup --keep 14
+hello-world-vocab tag journey travel ielts
+hello-world-vocab related happy --depth 2
+hello-world-vocab compress
+hello-world-vocab reviews --days 30
+hello-world-vocab vacuum
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+from .core.backup import get_backup_service
+from .core.config_manager import config_manager
+from .core.maintenance import enable_incremental_vacuum
+from .core.vocabulary_io import (EXPORT_FORMATS, FORMATS, export_vocabulary_file,
+                                 import_vocabulary_file)
+from .core.vocabulary_manager import VocabularyManager
+
+def _print_progress(done: int, total: int):
+    """Tiến độ trên một dòng của stderr"""
+    if total:
+        print(f"\r{done:,}/{total:,} ({done * 100 // total}%)", end='', file=sys.stderr, flush=True)
+    else:
+        print(f"\r{done:,}", end='', file=sys.stderr, flush=True)
+
+def _select_deck(manager: VocabularyManager, name: str, create: bool):
+    """Chuyển sang bộ từ theo tên; lệnh import tạo bộ từ nếu chưa có"""
+    deck_id = manager.get_deck_id(name)
+    if deck_id is None and create:
+        deck_id = manager.add_deck(name)
+    if deck_id is None or not manager.set_deck(deck_id):
+        raise ValueError(f"Không tìm thấy bộ từ: {name}")
+
+def _export(manager: VocabularyManager, args) -> int:
+    written = export_vocabulary_file(manager, args.path, args.format, progress=_print_progress)
+    print(file=sys.stderr)
+    print(f"Đã xuất {written:,} từ vựng ra {args.path}")
+    return 0
+
+def _import(manager: VocabularyManager, args) -> int:
+    counts = import_vocabulary_file(manager, args.path, args.format, on_conflict=args.on_conflict,
+                                    progress=lambda done, _: _print_progress(done, 0))
+    print(file=sys.stderr)
+    print(', '.join(f"{status}: {count:,}" for status, count in sorted(counts.items())) or "Không có dữ liệu")
+    return 1 if counts.get('error') else 0
+
+def _backup(manager: VocabularyManager, args) -> int:
+    service = get_backup_service(manager.db_path)
+    if args.keep is not None:
+        if args.keep < 1:
+            raise ValueError(f"Số bản sao lưu giữ lại phải >= 1: {args.keep}")
+        service.keep = args.keep
+    path = service.backup_now(progress=_print_progress)
+    print(file=sys.stderr)
+    if not path:
+        print(f"Lỗi: {service.last_error}", file=sys.stderr)
+        return 1
+    print(f"Đã sao lưu vào {path}")
+    return 0
+
+def _tag(manager: VocabularyManager, args) -> int:
+    vocab = manager.get_by_word(args.word)
+    if not vocab:
+        raise ValueError(f"Không tìm thấy từ: {args.word}")
+    if args.remove:
+        manager.remove_tags([vocab['id']], args.tags)
+    else:
+        manager.add_tags([vocab['id']], args.tags)
+    print(f"{vocab['word']}: {', '.join(manager.get_tags(vocab['id'])) or '(không có nhãn)'}")
+    return 0
+
+def _related(manager: VocabularyManager, args) -> int:
+    graph = manager.get_word_graph(args.word, args.depth)
+    # Thụt lề theo khoảng cách tới từ gốc, '*' = đã có trong kho
+    for node in graph['nodes'][1:]:
+        owned = "" if node['vocab_id'] is None else " *"
+        print(f"{'  ' * (node['depth'] - 1)}{node['word']}{owned}")
+    return 0
+
+def _compress(manager: VocabularyManager, args) -> int:
+    if not args.off and not manager.train_text_dictionary(args.sample):
+        print("Lỗi: chưa đủ dữ liệu để huấn luyện từ điển nén", file=sys.stderr)
+        return 1
+    written = manager.rewrite_text_storage(compress=not args.off, progress=_print_progress)
+    print(file=sys.stderr)
+    # Trang trống được trả lại cho hệ thống bởi tác vụ bảo trì incremental_vacuum
+    print(f"Đã ghi lại {written:,} từ vựng")
+    if config_manager.get_vocabulary_setting('compress_text', False) == args.off:
+        print(f"Gợi ý: đặt vocabulary.compress_text = {str(not args.off).lower()} "
+              f"để áp dụng cho từ thêm sau này")
+    return 0
+
+def _reviews(manager: VocabularyManager, args) -> int:
+    if args.days < 1:
+        raise ValueError(f"Số ngày phải >= 1: {args.days}")
+    daily = manager.get_daily_reviews(args.days)
+    if not daily:
+        print("Chưa có lần ôn tập nào")
+        return 0
+    # Cột '#' tỉ lệ với ngày ôn nhiều nhất
+    most = max(row['reviews'] for row in daily)
+    for row in daily:
+        bar = '#' * max(1, row['reviews'] * 40 // most)
+        print(f"{row['day']}  {row['reviews']:>5}  {row['lapses']:>4} sai  {bar}")
+    return 0
+
+def _vacuum(manager: VocabularyManager, args) -> int:
+    conn = manager.db.get_connection()
+    # Kích thước theo trang: trong chế độ WAL file chính chỉ nhỏ lại sau checkpoint
+    size = lambda: (conn.execute('PRAGMA page_count').fetchone()[0]
+                    * conn.execute('PRAGMA page_size').fetchone()[0] / 2**20)
+    before = size()
+    start = time.monotonic()
+    # VACUUM không báo được phần trăm, chỉ hiện thời gian đã chạy
+    progress = lambda: print(f"\rVACUUM {time.monotonic() - start:.0f}s", end='',
+                             file=sys.stderr, flush=True)
+    if not enable_incremental_vacuum(conn, progress):
+        print("auto_vacuum=INCREMENTAL đã được bật, bảo trì lúc rảnh tự trả lại trang trống")
+        return 0
+    print(file=sys.stderr)
+    print(f"Đã bật auto_vacuum=INCREMENTAL: {before:.1f} MiB -> {size():.1f} MiB")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='hello-world-vocab', description="Quản lý kho từ vựng")
+    parser.add_argument('--db', help="Đường dẫn database (mặc định: database của ứng dụng)")
+    parser.add_argument('--deck', help="Tên bộ từ cho import/export (mặc định: bộ từ mặc định)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help="Xuất từ vựng ra file")
+    export_parser.add_argument('path', help="File đích (.csv, .tsv, .jsonl, .txt cho Anki)")
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS,
+                               help="Định dạng (mặc định: theo phần mở rộng)")
+    export_parser.set_defaults(handler=_export)
+
+    import_parser = commands.add_parser('import', help="Nhập từ vựng từ file")
+    import_parser.add_argument('path', help="File nguồn (.csv, .tsv, .jsonl)")
+    import_parser.add_argument('--format', choices=FORMATS,
+                               help="Định dạng (mặc định: theo phần mở rộng)")
+    import_parser.add_argument('--on-conflict', choices=VocabularyManager.CONFLICT_MODES,
+                               default='skip', help="Cách xử lý từ đã tồn tại")
+    import_parser.set_defaults(handler=_import)
+
+    backup_parser = commands.add_parser('backup', help="Sao lưu database (an toàn khi ứng dụng đang chạy)")
+    backup_parser.add_argument('--keep', type=int,
+                               help="Số bản sao lưu giữ lại (mặc định: theo cấu hình)")
+    backup_parser.set_defaults(handler=_backup)
+
+    tag_parser = commands.add_parser('tag', help="Gắn hoặc gỡ nhãn của một từ")
+    tag_parser.add_argument('word', help="Từ cần gắn nhãn")
+    tag_parser.add_argument('tags', nargs='*', help="Các nhãn (bỏ trống để xem nhãn hiện có)")
+    tag_parser.add_argument('--remove', action='store_true', help="Gỡ các nhãn thay vì gắn")
+    tag_parser.set_defaults(handler=_tag)
+
+    related_parser = commands.add_parser('related', help="Từ đồng nghĩa/trái nghĩa quanh một từ")
+    related_parser.add_argument('word', help="Từ gốc")
+    related_parser.add_argument('--depth', type=int, default=2,
+                                help=f"Số bước quan hệ tối đa (0-{VocabularyManager.GRAPH_MAX_DEPTH})")
+    related_parser.set_defaults(handler=_related)
+
+    compress_parser = commands.add_parser('compress', help="Nén các cột văn bản dài của từ đã có")
+    compress_parser.add_argument('--off', action='store_true', help="Giải nén về văn bản thường")
+    compress_parser.add_argument('--sample', type=int, default=2000,
+                                 help="Số từ ngẫu nhiên dùng để huấn luyện từ điển nén")
+    compress_parser.set_defaults(handler=_compress)
+
+    reviews_parser = commands.add_parser('reviews', help="Số lần ôn tập mỗi ngày")
+    reviews_parser.add_argument('--days', type=int, default=30, help="Số ngày gần nhất (mặc định: 30)")
+    reviews_parser.set_defaults(handler=_reviews)
+
+    vacuum_parser = commands.add_parser(
+        'vacuum', help="VACUUM một lần để bật auto_vacuum=INCREMENTAL (database tạo bởi bản cũ)")
+    vacuum_parser.set_defaults(handler=_vacuum)
+    return parser
+
+def main(argv=None) -> int:
+    """Entry point cho hello-world-vocab"""
+    args = build_parser().parse_args(argv)
+    manager = VocabularyManager(args.db, text_compression=bool(
+        config_manager.get_vocabulary_setting('compress_text', False)))
+    try:
+        if args.deck:
+            _select_deck(manager, args.deck, create=args.command == 'import')
+        return args.handler(manager, args)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,13 +4,17 @@ Main application logic cho Hello World App
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, GLib
+from gi.repository import Gtk, Gdk, GLib
 import signal
 import os
 
+from .backup import get_backup_service
 from .config import AppConfig
+from .config_manager import config_manager
 from .hotkey_manager import HotkeyManager
 from .dbus_service import HelloWorldDBusService
+from .maintenance import MaintenanceRunner, MaintenanceScheduler
+from .write_buffer import flush_write_buffers
 from ..gui.main_window import MainWindow
 from ..gui.system_tray import SystemTray
 from ..utils.helpers import setup_signal_handlers, log_message
@@ -18,11 +22,17 @@ from ..utils.helpers import setup_signal_handlers, log_message
 class HelloWorldApp:
     """Class chính quản lý ứng dụng Hello World"""
     
+    # Lần kiểm tra sao lưu định kỳ đầu tiên chờ ứng dụng khởi động xong
+    BACKUP_FIRST_CHECK_SECONDS = 120
+    BACKUP_CHECK_SECONDS = 3600
+    
     def __init__(self):
         self.main_window = None
         self.system_tray = None
         self.hotkey_manager = None
         self.dbus_service = None
+        self.backup_service = None
+        self.maintenance = None
         self.setup_application()
     
     def setup_application(self):
@@ -39,6 +49,12 @@ class HelloWorldApp:
         # Khởi tạo và đăng ký D-Bus service
         self.setup_dbus_service()
         
+        # Sao lưu database định kỳ
+        self.setup_backup_service()
+        
+        # Bảo trì database khi ứng dụng rảnh
+        self.setup_maintenance()
+        
         # Thiết lập signal handlers
         setup_signal_handlers()
         self._setup_custom_signal_handlers()
@@ -59,11 +75,81 @@ class HelloWorldApp:
         except Exception as e:
             log_message(f"Lỗi khi khởi tạo D-Bus service: {e}", "ERROR")
     
+    def setup_backup_service(self):
+        """Thiết lập sao lưu database (thủ công và định kỳ)"""
+        try:
+            self.backup_service = get_backup_service(self.main_window.vocab_manager.db_path)
+            if config_manager.get_backup_setting('enabled', True):
+                GLib.timeout_add_seconds(self.BACKUP_FIRST_CHECK_SECONDS, self._on_backup_first_check)
+                log_message(f"Sao lưu định kỳ vào {self.backup_service.backup_dir}")
+        except Exception as e:
+            log_message(f"Lỗi khi khởi tạo sao lưu database: {e}", "ERROR")
+    
+    def setup_maintenance(self):
+        """Thiết lập bảo trì database theo lát khi rảnh hoặc ẩn xuống tray"""
+        if not config_manager.get_maintenance_setting('enabled', True):
+            return
+        try:
+            self.maintenance = MaintenanceScheduler(
+                self.main_window.vocab_manager,
+                self.main_window.db_executor,
+                budget_ms=config_manager.get_maintenance_setting(
+                    'slice_budget_ms', MaintenanceRunner.DEFAULT_BUDGET_MS),
+                idle_seconds=config_manager.get_maintenance_setting(
+                    'idle_seconds', MaintenanceScheduler.IDLE_SECONDS),
+            )
+            window = self.main_window.window
+            window.add_events(Gdk.EventMask.BUTTON_PRESS_MASK)
+            window.connect("key-press-event", self._on_user_activity)
+            window.connect("button-press-event", self._on_user_activity)
+            window.connect("show", lambda widget: self.maintenance.set_hidden(False))
+            window.connect("hide", lambda widget: self.maintenance.set_hidden(True))
+            self.maintenance.start()
+        except Exception as e:
+            log_message(f"Lỗi khi khởi tạo bảo trì database: {e}", "ERROR")
+    
+    def _on_user_activity(self, widget, event):
+        self.maintenance.touch()
+        return False
+    
+    def _on_backup_first_check(self):
+        self._on_backup_timer()
+        GLib.timeout_add_seconds(self.BACKUP_CHECK_SECONDS, self._on_backup_timer)
+        return False
+    
+    def _on_backup_timer(self):
+        """Sao lưu nếu bản mới nhất đã cũ hơn interval_hours"""
+        interval_hours = config_manager.get_backup_setting('interval_hours', 24)
+        if self.backup_service.is_due(interval_hours):
+            self.start_backup()
+        return True
+    
+    def start_backup(self, progress=None) -> bool:
+        """Bắt đầu sao lưu trên thread nền, False nếu không thể bắt đầu"""
+        if not self.backup_service:
+            return False
+        
+        def on_progress(done, total):
+            if self.main_window and total:
+                self.main_window.show_backup_progress(done, total)
+            if progress:
+                progress(done, total)
+        
+        def on_done(path):
+            if self.main_window:
+                self.main_window.show_backup_result(path)
+            if self.dbus_service and self.dbus_service.initialized:
+                self.dbus_service.BackupFinished(path or "", path is not None)
+        
+        return self.backup_service.start(progress=on_progress, callback=on_done)
+    
     def _setup_custom_signal_handlers(self):
         """Thiết lập signal handlers tùy chỉnh"""
         # SIGUSR1 để hiển thị cửa sổ từ external script
         signal.signal(signal.SIGUSR1, self._on_show_signal)
-        log_message("Đã thiết lập signal handlers (SIGUSR1 để hiển thị cửa sổ)")
+        # SIGTERM thoát như quit() để ghi nốt write buffer trước khi tắt
+        signal.signal(signal.SIGTERM, self._on_terminate_signal)
+        log_message("Đã thiết lập signal handlers (SIGUSR1 để hiển thị cửa sổ, SIGTERM để thoát)")
     
     def _on_show_signal(self, signum, frame):
         """Xử lý signal SIGUSR1 để hiển thị cửa sổ"""
@@ -71,6 +157,11 @@ class HelloWorldApp:
         # Sử dụng GLib.idle_add để chạy trong main thread của GTK
         GLib.idle_add(self.show_window)
     
+    def _on_terminate_signal(self, signum, frame):
+        """Xử lý signal SIGTERM: thoát trong main thread của GTK"""
+        log_message("Nhận signal SIGTERM - thoát ứng dụng")
+        GLib.idle_add(self.quit)
+    
     def _create_pid_file(self):
         """Tạo file PID để track process"""
         pid_dir = os.path.expanduser('~/.local/share/hello-world-app')
@@ -145,9 +236,23 @@ class HelloWorldApp:
         if self.hotkey_manager:
             self.hotkey_manager.stop()
         
+        # Dừng bảo trì (lát đang chạy được chờ khi tắt executor)
+        if self.maintenance:
+            self.maintenance.stop()
+        
+        # Dừng bản sao lưu đang chạy (file .part được xóa)
+        if self.backup_service:
+            self.backup_service.cancel(timeout=5)
+        
         # Cleanup
         if self.main_window:
             self.main_window.destroy()
+            # Ghi nốt write buffer, chờ các lệnh ghi nền rồi đóng các kết nối database lâu dài
+            flush_write_buffers()
+            if self.main_window.db_executor:
+                self.main_window.db_executor.shutdown()
+            if self.main_window.vocab_manager:
+                self.main_window.vocab_manager.close()
         
         # Thoát GTK main loop
         Gtk.main_quit()
@@ -0,0 +1,200 @@
+"""
+Backup service - Sao lưu database trong khi ứng dụng đang chạy bằng sqlite3 backup API
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .config_manager import config_manager
+from .db_executor import call_on_main_loop
+from ..utils.helpers import log_message
+
+BACKUP_PREFIX = 'vocabulary-'
+BACKUP_SUFFIX = '.db'
+TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
+
+# (số trang đã chép, tổng số trang)
+BackupProgress = Callable[[int, int], None]
+
+class _Cancelled(Exception):
+    """Dừng Connection.backup từ trong callback tiến độ"""
+
+class BackupService:
+    """Sao lưu trực tuyến vào thư mục backups/, giữ lại `keep` bản mới nhất
+
+    Mỗi lần sao lưu chạy trên một thread riêng với kết nối riêng: Connection.backup
+    chép `pages` trang mỗi bước rồi nghỉ `pause_ms`, nên thread ghi của ứng dụng
+    chỉ phải chờ trong một bước ngắn. Bản sao được ghi vào file .part, kiểm tra
+    bằng PRAGMA quick_check rồi mới đổi tên, nên không bao giờ có bản sao dở.
+    """
+
+    DEFAULT_KEEP = 7
+    DEFAULT_PAGES = 256
+    DEFAULT_PAUSE_MS = 5
+
+    def __init__(self, db_path: str, backup_dir: Optional[str] = None, keep: int = DEFAULT_KEEP,
+                 pages: int = DEFAULT_PAGES, pause_ms: int = DEFAULT_PAUSE_MS):
+        if keep < 1:
+            raise ValueError(f"Số bản sao lưu giữ lại phải >= 1: {keep}")
+        if pages < 1:
+            raise ValueError(f"Số trang mỗi bước phải >= 1: {pages}")
+        self.db_path = db_path
+        self.backup_dir = backup_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+        self.keep = keep
+        self.pages = pages
+        self.pause = pause_ms / 1000
+        self.last_backup: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self, progress: Optional[BackupProgress] = None,
+              callback: Optional[Callable[[Optional[str]], None]] = None) -> bool:
+        """Bắt đầu sao lưu trên thread nền, False nếu một bản sao lưu đang chạy
+
+        `progress` và `callback` (đường dẫn bản sao, None nếu lỗi) được gọi
+        trên GTK main loop.
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._cancel.clear()
+            self._thread = threading.Thread(target=self._run, args=(progress, callback),
+                                            name='vocab-backup', daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self, progress: Optional[BackupProgress], callback):
+        on_progress = None
+        if progress:
+            on_progress = lambda done, total: call_on_main_loop(progress, done, total)
+        path = self.backup_now(on_progress)
+        if callback:
+            call_on_main_loop(callback, path)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Chờ bản sao lưu nền kết thúc, True nếu không còn chạy"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.running
+
+    def cancel(self, timeout: Optional[float] = None):
+        """Dừng bản sao lưu nền (nếu có) và chờ nó kết thúc"""
+        self._cancel.set()
+        self.wait(timeout)
+
+    def backup_now(self, progress: Optional[BackupProgress] = None) -> Optional[str]:
+        """Sao lưu ngay trên thread hiện tại, trả về đường dẫn bản sao hoặc None nếu lỗi"""
+        source = target = None
+        temp_path = None
+        start = time.perf_counter()
+        try:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            path = self._new_backup_path()
+            temp_path = f'{path}.part'
+            source = sqlite3.connect(self.db_path, timeout=30)
+            target = sqlite3.connect(temp_path)
+
+            def step(status, remaining, total):
+                if progress:
+                    progress(total - remaining, total)
+                if self._cancel.is_set():
+                    raise _Cancelled()
+                # Nhường lock cho thread ghi giữa các bước
+                if remaining and self.pause:
+                    time.sleep(self.pause)
+
+            source.backup(target, pages=self.pages, progress=step)
+            result = target.execute('PRAGMA quick_check').fetchone()[0]
+            if result != 'ok':
+                raise sqlite3.DatabaseError(f"Bản sao không hợp lệ: {result}")
+            target.close()
+            target = None
+            os.replace(temp_path, path)
+        except _Cancelled:
+            log_message("Đã hủy sao lưu database", "WARNING")
+            self.last_error = "Đã hủy"
+            return None
+        except (sqlite3.Error, OSError) as e:
+            log_message(f"Lỗi sao lưu database: {e}", "ERROR")
+            self.last_error = str(e)
+            return None
+        finally:
+            for conn in (source, target):
+                if conn is not None:
+                    conn.close()
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.last_backup = path
+        self.last_error = None
+        removed = self.prune()
+        log_message(f"Đã sao lưu database vào {path} trong {time.perf_counter() - start:.2f}s"
+                    f" (xóa {removed} bản cũ)")
+        return path
+
+    def _new_backup_path(self) -> str:
+        name = f'{BACKUP_PREFIX}{datetime.now().strftime(TIMESTAMP_FORMAT)}'
+        path = os.path.join(self.backup_dir, name + BACKUP_SUFFIX)
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.backup_dir, f'{name}-{suffix}{BACKUP_SUFFIX}')
+            suffix += 1
+        return path
+
+    def list_backups(self) -> List[str]:
+        """Các bản sao lưu hiện có, mới nhất trước"""
+        try:
+            names = os.listdir(self.backup_dir)
+        except FileNotFoundError:
+            return []
+        paths = [os.path.join(self.backup_dir, name) for name in names
+                 if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIX)]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def prune(self) -> int:
+        """Xóa các bản sao lưu cũ hơn `keep` bản mới nhất, trả về số bản đã xóa"""
+        removed = 0
+        for path in self.list_backups()[self.keep:]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                log_message(f"Không thể xóa bản sao lưu cũ {path}: {e}", "WARNING")
+        return removed
+
+    def is_due(self, interval_hours: float) -> bool:
+        """True nếu chưa có bản sao lưu nào mới hơn `interval_hours` giờ"""
+        backups = self.list_backups()
+        if not backups:
+            return True
+        return time.time() - os.path.getmtime(backups[0]) >= interval_hours * 3600
+
+_shared_services: Dict[str, BackupService] = {}
+_shared_lock = threading.Lock()
+
+def get_backup_service(db_path: str) -> BackupService:
+    """BackupService dùng chung cho một database, cấu hình theo mục "backup" """
+    with _shared_lock:
+        service = _shared_services.get(db_path)
+        if service is None:
+            service = BackupService(
+                db_path,
+                backup_dir=config_manager.get_backup_setting('directory') or None,
+                keep=config_manager.get_backup_setting('keep', BackupService.DEFAULT_KEEP),
+                pages=config_manager.get_backup_setting('pages_per_step', BackupService.DEFAULT_PAGES),
+                pause_ms=config_manager.get_backup_setting('pause_ms', BackupService.DEFAULT_PAUSE_MS),
+            )
+            _shared_services[db_path] = service
+        return service
@@ -67,7 +67,26 @@ class ConfigManager:
                 "show_pronunciation": True,
                 "show_context": True,
                 "show_synonyms": True,
-                "show_antonyms": True
+                "show_antonyms": True,
+                "write_buffer": False,
+                "write_buffer_interval_ms": 250,
+                "write_buffer_max_operations": 100,
+                "write_durability": "normal",
+                "current_deck": 1,
+                "compress_text": False
+            },
+            "backup": {
+                "enabled": True,
+                "interval_hours": 24,
+                "keep": 7,
+                "directory": "",
+                "pages_per_step": 256,
+                "pause_ms": 5
+            },
+            "maintenance": {
+                "enabled": True,
+                "idle_seconds": 120,
+                "slice_budget_ms": 50
             }
         }
     
@@ -135,6 +154,14 @@ class ConfigManager:
         """Thiết lập từ vựng"""
         self.set(f'vocabulary.{setting}', value)
     
+    def get_backup_setting(self, setting: str, default: Any = None) -> Any:
+        """Lấy thiết lập sao lưu"""
+        return self.get(f'backup.{setting}', default)
+    
+    def get_maintenance_setting(self, setting: str, default: Any = None) -> Any:
+        """Lấy thiết lập bảo trì database"""
+        return self.get(f'maintenance.{setting}', default)
+    
     def export_config(self) -> str:
         """Export cấu hình thành JSON string"""
         try:
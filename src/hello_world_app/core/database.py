@@ -0,0 +1,86 @@
+"""
+Database connection manager - Quản lý kết nối SQLite dùng lâu dài cho từng thread
+"""
+
+import sqlite3
+import threading
+from typing import List
+
+from .text_codec import register_text_codec
+from ..utils.helpers import log_message
+
+class ConnectionManager:
+    """Giữ một kết nối SQLite lâu dài cho mỗi thread, cấu hình PRAGMA một lần khi mở"""
+
+    # cache_size âm được SQLite hiểu là KiB
+    CACHE_SIZE_KIB = 16 * 1024
+    MMAP_SIZE = 256 * 1024 * 1024
+    STATEMENT_CACHE_SIZE = 256
+    BUSY_TIMEOUT = 5.0
+    # WAL + NORMAL: commit không fsync, chỉ fsync khi checkpoint
+    SYNCHRONOUS = 'NORMAL'
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        # Tăng mỗi lần close_all() để các thread bỏ kết nối cũ đã đóng
+        self._generation = 0
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Lấy kết nối của thread hiện tại, mở mới nếu chưa có"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.generation == self._generation:
+            return conn
+
+        conn = self._open_connection()
+        with self._lock:
+            self._connections.append(conn)
+            self._local.conn = conn
+            self._local.generation = self._generation
+        return conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Mở kết nối mới và áp dụng các PRAGMA hiệu năng"""
+        # check_same_thread=False chỉ để close_all() đóng được kết nối của thread khác;
+        # mỗi kết nối vẫn chỉ được dùng bởi thread đã tạo ra nó
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        # Chỉ có tác dụng với database mới (trước khi tạo bảng đầu tiên); database cũ
+        # được chuyển bằng lệnh hello-world-vocab vacuum
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.SYNCHRONOUS}')
+        conn.execute(f'PRAGMA cache_size=-{self.CACHE_SIZE_KIB}')
+        conn.execute(f'PRAGMA mmap_size={self.MMAP_SIZE}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        # Trigger FTS và tìm kiếm LIKE đọc cột nén qua vocab_text()
+        register_text_codec(conn)
+        log_message(f"Mở kết nối database cho thread {threading.current_thread().name}")
+        return conn
+
+    def close_all(self):
+        """Đóng tất cả kết nối đã mở (gọi khi thoát ứng dụng)"""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+            self._generation += 1
+
+        for conn in connections:
+            try:
+                # Cập nhật thống kê cho các bảng mà kết nối này đã truy vấn (thường là no-op)
+                conn.execute('PRAGMA optimize')
+            except sqlite3.Error as e:
+                log_message(f"Lỗi PRAGMA optimize: {e}", "WARNING")
+            try:
+                conn.close()
+            except Exception as e:
+                log_message(f"Lỗi đóng kết nối database: {e}", "WARNING")
+
+        if connections:
+            log_message(f"Đã đóng {len(connections)} kết nối database")
@@ -0,0 +1,148 @@
+"""
+Database executor - Chạy truy vấn từ vựng ngoài GTK main thread
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.helpers import log_message
+
+try:
+    from gi.repository import GLib
+    GLIB_AVAILABLE = True
+except ImportError:
+    GLIB_AVAILABLE = False
+
+def call_on_main_loop(func: Callable, *args):
+    """Gọi func trên GTK main loop nếu có, ngược lại gọi ngay"""
+    if not GLIB_AVAILABLE:
+        func(*args)
+        return
+
+    def run():
+        func(*args)
+        return False
+    GLib.idle_add(run)
+
+class _PoolMetrics:
+    """Độ sâu hàng đợi và thời gian chờ của một pool"""
+
+    def __init__(self):
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        started = self.completed + self.failed + self.running
+        return {
+            'pending': self.pending,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'avg_wait_ms': self.total_wait / started * 1000 if started else 0.0,
+            'max_wait_ms': self.max_wait * 1000,
+        }
+
+class DatabaseExecutor:
+    """Một thread ghi và một nhóm thread đọc cho VocabularyManager
+
+    Ghi được tuần tự hóa trên một thread (SQLite chỉ cho một writer), đọc chạy
+    song song trên các kết nối riêng của từng thread nhờ WAL. Mỗi lệnh trả về
+    concurrent.futures.Future; `callback`/`error_callback` được gọi trên GTK
+    main loop nên có thể cập nhật widget trực tiếp.
+    """
+
+    DEFAULT_READERS = 2
+
+    def __init__(self, manager, readers: int = DEFAULT_READERS):
+        self.manager = manager
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vocab-writer')
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='vocab-reader')
+        self._lock = threading.Lock()
+        self._metrics = {'read': _PoolMetrics(), 'write': _PoolMetrics()}
+        self._closed = False
+
+    def submit_read(self, func: Callable, *args,
+                    callback: Optional[Callable[[Any], None]] = None,
+                    error_callback: Optional[Callable[[Exception], None]] = None) -> Future:
+        """Chạy một lệnh đọc trên nhóm thread đọc"""
+        return self._submit('read', self._readers, func, args, callback, error_callback)
+
+    def submit_write(self, func: Callable, *args,
+                     callback: Optional[Callable[[Any], None]] = None,
+                     error_callback: Optional[Callable[[Exception], None]] = None) -> Future:
+        """Chạy một lệnh ghi trên thread ghi (theo thứ tự gửi)"""
+        return self._submit('write', self._writer, func, args, callback, error_callback)
+
+    def _submit(self, kind: str, pool: ThreadPoolExecutor, func: Callable, args: tuple,
+                callback, error_callback) -> Future:
+        metrics = self._metrics[kind]
+        submitted = time.monotonic()
+        with self._lock:
+            metrics.pending += 1
+
+        def run():
+            wait = time.monotonic() - submitted
+            with self._lock:
+                metrics.pending -= 1
+                metrics.running += 1
+                metrics.total_wait += wait
+                metrics.max_wait = max(metrics.max_wait, wait)
+            try:
+                result = func(*args)
+            except Exception:
+                with self._lock:
+                    metrics.running -= 1
+                    metrics.failed += 1
+                raise
+            with self._lock:
+                metrics.running -= 1
+                metrics.completed += 1
+            return result
+
+        future = pool.submit(run)
+        future.add_done_callback(lambda done: self._deliver(done, func, callback, error_callback))
+        return future
+
+    def _deliver(self, future: Future, func: Callable, callback, error_callback):
+        """Chuyển kết quả về main loop"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            log_message(f"Lỗi truy vấn nền {getattr(func, '__name__', func)}: {error}", "ERROR")
+            if error_callback:
+                call_on_main_loop(error_callback, error)
+        elif callback:
+            call_on_main_loop(callback, future.result())
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Số liệu hàng đợi: pending/running/completed/failed và thời gian chờ (ms)"""
+        with self._lock:
+            return {kind: metrics.snapshot() for kind, metrics in self._metrics.items()}
+
+    def shutdown(self, wait: bool = True):
+        """Dừng nhận lệnh mới; chờ các lệnh ghi đang xếp hàng hoàn tất"""
+        if self._closed:
+            return
+        self._closed = True
+        self._readers.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+        log_message(f"Đã dừng database executor: {self.metrics()}")
+
+_shared_executors: Dict[int, DatabaseExecutor] = {}
+_shared_lock = threading.Lock()
+
+def get_database_executor(manager) -> DatabaseExecutor:
+    """DatabaseExecutor dùng chung cho một VocabularyManager"""
+    with _shared_lock:
+        executor = _shared_executors.get(id(manager))
+        if executor is None or executor._closed:
+            executor = DatabaseExecutor(manager)
+            _shared_executors[id(manager)] = executor
+        return executor
@@ -88,4 +88,25 @@ class HelloWorldDBusService(dbus.service.Object):
         if self.app:
             GLib.idle_add(self.app.quit)
             return True
-        return False 
\ No newline at end of file
+        return False
+    
+    @dbus.service.method(
+        dbus_interface="org.hello_world_app.Interface",
+        in_signature="", 
+        out_signature="b"
+    )
+    def Backup(self):
+        """Bắt đầu sao lưu database trên thread nền"""
+        log_message("Yêu cầu sao lưu database qua D-Bus")
+        # start_backup chỉ tạo thread nên gọi trực tiếp để trả kết quả
+        if self.app:
+            return self.app.start_backup()
+        return False
+    
+    @dbus.service.signal(
+        dbus_interface="org.hello_world_app.Interface",
+        signature="sb"
+    )
+    def BackupFinished(self, path, success):
+        """Phát khi một lần sao lưu kết thúc (path rỗng nếu lỗi)"""
+        pass
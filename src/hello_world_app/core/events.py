@@ -0,0 +1,90 @@
+"""
+Vocabulary events - Thông báo thay đổi từ vựng cho các view
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from ..utils.helpers import log_message
+
+try:
+    from gi.repository import GLib
+    GLIB_AVAILABLE = True
+except ImportError:
+    GLIB_AVAILABLE = False
+
+# Các loại sự kiện VocabularyManager phát ra
+ADDED = 'added'
+UPDATED = 'updated'
+DELETED = 'deleted'
+REVIEWED = 'reviewed'
+# Bộ từ hiện tại đổi (ids = (deck_id mới,)): các view nạp lại toàn bộ
+DECK_CHANGED = 'deck_changed'
+EVENT_KINDS = (ADDED, UPDATED, DELETED, REVIEWED, DECK_CHANGED)
+
+class VocabularyEvent(NamedTuple):
+    """Một thay đổi: loại, các id bị ảnh hưởng và (với 'updated') các cột đã ghi"""
+    kind: str
+    ids: Tuple[int, ...]
+    fields: Tuple[str, ...] = ()
+
+EventCallback = Callable[[VocabularyEvent], None]
+
+def _dispatch_on_main_loop(callback: EventCallback, event: VocabularyEvent):
+    """Gọi callback trên GTK main loop (an toàn khi ghi từ thread khác)"""
+    def run():
+        callback(event)
+        return False
+    GLib.idle_add(run)
+
+def _dispatch_now(callback: EventCallback, event: VocabularyEvent):
+    """Gọi callback ngay trong thread hiện tại"""
+    callback(event)
+
+class EventBus:
+    """Danh sách người đăng ký nhận sự kiện thay đổi từ vựng
+
+    Mặc định sự kiện được giao qua GLib.idle_add khi có GTK, ngược lại gọi trực tiếp.
+    """
+
+    def __init__(self, dispatcher: Optional[Callable[[EventCallback, VocabularyEvent], None]] = None):
+        if dispatcher is None:
+            dispatcher = _dispatch_on_main_loop if GLIB_AVAILABLE else _dispatch_now
+        self._dispatcher = dispatcher
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Tuple[EventCallback, Optional[frozenset]]] = {}
+        self._next_id = 1
+
+    def subscribe(self, callback: EventCallback, kinds: Optional[Iterable[str]] = None) -> int:
+        """Đăng ký nhận sự kiện (tất cả hoặc chỉ các loại trong `kinds`), trả về mã hủy"""
+        kinds = frozenset(kinds) if kinds is not None else None
+        if kinds is not None and not kinds <= set(EVENT_KINDS):
+            raise ValueError(f"Loại sự kiện không hợp lệ: {sorted(kinds - set(EVENT_KINDS))}")
+        with self._lock:
+            subscription_id = self._next_id
+            self._next_id += 1
+            self._subscribers[subscription_id] = (callback, kinds)
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int):
+        """Hủy đăng ký"""
+        with self._lock:
+            self._subscribers.pop(subscription_id, None)
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, kind: str, ids: Iterable[int], fields: Iterable[str] = ()):
+        """Phát một sự kiện tới những người đăng ký phù hợp"""
+        event = VocabularyEvent(kind, tuple(ids), tuple(fields))
+        if not event.ids:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, kinds in subscribers:
+            if kinds is None or kind in kinds:
+                try:
+                    self._dispatcher(callback, event)
+                except Exception as e:
+                    log_message(f"Lỗi gửi sự kiện {kind}: {e}", "ERROR")
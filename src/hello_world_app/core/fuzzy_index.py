@@ -0,0 +1,154 @@
+"""
+Fuzzy index - Chỉ mục trigram trong bộ nhớ cho tìm kiếm chấp nhận lỗi gõ
+"""
+
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .word_key import normalize_word
+
+def trigrams(key: str) -> Set[str]:
+    """Các trigram của khóa, đệm hai khoảng trắng đầu và một cuối (như pg_trgm)"""
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Khoảng cách Levenshtein có tính hoán vị hai ký tự kề nhau (OSA)
+
+    Trả về None nếu vượt `max_distance`. "recieve" -> "receive" là 1 lỗi.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+        # Hai hàng liên tiếp đều vượt giới hạn thì các hàng sau cũng vượt
+        if min(current) > max_distance and min(previous) > max_distance:
+            return None
+        before_previous, previous = previous, current
+    distance = previous[-1]
+    return distance if distance <= max_distance else None
+
+def default_max_distance(key: str) -> int:
+    """Số lỗi chấp nhận theo độ dài: từ ngắn quá dễ khớp nhầm"""
+    if len(key) <= 2:
+        return 0
+    return 1 if len(key) <= 7 else 2
+
+class FuzzyIndex:
+    """Chỉ mục ngược trigram -> id trên word_key
+
+    Ứng viên phải chung đủ trigram (bổ đề q-gram: mỗi lỗi làm mất tối đa 4
+    trigram) và có độ dài gần bằng, sau đó mới được kiểm tra bằng edit_distance
+    có giới hạn. An toàn đa luồng.
+    """
+
+    DEFAULT_LIMIT = 20
+    # Số ứng viên tối đa được tính edit distance (ưu tiên chung nhiều trigram nhất);
+    # với khóa ngắn và 2 lỗi, bổ đề q-gram gần như không loại được ai
+    MAX_CANDIDATES = 400
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, List[int]] = {}
+        self._keys: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, rows: Iterable[Tuple[int, str, Optional[str]]]):
+        """Thay toàn bộ nội dung bằng các hàng (id, từ, word_key)"""
+        postings: Dict[str, List[int]] = {}
+        keys = {}
+        for vocab_id, word, key in rows:
+            key = key or normalize_word(word)
+            keys[vocab_id] = key
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(vocab_id)
+        with self._lock:
+            self._postings = postings
+            self._keys = keys
+
+    def update(self, rows: Iterable[Tuple[int, str]]):
+        """Thêm hoặc đổi từ của các hàng (id, từ)"""
+        with self._lock:
+            for vocab_id, word in rows:
+                self._remove(vocab_id)
+                key = normalize_word(word)
+                self._keys[vocab_id] = key
+                for gram in trigrams(key):
+                    self._postings.setdefault(gram, []).append(vocab_id)
+
+    def remove(self, ids: Iterable[int]):
+        """Bỏ các hàng theo id"""
+        with self._lock:
+            for vocab_id in ids:
+                self._remove(vocab_id)
+
+    def _remove(self, vocab_id: int):
+        key = self._keys.pop(vocab_id, None)
+        if key is None:
+            return
+        for gram in trigrams(key):
+            posting = self._postings.get(gram)
+            if posting:
+                posting.remove(vocab_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, term: str, limit: int = DEFAULT_LIMIT,
+               max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Các (id, khoảng cách) gần `term` nhất, xếp theo khoảng cách tăng dần
+
+        Thử 1 lỗi trước và chỉ nới tới `max_distance` khi chưa có kết quả nào:
+        phần lớn lỗi gõ là 1 lỗi, và bộ lọc trigram chặt hơn nhiều ở mức này.
+        """
+        key = normalize_word(term)
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = default_max_distance(key)
+        grams = trigrams(key)
+
+        with self._lock:
+            counts = Counter()
+            for gram in grams:
+                counts.update(self._postings.get(gram, ()))
+
+        matches = []
+        for distance_limit in range(min(1, max_distance), max_distance + 1):
+            matches = self._verify(key, len(grams), counts, distance_limit)
+            if matches:
+                break
+        return [(vocab_id, distance) for distance, _, _, vocab_id in matches[:limit]]
+
+    def _verify(self, key: str, gram_count: int, counts: Counter, max_distance: int):
+        """Lọc ứng viên theo số trigram chung và độ dài rồi tính edit distance"""
+        # Bổ đề q-gram: mỗi lỗi làm mất tối đa 3 trigram của term (4 với hoán vị)
+        min_shared = gram_count - 4 * max_distance
+        length = len(key)
+        with self._lock:
+            keys = self._keys
+            candidates = [(shared, vocab_id, keys[vocab_id]) for vocab_id, shared in counts.items()
+                          if shared >= min_shared and vocab_id in keys
+                          and abs(len(keys[vocab_id]) - length) <= max_distance]
+        if len(candidates) > self.MAX_CANDIDATES:
+            candidates = heapq.nlargest(self.MAX_CANDIDATES, candidates)
+
+        matches = []
+        for shared, vocab_id, candidate in candidates:
+            distance = edit_distance(key, candidate, max_distance)
+            if distance is not None:
+                matches.append((distance, -shared, candidate, vocab_id))
+        matches.sort()
+        return matches
@@ -0,0 +1,296 @@
+"""
+Maintenance - Bảo trì database (ANALYZE, checkpoint WAL, FTS merge, vacuum) khi ứng dụng rảnh
+"""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from .migrations import fts_available
+from ..utils.helpers import log_message
+
+try:
+    from gi.repository import GLib
+    GLIB_AVAILABLE = True
+except ImportError:
+    GLIB_AVAILABLE = False
+
+# Số hàng mỗi chỉ mục ANALYZE đọc: thống kê gần đúng với chi phí cố định
+ANALYSIS_LIMIT = 1000
+# Số trang FTS5 mỗi lệnh 'merge' ghi
+FTS_MERGE_PAGES = 64
+# Số trang trống trả lại hệ điều hành mỗi lệnh incremental_vacuum
+VACUUM_PAGES_PER_STEP = 256
+# Database cũ có nhiều trang trống thế này thì gợi ý chuyển sang auto_vacuum=INCREMENTAL
+VACUUM_MIN_FREE_PAGES = 1024
+VACUUM_FREE_RATIO = 0.2
+AUTO_VACUUM_INCREMENTAL = 2
+# Số lệnh máy ảo SQLite giữa hai lần gọi callback tiến độ của VACUUM đầy đủ
+VACUUM_PROGRESS_OPS = 100000
+
+# state: dict riêng của một lần chạy tác vụ, giữ qua các lát
+TaskStep = Callable[[sqlite3.Connection, float, Dict[str, Any]], bool]
+
+class MaintenanceTask(NamedTuple):
+    """Một tác vụ bảo trì; `step` làm việc tới `deadline` rồi trả về True nếu đã xong"""
+    name: str
+    interval_hours: float
+    step: TaskStep
+
+def _analyze(conn: sqlite3.Connection, deadline: float, state: Dict[str, Any]) -> bool:
+    """ANALYZE có giới hạn số hàng để query planner có thống kê mới"""
+    conn.execute(f'PRAGMA analysis_limit={ANALYSIS_LIMIT}')
+    conn.execute('ANALYZE')
+    conn.commit()
+    return True
+
+def _checkpoint(conn: sqlite3.Connection, deadline: float, state: Dict[str, Any]) -> bool:
+    """Chép WAL vào database; thu nhỏ file WAL nếu chép được hết"""
+    busy, log_pages, checkpointed = conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+    if not busy and log_pages == checkpointed:
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+    return True
+
+def _fts_merge(conn: sqlite3.Connection, deadline: float, state: Dict[str, Any]) -> bool:
+    """Gộp các segment FTS5 từng phần (tương đương 'optimize' nhưng chia nhỏ được)"""
+    if not fts_available(conn):
+        return True
+    merge = "INSERT INTO vocabulary_fts(vocabulary_fts, rank) VALUES ('merge', ?)"
+    if not state:
+        # N âm: đưa mọi segment về cùng một mức để các lệnh sau gộp hết thành một
+        state['started'] = True
+        pages = -FTS_MERGE_PAGES
+    else:
+        pages = FTS_MERGE_PAGES
+    while True:
+        before = conn.total_changes
+        conn.execute(merge, (pages,))
+        conn.commit()
+        # Theo tài liệu FTS5: thay đổi ít hơn 2 hàng nghĩa là không còn gì để gộp
+        if conn.total_changes - before < 2:
+            return True
+        pages = FTS_MERGE_PAGES
+        if time.perf_counter() >= deadline:
+            return False
+
+def needs_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """True nếu database (tạo bởi bản cũ) chưa bật auto_vacuum=INCREMENTAL"""
+    return conn.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL
+
+def enable_incremental_vacuum(conn: sqlite3.Connection,
+                              progress: Optional[Callable[[], None]] = None) -> bool:
+    """Bật auto_vacuum=INCREMENTAL bằng một lần VACUUM đầy đủ, False nếu đã bật
+
+    VACUUM không chia lát được và chặn mọi lệnh ghi tới khi xong, nên chỉ chạy
+    khi người dùng yêu cầu (hello-world-vocab vacuum), không chạy lúc rảnh.
+    `progress` được gọi định kỳ trong khi VACUUM chạy.
+    """
+    if not needs_incremental_vacuum(conn):
+        return False
+    conn.commit()
+    conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+    if progress:
+        conn.set_progress_handler(lambda: progress() or 0, VACUUM_PROGRESS_OPS)
+    try:
+        conn.execute('VACUUM')
+    finally:
+        if progress:
+            conn.set_progress_handler(None, 0)
+    log_message("Đã bật auto_vacuum=INCREMENTAL")
+    return True
+
+def _vacuum(conn: sqlite3.Connection, deadline: float, state: Dict[str, Any]) -> bool:
+    """Trả trang trống cho hệ điều hành bằng incremental_vacuum theo từng phần"""
+    free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    if needs_incremental_vacuum(conn):
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        if free_pages >= VACUUM_MIN_FREE_PAGES and free_pages >= page_count * VACUUM_FREE_RATIO:
+            log_message(f"Database có {free_pages}/{page_count} trang trống nhưng chưa bật "
+                        f"auto_vacuum=INCREMENTAL, chạy: hello-world-vocab vacuum", "WARNING")
+        return True
+    while free_pages:
+        if time.perf_counter() >= deadline:
+            return False
+        # fetchall để SQLite chạy hết lệnh thay vì dừng sau trang đầu tiên
+        conn.execute(f'PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})').fetchall()
+        free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    return True
+
+# Checkpoint chạy cuối để thu nhỏ WAL sau khi các tác vụ khác đã ghi
+TASKS: List[MaintenanceTask] = [
+    MaintenanceTask('analyze', 24, _analyze),
+    MaintenanceTask('fts_merge', 24, _fts_merge),
+    MaintenanceTask('vacuum', 24 * 7, _vacuum),
+    MaintenanceTask('checkpoint', 1, _checkpoint),
+]
+
+class MaintenanceRunner:
+    """Chạy các tác vụ bảo trì đến hạn theo từng lát `budget_ms`
+
+    begin() và run_slice() phải được gọi trên cùng một thread (thread ghi
+    của DatabaseExecutor) để bảo trì được tuần tự hóa với các lệnh ghi khác.
+    Giữa hai lát, các lệnh ghi của ứng dụng được chạy bình thường.
+    """
+
+    DEFAULT_BUDGET_MS = 50
+
+    def __init__(self, manager, tasks: List[MaintenanceTask] = TASKS,
+                 budget_ms: int = DEFAULT_BUDGET_MS):
+        self.manager = manager
+        self.tasks = tasks
+        self.budget = budget_ms / 1000
+        self._queue: List[MaintenanceTask] = []
+        self._state: Dict[str, Any] = {}
+        self._elapsed = 0.0
+        self._slices = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def begin(self, force: bool = False) -> int:
+        """Xếp hàng các tác vụ đến hạn (hoặc tất cả nếu `force`), trả về số tác vụ"""
+        if self._queue:
+            return len(self._queue)
+        try:
+            conn = self.manager.db.get_connection()
+            last_runs = dict(conn.execute('SELECT task, last_run FROM maintenance_log'))
+        except sqlite3.Error as e:
+            log_message(f"Lỗi đọc nhật ký bảo trì: {e}", "ERROR")
+            return 0
+        now = datetime.now()
+        self._queue = [task for task in self.tasks
+                       if force or task.name not in last_runs
+                       or now - datetime.fromisoformat(last_runs[task.name])
+                       >= timedelta(hours=task.interval_hours)]
+        self._reset()
+        return len(self._queue)
+
+    def run_slice(self) -> bool:
+        """Chạy tác vụ hiện tại trong một lát thời gian, True nếu vẫn còn việc"""
+        if not self._queue:
+            return False
+        task = self._queue[0]
+        conn = self.manager.db.get_connection()
+        start = time.perf_counter()
+        try:
+            done = task.step(conn, start + self.budget, self._state)
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            log_message(f"Lỗi bảo trì {task.name}: {e}", "ERROR")
+            # Vẫn ghi nhật ký để tác vụ lỗi chờ tới hạn sau thay vì chạy lại mỗi lần rảnh
+            self._finish(conn, task)
+            self._queue.pop(0)
+            self._reset()
+            return bool(self._queue)
+        self._elapsed += time.perf_counter() - start
+        self._slices += 1
+        if done:
+            self._finish(conn, task)
+            self._queue.pop(0)
+            self._reset()
+        return bool(self._queue)
+
+    def run_all(self, force: bool = False) -> int:
+        """Chạy hết các tác vụ đến hạn ngay trên thread hiện tại, trả về số tác vụ"""
+        count = self.begin(force)
+        while self.run_slice():
+            pass
+        return count
+
+    def _reset(self):
+        self._state = {}
+        self._elapsed = 0.0
+        self._slices = 0
+
+    def _finish(self, conn: sqlite3.Connection, task: MaintenanceTask):
+        duration_ms = self._elapsed * 1000
+        log_message(f"Bảo trì {task.name}: {duration_ms:.1f} ms trong {self._slices} lát")
+        try:
+            with conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO maintenance_log (task, last_run, duration_ms, slices)
+                    VALUES (?, ?, ?, ?)
+                ''', (task.name, datetime.now().isoformat(sep=' ', timespec='seconds'),
+                      duration_ms, self._slices))
+        except sqlite3.Error as e:
+            log_message(f"Lỗi ghi nhật ký bảo trì: {e}", "ERROR")
+
+class MaintenanceScheduler:
+    """Chạy MaintenanceRunner trên thread ghi khi ứng dụng rảnh
+
+    Rảnh nghĩa là cửa sổ chính đang ẩn hoặc không có thao tác nào trong
+    `idle_seconds`. Mỗi lát là một lệnh riêng trên executor; khi người dùng
+    quay lại, bảo trì dừng sau lát hiện tại và tiếp tục ở lần rảnh sau.
+    """
+
+    TICK_SECONDS = 30
+    IDLE_SECONDS = 120
+    SLICE_GAP_MS = 100
+
+    def __init__(self, manager, executor, budget_ms: int = MaintenanceRunner.DEFAULT_BUDGET_MS,
+                 idle_seconds: int = IDLE_SECONDS):
+        self.runner = MaintenanceRunner(manager, budget_ms=budget_ms)
+        self.executor = executor
+        self.idle_seconds = idle_seconds
+        self.hidden = False
+        self._last_activity = time.monotonic()
+        self._running = False
+        self._timer_id: Optional[int] = None
+
+    def start(self):
+        """Bắt đầu kiểm tra định kỳ trên GTK main loop"""
+        if GLIB_AVAILABLE and self._timer_id is None:
+            self._timer_id = GLib.timeout_add_seconds(self.TICK_SECONDS, self._on_tick)
+
+    def stop(self):
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def touch(self):
+        """Ghi nhận thao tác của người dùng"""
+        self._last_activity = time.monotonic()
+
+    def set_hidden(self, hidden: bool):
+        self.hidden = hidden
+        if not hidden:
+            self.touch()
+
+    def is_idle(self) -> bool:
+        return self.hidden or time.monotonic() - self._last_activity >= self.idle_seconds
+
+    def _on_tick(self):
+        if not self._running and self.is_idle():
+            self._running = True
+            self.executor.submit_write(self.runner.begin, callback=self._on_begin,
+                                       error_callback=self._on_error)
+        return True
+
+    def _on_begin(self, count: int):
+        if count:
+            log_message(f"Bắt đầu bảo trì database: {count} tác vụ")
+            self._next_slice()
+        else:
+            self._running = False
+
+    def _next_slice(self):
+        if self._timer_id is None or not self.is_idle():
+            # Đã dừng hoặc người dùng quay lại: tác vụ dở được tiếp tục ở lần rảnh sau
+            self._running = False
+            return False
+        self.executor.submit_write(self.runner.run_slice, callback=self._on_slice_done,
+                                   error_callback=self._on_error)
+        return False
+
+    def _on_slice_done(self, more: bool):
+        if more:
+            GLib.timeout_add(self.SLICE_GAP_MS, self._next_slice)
+        else:
+            self._running = False
+
+    def _on_error(self, error: Exception):
+        log_message(f"Lỗi bảo trì database: {error}", "ERROR")
+        self._running = False
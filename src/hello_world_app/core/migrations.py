@@ -0,0 +1,537 @@
+"""
+Schema migrations - Nâng cấp database theo phiên bản lưu trong PRAGMA user_version
+"""
+
+import sqlite3
+from typing import Callable, List, NamedTuple
+
+from .scheduler import DEFAULT_EASE, PASSING_QUALITY
+from .text_codec import COMPRESSED_FIELDS, register_text_codec
+from .word_key import mark_duplicates, register_word_key
+from .word_relations import rewrite_relations
+from ..utils.helpers import log_message
+
+# Các cột được đánh chỉ mục full-text (thứ tự khớp với trọng số bm25 khi tìm kiếm)
+FTS_COLUMNS = ('word', 'definition', 'example', 'context_sentences', 'synonyms', 'antonyms')
+
+# Cột lập lịch ôn tập (SM-2)
+SCHEDULE_COLUMNS = (('due_at', 'TIMESTAMP'), ('interval', 'REAL DEFAULT 0'),
+                    ('ease', f'REAL DEFAULT {DEFAULT_EASE}'), ('repetitions', 'INTEGER DEFAULT 0'))
+
+class Migration(NamedTuple):
+    """Một bước nâng cấp schema, `apply` chạy trong transaction của migrate()"""
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+def _table_columns(cursor: sqlite3.Cursor, table: str) -> set:
+    """Tên các cột hiện có của bảng"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+def _table_exists(cursor: sqlite3.Cursor, name: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+def _add_missing_columns(cursor: sqlite3.Cursor, table: str, columns) -> List[str]:
+    """ALTER TABLE ADD COLUMN cho các cột chưa có, trả về tên các cột đã thêm"""
+    existing = _table_columns(cursor, table)
+    added = []
+    for column, definition in columns:
+        if column not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+            added.append(column)
+    return added
+
+# Mỗi migration phải chạy được trên database tạo bởi bản cũ chưa có user_version,
+# vì vậy đều kiểm tra trạng thái hiện có thay vì giả định schema trống.
+
+def _create_vocabulary_table(cursor: sqlite3.Cursor):
+    """Bảng vocabulary ban đầu"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vocabulary (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL UNIQUE,
+            definition TEXT NOT NULL,
+            example TEXT,
+            pronunciation TEXT,
+            part_of_speech TEXT,
+            context_sentences TEXT,
+            synonyms TEXT,
+            antonyms TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_reviewed TIMESTAMP,
+            review_count INTEGER DEFAULT 0
+        )
+    ''')
+    # Database rất cũ chưa có các cột này
+    _add_missing_columns(cursor, 'vocabulary', (
+        ('context_sentences', 'TEXT'), ('synonyms', 'TEXT'), ('antonyms', 'TEXT')
+    ))
+
+def _create_listing_index(cursor: sqlite3.Cursor):
+    """Chỉ mục cho phân trang keyset theo (created_at, id)"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vocabulary_created_at_id
+        ON vocabulary(created_at, id)
+    ''')
+
+def _create_stats(cursor: sqlite3.Cursor):
+    """Bảng bộ đếm thống kê được trigger cập nhật khi thêm/sửa/xóa (migration 8 thay bằng deck_stats)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vocabulary_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_stats_ai AFTER INSERT ON vocabulary BEGIN
+            UPDATE vocabulary_stats SET value = value + 1 WHERE name = 'total_words';
+            UPDATE vocabulary_stats SET value = value + 1
+            WHERE name = 'reviewed_words' AND new.last_reviewed IS NOT NULL;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_stats_ad AFTER DELETE ON vocabulary BEGIN
+            UPDATE vocabulary_stats SET value = value - 1 WHERE name = 'total_words';
+            UPDATE vocabulary_stats SET value = value - 1
+            WHERE name = 'reviewed_words' AND old.last_reviewed IS NOT NULL;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_stats_au AFTER UPDATE OF last_reviewed ON vocabulary
+        WHEN (old.last_reviewed IS NULL) != (new.last_reviewed IS NULL) BEGIN
+            UPDATE vocabulary_stats
+            SET value = value + (CASE WHEN new.last_reviewed IS NULL THEN -1 ELSE 1 END)
+            WHERE name = 'reviewed_words';
+        END
+    ''')
+    # Đếm lại một lần cho dữ liệu đã có
+    cursor.execute('''
+        INSERT OR REPLACE INTO vocabulary_stats (name, value)
+        SELECT 'total_words', COUNT(*) FROM vocabulary
+        UNION ALL
+        SELECT 'reviewed_words', COUNT(*) FROM vocabulary WHERE last_reviewed IS NOT NULL
+    ''')
+
+def _add_schedule(cursor: sqlite3.Cursor):
+    """Cột lập lịch ôn tập và chỉ mục hàng đợi đến hạn"""
+    _add_missing_columns(cursor, 'vocabulary', SCHEDULE_COLUMNS)
+    # ALTER TABLE không cho DEFAULT CURRENT_TIMESTAMP: từ cũ đến hạn từ lúc được thêm
+    cursor.execute('''
+        UPDATE vocabulary SET due_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+        WHERE due_at IS NULL
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vocabulary_due_at ON vocabulary(due_at)')
+
+def fts_supported(cursor: sqlite3.Cursor) -> bool:
+    """Kiểm tra SQLite có hỗ trợ FTS5 với tokenizer trigram không"""
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(x, tokenize='trigram')")
+        cursor.execute('DROP TABLE temp.fts_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def _create_fts(cursor: sqlite3.Cursor):
+    """Bảng FTS5 external-content và các trigger đồng bộ"""
+    if not fts_supported(cursor):
+        log_message("SQLite không hỗ trợ FTS5 trigram, tìm kiếm dùng LIKE", "WARNING")
+        return
+
+    fts_exists = _table_exists(cursor, 'vocabulary_fts')
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+
+    # Tokenizer trigram cho phép tìm chuỗi con giống LIKE '%term%' nhưng dùng chỉ mục
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_fts USING fts5(
+            {columns},
+            content='vocabulary', content_rowid='id', tokenize='trigram'
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_fts_ai AFTER INSERT ON vocabulary BEGIN
+            INSERT INTO vocabulary_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_fts_ad AFTER DELETE ON vocabulary BEGIN
+            INSERT INTO vocabulary_fts(vocabulary_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+        END
+    ''')
+    # Chỉ đồng bộ lại khi cột văn bản thay đổi, không phải khi ôn tập
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_fts_au AFTER UPDATE OF {columns} ON vocabulary BEGIN
+            INSERT INTO vocabulary_fts(vocabulary_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO vocabulary_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    ''')
+
+    if not fts_exists:
+        cursor.execute("INSERT INTO vocabulary_fts(vocabulary_fts) VALUES ('rebuild')")
+
+def _add_word_key(cursor: sqlite3.Cursor):
+    """Cột word_key chuẩn hóa và chỉ mục UNIQUE
+
+    Từ trùng khóa không bị gộp tự động (không hỏi, không sao lưu): bản trùng
+    giữ word_key NULL cho tới khi chạy scripts/merge_duplicate_words.py.
+    """
+    _add_missing_columns(cursor, 'vocabulary', (('word_key', 'TEXT'),))
+    register_word_key(cursor.connection)
+    cursor.execute('UPDATE vocabulary SET word_key = word_key(word)')
+    marked = mark_duplicates(cursor)
+    if marked:
+        log_message(f"{marked} từ vựng trùng nhau (khác hoa/thường hoặc dạng Unicode) chưa được gộp, "
+                    f"chạy scripts/merge_duplicate_words.py để gộp", "WARNING")
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_vocabulary_word_key ON vocabulary(word_key)')
+
+def _create_maintenance_log(cursor: sqlite3.Cursor):
+    """Lần chạy gần nhất và thời gian của từng tác vụ bảo trì"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS maintenance_log (
+            task TEXT PRIMARY KEY,
+            last_run TIMESTAMP NOT NULL,
+            duration_ms REAL NOT NULL,
+            slices INTEGER NOT NULL
+        )
+    ''')
+
+# Bộ từ mặc định chứa mọi từ có sẵn trước khi có bộ từ
+DEFAULT_DECK_ID = 1
+DEFAULT_DECK_NAME = "Mặc định"
+
+def _create_decks(cursor: sqlite3.Cursor):
+    """Bảng decks, cột deck_id và các chỉ mục theo bộ từ, bộ đếm theo bộ từ"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS decks (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO decks (id, name) VALUES (?, ?)',
+                   (DEFAULT_DECK_ID, DEFAULT_DECK_NAME))
+    _add_missing_columns(cursor, 'vocabulary', (
+        ('deck_id', f'INTEGER NOT NULL DEFAULT {DEFAULT_DECK_ID:d} REFERENCES decks(id)'),
+    ))
+
+    # Mọi truy vấn đều lọc theo deck_id nên chỉ mục cũ được thay bằng bản có deck_id đứng đầu
+    cursor.execute('DROP INDEX IF EXISTS idx_vocabulary_created_at_id')
+    cursor.execute('DROP INDEX IF EXISTS idx_vocabulary_due_at')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vocabulary_deck_created
+        ON vocabulary(deck_id, created_at, id)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vocabulary_deck_due ON vocabulary(deck_id, due_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vocabulary_deck_word ON vocabulary(deck_id, word_key)')
+
+    # Bộ đếm theo bộ từ thay cho vocabulary_stats (cùng cách cập nhật bằng trigger)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS deck_stats (
+            deck_id INTEGER PRIMARY KEY,
+            total_words INTEGER NOT NULL DEFAULT 0,
+            reviewed_words INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS deck_stats_ai AFTER INSERT ON vocabulary BEGIN
+            INSERT INTO deck_stats (deck_id, total_words, reviewed_words)
+            VALUES (new.deck_id, 1, new.last_reviewed IS NOT NULL)
+            ON CONFLICT(deck_id) DO UPDATE SET
+                total_words = total_words + 1,
+                reviewed_words = reviewed_words + excluded.reviewed_words;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS deck_stats_ad AFTER DELETE ON vocabulary BEGIN
+            UPDATE deck_stats
+            SET total_words = total_words - 1,
+                reviewed_words = reviewed_words - (old.last_reviewed IS NOT NULL)
+            WHERE deck_id = old.deck_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS deck_stats_au AFTER UPDATE OF last_reviewed, deck_id ON vocabulary
+        WHEN old.deck_id != new.deck_id
+          OR (old.last_reviewed IS NULL) != (new.last_reviewed IS NULL) BEGIN
+            UPDATE deck_stats
+            SET total_words = total_words - 1,
+                reviewed_words = reviewed_words - (old.last_reviewed IS NOT NULL)
+            WHERE deck_id = old.deck_id;
+            INSERT INTO deck_stats (deck_id, total_words, reviewed_words)
+            VALUES (new.deck_id, 1, new.last_reviewed IS NOT NULL)
+            ON CONFLICT(deck_id) DO UPDATE SET
+                total_words = total_words + 1,
+                reviewed_words = reviewed_words + excluded.reviewed_words;
+        END
+    ''')
+    cursor.execute('DELETE FROM deck_stats')
+    cursor.execute('''
+        INSERT INTO deck_stats (deck_id, total_words, reviewed_words)
+        SELECT deck_id, COUNT(*), COUNT(last_reviewed) FROM vocabulary GROUP BY deck_id
+    ''')
+    # Không còn ai đọc bộ đếm toàn kho, bỏ để mỗi lần ghi không phải cập nhật nó
+    for trigger in ('vocabulary_stats_ai', 'vocabulary_stats_ad', 'vocabulary_stats_au'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute('DROP TABLE IF EXISTS vocabulary_stats')
+
+def _create_tags(cursor: sqlite3.Cursor):
+    """Nhãn và bảng nối nhiều-nhiều với vocabulary"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    ''')
+    # Khóa chính (tag_id, vocab_id) phục vụ lọc theo nhãn; chỉ mục ngược cho nhãn của một từ
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vocabulary_tags (
+            tag_id INTEGER NOT NULL REFERENCES tags(id),
+            vocab_id INTEGER NOT NULL REFERENCES vocabulary(id),
+            PRIMARY KEY (tag_id, vocab_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vocabulary_tags_vocab
+        ON vocabulary_tags(vocab_id, tag_id)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS vocabulary_tags_ad AFTER DELETE ON vocabulary BEGIN
+            DELETE FROM vocabulary_tags WHERE vocab_id = old.id;
+        END
+    ''')
+
+# Số hàng vocabulary đọc mỗi lần khi tách quan hệ của database cũ
+RELATION_BACKFILL_BATCH = 5000
+
+def _create_word_relations(cursor: sqlite3.Cursor):
+    """Bảng quan hệ đồng nghĩa/trái nghĩa tách từ các cột chuỗi, kèm backfill"""
+    # Khóa chính cho cạnh đi ra từ một từ, chỉ mục related_key cho cạnh đi vào
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS word_relations (
+            vocab_id INTEGER NOT NULL REFERENCES vocabulary(id),
+            word_key TEXT NOT NULL,
+            relation TEXT NOT NULL,
+            related_key TEXT NOT NULL,
+            related_word TEXT NOT NULL,
+            PRIMARY KEY (word_key, relation, related_key)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_word_relations_related
+        ON word_relations(related_key, relation)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_word_relations_vocab
+        ON word_relations(vocab_id)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_relations_ad AFTER DELETE ON vocabulary BEGIN
+            DELETE FROM word_relations WHERE vocab_id = old.id;
+        END
+    ''')
+    
+    # Backfill theo lô; cursor riêng để đọc trong khi ghi bằng cursor của migration
+    reader = cursor.connection.cursor()
+    reader.execute('''
+        SELECT id, word_key, synonyms, antonyms FROM vocabulary
+        WHERE synonyms != '' OR antonyms != ''
+    ''')
+    total = 0
+    while True:
+        rows = reader.fetchmany(RELATION_BACKFILL_BATCH)
+        if not rows:
+            break
+        total += rewrite_relations(cursor, rows)
+    if total:
+        log_message(f"Đã tách {total} quan hệ đồng nghĩa/trái nghĩa từ dữ liệu cũ")
+
+def _add_text_compression(cursor: sqlite3.Cursor):
+    """Bảng từ điển nén; trigger FTS chỉ đổi sang vocab_text() khi bật nén (set_fts_text_codec)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS text_dictionaries (
+            checksum INTEGER PRIMARY KEY,
+            data BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _create_review_log(cursor: sqlite3.Cursor):
+    """Nhật ký ôn tập chỉ ghi thêm và bảng tổng hợp theo ngày do trigger cập nhật
+
+    Lịch sử trước đây chỉ còn last_reviewed/review_count nên không backfill được.
+    """
+    # deck_id lúc ôn được ghi lại để bảng tổng hợp luôn suy ra được từ chính nhật ký
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_log (
+            id INTEGER PRIMARY KEY,
+            vocab_id INTEGER NOT NULL,
+            deck_id INTEGER NOT NULL,
+            ts TIMESTAMP NOT NULL,
+            grade INTEGER NOT NULL,
+            latency_ms INTEGER
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_review_log_vocab_ts ON review_log(vocab_id, ts)
+    ''')
+    # Một hàng mỗi bộ từ mỗi ngày (UTC, giống DATE('now')): một năm là ~365 hàng liền nhau
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_daily (
+            deck_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            reviews INTEGER NOT NULL DEFAULT 0,
+            lapses INTEGER NOT NULL DEFAULT 0,
+            latency_ms INTEGER NOT NULL DEFAULT 0,
+            timed_reviews INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (deck_id, day)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS review_daily_ai AFTER INSERT ON review_log BEGIN
+            INSERT INTO review_daily (deck_id, day, reviews, lapses, latency_ms, timed_reviews)
+            VALUES (new.deck_id, DATE(new.ts), 1, new.grade < {PASSING_QUALITY:d},
+                    COALESCE(new.latency_ms, 0), new.latency_ms IS NOT NULL)
+            ON CONFLICT(deck_id, day) DO UPDATE SET
+                reviews = reviews + 1,
+                lapses = lapses + excluded.lapses,
+                latency_ms = latency_ms + excluded.latency_ms,
+                timed_reviews = timed_reviews + excluded.timed_reviews;
+        END
+    ''')
+    # Xóa (dọn nhật ký cũ) vẫn giữ bảng tổng hợp khớp; sửa thì không được phép
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS review_daily_ad AFTER DELETE ON review_log BEGIN
+            UPDATE review_daily
+            SET reviews = reviews - 1,
+                lapses = lapses - (old.grade < {PASSING_QUALITY:d}),
+                latency_ms = latency_ms - COALESCE(old.latency_ms, 0),
+                timed_reviews = timed_reviews - (old.latency_ms IS NOT NULL)
+            WHERE deck_id = old.deck_id AND day = DATE(old.ts);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS review_log_bu BEFORE UPDATE ON review_log BEGIN
+            SELECT RAISE(ABORT, 'review_log chỉ cho phép ghi thêm');
+        END
+    ''')
+
+# Danh sách migration theo thứ tự; chỉ được thêm vào cuối, không sửa bước đã phát hành
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Tạo bảng vocabulary", _create_vocabulary_table),
+    Migration(2, "Chỉ mục phân trang (created_at, id)", _create_listing_index),
+    Migration(3, "Bộ đếm thống kê", _create_stats),
+    Migration(4, "Lập lịch ôn tập SM-2", _add_schedule),
+    Migration(5, "Chỉ mục full-text FTS5", _create_fts),
+    Migration(6, "Khóa từ chuẩn hóa word_key", _add_word_key),
+    Migration(7, "Nhật ký bảo trì", _create_maintenance_log),
+    Migration(8, "Bộ từ (deck) và chỉ mục theo bộ từ", _create_decks),
+    Migration(9, "Nhãn (tag) cho từ vựng", _create_tags),
+    Migration(10, "Bảng quan hệ đồng nghĩa/trái nghĩa", _create_word_relations),
+    Migration(11, "Nén trong suốt các cột văn bản dài", _add_text_compression),
+    Migration(12, "Nhật ký ôn tập và tổng hợp theo ngày", _create_review_log),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Phiên bản schema hiện tại của database"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS) -> int:
+    """Áp dụng các migration còn thiếu trong một transaction, trả về phiên bản mới
+
+    Database đã ở phiên bản mới nhất chỉ tốn một lần đọc user_version.
+    """
+    latest = migrations[-1].version
+    version = get_version(conn)
+    if version >= latest:
+        if version > latest:
+            log_message(f"Database có phiên bản schema {version} mới hơn ứng dụng ({latest})", "WARNING")
+        return version
+
+    cursor = conn.cursor()
+    # Khóa ghi ngay từ đầu để hai process không cùng migrate
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        # Process khác có thể đã migrate trong lúc chờ khóa
+        version = get_version(conn)
+        for migration in migrations:
+            if migration.version <= version:
+                continue
+            migration.apply(cursor)
+            cursor.execute(f'PRAGMA user_version = {migration.version:d}')
+            log_message(f"Đã nâng cấp database lên phiên bản {migration.version}: {migration.description}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return max(version, latest)
+
+def fts_available(conn: sqlite3.Connection) -> bool:
+    """True nếu database có bảng vocabulary_fts"""
+    return _table_exists(conn.cursor(), 'vocabulary_fts')
+
+def fts_uses_text_codec(conn: sqlite3.Connection) -> bool:
+    """True nếu trigger FTS đang đọc các cột nén qua vocab_text()"""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'vocabulary_fts_ai'"
+                       ).fetchone()
+    return row is not None and 'vocab_text(' in row[0]
+
+def set_fts_text_codec(conn: sqlite3.Connection, enabled: bool) -> bool:
+    """Đổi trigger FTS giữa đọc thẳng cột và đọc qua vocab_text(), True nếu đã đổi
+
+    Trigger dùng vocab_text() chỉ chạy được trên kết nối đã register_text_codec(),
+    nên chỉ cài khi có thể có hàng nén; khi không có, sqlite3 CLI, script ngoài và
+    bản ứng dụng cũ vẫn ghi được database. Không tắt khi vẫn còn hàng nén.
+    Chạy trong transaction riêng.
+    """
+    if not fts_available(conn) or fts_uses_text_codec(conn) == enabled:
+        return False
+    register_text_codec(conn)
+    columns = ', '.join(FTS_COLUMNS)
+
+    def values(row: str) -> str:
+        return ', '.join(f'vocab_text({row}.{column})' if enabled and column in COMPRESSED_FIELDS
+                         else f'{row}.{column}' for column in FTS_COLUMNS)
+
+    # Nén/giải nén lại một hàng không đổi nội dung nên không cần đánh chỉ mục lại
+    changed = ' OR '.join(f'vocab_text(old.{column}) IS NOT vocab_text(new.{column})'
+                          if column in COMPRESSED_FIELDS else f'old.{column} IS NOT new.{column}'
+                          for column in FTS_COLUMNS)
+    with conn:
+        conn.execute('BEGIN IMMEDIATE')
+        if not enabled and conn.execute(f'''
+            SELECT EXISTS (SELECT 1 FROM vocabulary WHERE {' OR '.join(
+                f"typeof({column}) = 'blob'" for column in COMPRESSED_FIELDS)})
+        ''').fetchone()[0]:
+            return False
+        for trigger in ('vocabulary_fts_ai', 'vocabulary_fts_ad', 'vocabulary_fts_au'):
+            conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        conn.execute(f'''
+            CREATE TRIGGER vocabulary_fts_ai AFTER INSERT ON vocabulary BEGIN
+                INSERT INTO vocabulary_fts(rowid, {columns}) VALUES (new.id, {values('new')});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER vocabulary_fts_ad AFTER DELETE ON vocabulary BEGIN
+                INSERT INTO vocabulary_fts(vocabulary_fts, rowid, {columns})
+                VALUES ('delete', old.id, {values('old')});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER vocabulary_fts_au AFTER UPDATE OF {columns} ON vocabulary
+            {f'WHEN {changed}' if enabled else ''}
+            BEGIN
+                INSERT INTO vocabulary_fts(vocabulary_fts, rowid, {columns})
+                VALUES ('delete', old.id, {values('old')});
+                INSERT INTO vocabulary_fts(rowid, {columns}) VALUES (new.id, {values('new')});
+            END
+        ''')
+    log_message(f"Trigger FTS {'đọc cột nén qua vocab_text()' if enabled else 'đọc thẳng cột văn bản'}")
+    return True
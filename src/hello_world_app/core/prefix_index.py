@@ -0,0 +1,85 @@
+"""
+Prefix index - Chỉ mục tiền tố trong bộ nhớ cho gợi ý từ khi gõ
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .word_key import normalize_word
+
+class PrefixIndex:
+    """Mảng word_key đã sắp xếp, tra tiền tố bằng bisect
+
+    Gợi ý và kiểm tra trùng không chạm tới SQLite; sau khi load() chỉ số được
+    cập nhật từng hàng từ sự kiện thay đổi. Không an toàn đa luồng: gọi từ
+    một thread (GTK main loop).
+    """
+
+    DEFAULT_LIMIT = 10
+
+    def __init__(self):
+        self._keys: List[str] = []
+        # word_key -> (id, từ gốc) và id -> word_key để sửa/xóa theo id
+        self._entries: Dict[str, Tuple[int, str]] = {}
+        self._id_keys: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, rows: Iterable[Tuple[int, str, Optional[str]]]):
+        """Thay toàn bộ nội dung bằng các hàng (id, từ, word_key)"""
+        entries = {}
+        id_keys = {}
+        for vocab_id, word, key in rows:
+            key = key or normalize_word(word)
+            entries[key] = (vocab_id, word)
+            id_keys[vocab_id] = key
+        self._entries = entries
+        self._id_keys = id_keys
+        # Hàng từ get_word_keys() đã theo thứ tự word_key nên sort gần như O(n)
+        self._keys = sorted(entries)
+
+    def update(self, rows: Iterable[Tuple[int, str]]):
+        """Thêm hoặc đổi từ của các hàng (id, từ)"""
+        for vocab_id, word in rows:
+            self.remove((vocab_id,))
+            key = normalize_word(word)
+            if not key:
+                continue
+            if key in self._entries:
+                self._id_keys.pop(self._entries[key][0], None)
+            else:
+                insort(self._keys, key)
+            self._entries[key] = (vocab_id, word)
+            self._id_keys[vocab_id] = key
+
+    def remove(self, ids: Iterable[int]):
+        """Bỏ các hàng theo id"""
+        for vocab_id in ids:
+            key = self._id_keys.pop(vocab_id, None)
+            if key is None:
+                continue
+            del self._entries[key]
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def lookup(self, word: str) -> Optional[int]:
+        """Id của từ trùng khóa với `word`, None nếu chưa có"""
+        entry = self._entries.get(normalize_word(word))
+        return entry[0] if entry else None
+
+    def complete(self, prefix: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        """Tối đa `limit` từ có khóa bắt đầu bằng `prefix`, theo thứ tự khóa"""
+        key = normalize_word(prefix)
+        if not key:
+            return []
+        words = []
+        position = bisect_left(self._keys, key)
+        while position < len(self._keys) and len(words) < limit:
+            candidate = self._keys[position]
+            if not candidate.startswith(key):
+                break
+            words.append(self._entries[candidate][1])
+            position += 1
+        return words
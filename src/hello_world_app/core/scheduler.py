@@ -0,0 +1,69 @@
+"""
+Scheduler - Lập lịch ôn tập ngắt quãng theo thuật toán SM-2
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+# Điểm đánh giá mỗi lần ôn: 0 (quên hẳn) .. 5 (nhớ ngay)
+MIN_QUALITY = 0
+MAX_QUALITY = 5
+PASSING_QUALITY = 3
+# Điểm mặc định khi chỉ "đánh dấu đã ôn" mà không chấm điểm
+DEFAULT_QUALITY = 4
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Khoảng ôn tối đa (ngày); tránh tràn datetime khi một thẻ được ôn liên tục nhiều lần
+MAX_INTERVAL = 36500.0
+
+# Định dạng giống CURRENT_TIMESTAMP của SQLite (UTC) để so sánh chuỗi đúng thứ tự
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+class ReviewState(NamedTuple):
+    """Trạng thái lập lịch của một thẻ sau khi chấm điểm"""
+    repetitions: int
+    interval: float
+    ease: float
+
+def schedule_review(quality: int, repetitions: int = 0, interval: float = 0.0,
+                    ease: float = DEFAULT_EASE) -> ReviewState:
+    """Tính trạng thái mới theo SM-2 từ điểm `quality` và trạng thái hiện tại
+
+    `interval` tính theo ngày. Trả lời sai (quality < 3) đưa thẻ về đầu chu kỳ.
+    """
+    if not MIN_QUALITY <= quality <= MAX_QUALITY:
+        raise ValueError(f"Điểm ôn tập phải trong khoảng {MIN_QUALITY}-{MAX_QUALITY}: {quality}")
+
+    repetitions = repetitions or 0
+    interval = interval or 0.0
+    ease = ease or DEFAULT_EASE
+
+    if quality < PASSING_QUALITY:
+        repetitions = 0
+        interval = 1.0
+    else:
+        if repetitions == 0:
+            interval = 1.0
+        elif repetitions == 1:
+            interval = 6.0
+        else:
+            interval = min(MAX_INTERVAL, float(round(interval * ease)))
+        repetitions += 1
+
+    ease += 0.1 - (MAX_QUALITY - quality) * (0.08 + (MAX_QUALITY - quality) * 0.02)
+    return ReviewState(repetitions, interval, max(MIN_EASE, ease))
+
+def format_timestamp(moment: datetime) -> str:
+    """Chuyển datetime thành chuỗi thời gian UTC theo định dạng SQLite"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+def utc_now() -> datetime:
+    """Thời điểm hiện tại (UTC, không kèm tzinfo) khớp với CURRENT_TIMESTAMP"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def next_due(interval: float, now: Optional[datetime] = None) -> str:
+    """Thời điểm đến hạn ôn tập tiếp theo sau `interval` ngày"""
+    return format_timestamp((now or utc_now()) + timedelta(days=interval))
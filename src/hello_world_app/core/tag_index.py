@@ -0,0 +1,179 @@
+"""
+Tag index - Bitset theo nhãn trong bộ nhớ để lọc kiểu `tag:travel AND NOT tag:mastered`
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+TAG_PREFIX = 'tag:'
+
+_TOKEN_RE = re.compile(r'\(|\)|[^\s()]+')
+_TAG_QUERY_RE = re.compile(r'(?:^|[\s(])tag:', re.IGNORECASE)
+
+# ('tag', tên) | ('not', biểu thức) | ('and'/'or', biểu thức, biểu thức)
+TagQuery = Tuple[Union[str, 'TagQuery'], ...]
+
+def normalize_tag(name: str) -> str:
+    """Tên nhãn chuẩn: chữ thường, khoảng trắng thành '-', không có ngoặc"""
+    return '-'.join(name.replace('(', ' ').replace(')', ' ').casefold().split())
+
+def split_tags(text: str) -> List[str]:
+    """Tách chuỗi nhãn cách nhau bằng dấu phẩy, bỏ nhãn trống và trùng"""
+    return list(dict.fromkeys(tag for tag in map(normalize_tag, text.split(',')) if tag))
+
+def is_tag_query(text: str) -> bool:
+    """True nếu chuỗi tìm kiếm có ít nhất một điều kiện tag:"""
+    return bool(_TAG_QUERY_RE.search(text))
+
+def parse_tag_query(text: str) -> TagQuery:
+    """Phân tích biểu thức nhãn: NOT > AND > OR, hai điều kiện liền nhau là AND
+
+    `tag:travel AND NOT tag:mastered`, `tag:a (tag:b OR tag:c)`.
+    Raise ValueError nếu biểu thức sai cú pháp.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    position = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position].upper() if position < len(tokens) else None
+
+    def parse_or() -> TagQuery:
+        nonlocal position
+        node = parse_and()
+        while peek() == 'OR':
+            position += 1
+            node = ('or', node, parse_and())
+        return node
+
+    def parse_and() -> TagQuery:
+        nonlocal position
+        node = parse_not()
+        while peek() not in (None, 'OR', ')'):
+            if peek() == 'AND':
+                position += 1
+            node = ('and', node, parse_not())
+        return node
+
+    def parse_not() -> TagQuery:
+        nonlocal position
+        token = peek()
+        if token is None:
+            raise ValueError(f"Biểu thức nhãn bị thiếu điều kiện: {text!r}")
+        position += 1
+        if token == 'NOT':
+            return ('not', parse_not())
+        if token == '(':
+            node = parse_or()
+            if peek() != ')':
+                raise ValueError(f"Thiếu dấu ')' trong biểu thức nhãn: {text!r}")
+            position += 1
+            return node
+        raw = tokens[position - 1]
+        if not raw.lower().startswith(TAG_PREFIX) or not normalize_tag(raw[len(TAG_PREFIX):]):
+            raise ValueError(f"Điều kiện không hợp lệ '{raw}', cần dạng tag:tên")
+        return ('tag', normalize_tag(raw[len(TAG_PREFIX):]))
+
+    node = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Thừa '{tokens[position]}' trong biểu thức nhãn: {text!r}")
+    return node
+
+def ids_bitset(ids: Iterable[int]) -> int:
+    """Bitset của các id, dựng qua bytearray thay vì OR từng bit vào số nguyên lớn"""
+    buffer = bytearray()
+    for vocab_id in ids:
+        byte = vocab_id >> 3
+        if byte >= len(buffer):
+            buffer.extend(bytes(byte - len(buffer) + 1))
+        buffer[byte] |= 1 << (vocab_id & 7)
+    return int.from_bytes(buffer, 'little')
+
+def bitset_ids(bits: int, limit: Optional[int] = None) -> List[int]:
+    """Các id có bit bằng 1, id lớn (mới thêm) trước"""
+    digits = bin(bits)
+    top = len(digits) - 1
+    ids = []
+    # Tìm '1' bằng str.find chạy trong C thay vì dịch bit từng vị trí
+    index = digits.find('1', 2)
+    while index != -1 and (limit is None or len(ids) < limit):
+        ids.append(top - index)
+        index = digits.find('1', index + 1)
+    return ids
+
+class TagIndex:
+    """Bitset (Python int, bit thứ i là từ có id i) cho từng nhãn của một bộ từ
+
+    AND/OR/NOT là phép toán bit trên số nguyên lớn, vài micro giây với hàng
+    chục nghìn từ; NOT lấy phần bù trong tập mọi từ của bộ từ. An toàn đa luồng.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bits: Dict[str, int] = {}
+        self._all = 0
+
+    def __len__(self) -> int:
+        return bin(self._all).count('1')
+
+    def load(self, ids: Iterable[int], tag_rows: Iterable[Tuple[int, str]]):
+        """Thay toàn bộ nội dung: mọi id của bộ từ và các cặp (id, nhãn)"""
+        all_bits = ids_bitset(ids)
+        tag_ids: Dict[str, List[int]] = {}
+        for vocab_id, tag in tag_rows:
+            tag_ids.setdefault(tag, []).append(vocab_id)
+        bits = {tag: ids_bitset(vocab_ids) for tag, vocab_ids in tag_ids.items()}
+        with self._lock:
+            self._all = all_bits
+            self._bits = bits
+
+    def set_rows(self, ids: Iterable[int], tag_rows: Iterable[Tuple[int, str]]):
+        """Thêm các id vào bộ từ và thay nhãn của chúng bằng `tag_rows`"""
+        mask = ids_bitset(ids)
+        tag_ids: Dict[str, List[int]] = {}
+        for vocab_id, tag in tag_rows:
+            tag_ids.setdefault(tag, []).append(vocab_id)
+        added = {tag: ids_bitset(vocab_ids) for tag, vocab_ids in tag_ids.items()}
+        with self._lock:
+            self._all |= mask
+            self._clear(mask)
+            for tag, bits in added.items():
+                self._bits[tag] = self._bits.get(tag, 0) | bits
+
+    def remove(self, ids: Iterable[int]):
+        """Bỏ các id khỏi bộ từ và khỏi mọi nhãn"""
+        mask = ids_bitset(ids)
+        with self._lock:
+            self._all &= ~mask
+            self._clear(mask)
+
+    def _clear(self, mask: int):
+        for tag in [tag for tag, bits in self._bits.items() if bits & mask]:
+            bits = self._bits[tag] & ~mask
+            if bits:
+                self._bits[tag] = bits
+            else:
+                del self._bits[tag]
+
+    def counts(self) -> Dict[str, int]:
+        """Số từ của mỗi nhãn"""
+        with self._lock:
+            return {tag: bin(bits).count('1') for tag, bits in self._bits.items()}
+
+    def match(self, query: Union[str, TagQuery], limit: Optional[int] = None) -> List[int]:
+        """Id các từ khớp biểu thức nhãn, id lớn trước"""
+        if isinstance(query, str):
+            query = parse_tag_query(query)
+        with self._lock:
+            bits = self._evaluate(query)
+        return bitset_ids(bits, limit)
+
+    def _evaluate(self, node: TagQuery) -> int:
+        op = node[0]
+        if op == 'tag':
+            return self._bits.get(node[1], 0)
+        if op == 'not':
+            return self._all & ~self._evaluate(node[1])
+        if op == 'and':
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        return self._evaluate(node[1]) | self._evaluate(node[2])
@@ -0,0 +1,166 @@
+"""
+Text codec - Nén trong suốt các cột văn bản dài bằng zlib với từ điển huấn luyện sẵn
+"""
+
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Union
+
+# Các cột văn bản dài có thể được lưu ở dạng nén
+COMPRESSED_FIELDS = ('definition', 'example', 'context_sentences')
+
+# Hàng cũ vẫn là TEXT; hàng nén là BLOB có byte đầu cho biết định dạng
+FORMAT_ZLIB = 0x01
+# Dưới ngưỡng này (byte UTF-8) phần đầu zlib làm mất hết lợi ích
+MIN_COMPRESS_LENGTH = 48
+COMPRESSION_LEVEL = 6
+# zlib chỉ nhìn được 32 KiB trước đó, từ điển dài hơn bị cắt mất phần đầu
+DICTIONARY_SIZE = 32 * 1024
+# Cụm từ dài tối đa bao nhiêu từ khi huấn luyện từ điển
+_MAX_PHRASE_WORDS = 3
+# Bit FDICT trong byte FLG của header zlib: theo sau là DICTID (adler32) 4 byte
+_FDICT = 0x20
+
+StoredText = Union[str, bytes, None]
+
+_lock = threading.Lock()
+# adler32 -> nội dung từ điển, dùng chung cho mọi kết nối trong process
+_dictionaries: Dict[int, bytes] = {}
+# Database có thể chứa từ điển chưa được nạp (process khác vừa huấn luyện)
+_sources: List[str] = []
+# Nạp 32 KiB từ điển tốn hơn nén/giải nén một hàng, nên mỗi từ điển chỉ nạp một lần
+# vào một đối tượng mồi rồi copy() cho từng giá trị
+_compressors: Dict[bytes, 'zlib._Compress'] = {}
+# Khóa là header zlib 6 byte (gồm DICTID) của luồng
+_decompressors: Dict[bytes, 'zlib._Decompress'] = {}
+
+def register_dictionary(data: bytes) -> int:
+    """Thêm từ điển vào bộ nhớ, trả về checksum adler32 ghi trong header zlib"""
+    checksum = zlib.adler32(data)
+    with _lock:
+        _dictionaries[checksum] = data
+    return checksum
+
+def add_dictionary_source(db_path: str):
+    """Cho phép tra từ điển còn thiếu trong bảng text_dictionaries của database"""
+    with _lock:
+        _sources.append(db_path)
+
+def remove_dictionary_source(db_path: str):
+    """Bỏ một lần đăng ký của add_dictionary_source"""
+    with _lock:
+        if db_path in _sources:
+            _sources.remove(db_path)
+
+def load_dictionaries(conn: sqlite3.Connection) -> Optional[bytes]:
+    """Nạp mọi từ điển trong database, trả về từ điển mới nhất (dùng khi nén)"""
+    latest = None
+    for data, in conn.execute('SELECT data FROM text_dictionaries ORDER BY created_at, rowid'):
+        register_dictionary(data)
+        latest = data
+    return latest
+
+def _dictionary(checksum: int) -> bytes:
+    """Từ điển theo checksum, đọc từ database nguồn nếu chưa có trong bộ nhớ"""
+    with _lock:
+        data = _dictionaries.get(checksum)
+        sources = list(_sources)
+    if data is not None:
+        return data
+    for db_path in dict.fromkeys(sources):
+        try:
+            # Kết nối riêng, chỉ đọc: được gọi từ trong hàm SQL của kết nối khác
+            conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+            try:
+                row = conn.execute('SELECT data FROM text_dictionaries WHERE checksum = ?',
+                                   (checksum,)).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            continue
+        if row:
+            register_dictionary(row[0])
+            return row[0]
+    raise ValueError(f"Không tìm thấy từ điển nén {checksum:#010x}")
+
+def encode_text(text: str, dictionary: Optional[bytes] = None) -> Union[str, bytes]:
+    """Nén chuỗi thành BLOB nếu đủ dài và nhỏ hơn thật, ngược lại giữ nguyên
+
+    `dictionary` phải đã được register_dictionary() (và lưu vào database) để giải nén được.
+    """
+    data = text.encode('utf-8')
+    if len(data) < MIN_COMPRESS_LENGTH:
+        return text
+    if dictionary:
+        primed = _compressors.get(dictionary)
+        if primed is None:
+            primed = _compressors[dictionary] = zlib.compressobj(COMPRESSION_LEVEL, zdict=dictionary)
+        compressor = primed.copy()
+    else:
+        compressor = zlib.compressobj(COMPRESSION_LEVEL)
+    packed = bytes((FORMAT_ZLIB,)) + compressor.compress(data) + compressor.flush()
+    return packed if len(packed) < len(data) else text
+
+def decode_text(value: StoredText, max_length: Optional[int] = None) -> Optional[str]:
+    """Giá trị đọc từ database thành chuỗi; TEXT và NULL được trả về nguyên vẹn
+
+    `max_length`: chỉ giải nén đủ cho chừng đó ký tự đầu (xem trước trong danh sách).
+    Raise ValueError nếu BLOB có định dạng không biết hoặc thiếu từ điển.
+    """
+    if not isinstance(value, bytes):
+        return value
+    if not value or value[0] != FORMAT_ZLIB:
+        raise ValueError(f"Định dạng văn bản nén không hợp lệ: {value[:1]!r}")
+    stream = value[1:]
+    try:
+        if len(stream) >= 6 and stream[1] & _FDICT:
+            header = stream[:6]
+            primed = _decompressors.get(header)
+            if primed is None:
+                primed = zlib.decompressobj(zdict=_dictionary(int.from_bytes(header[2:], 'big')))
+                # Đọc header để zlib nạp từ điển ngay bây giờ
+                primed.decompress(header)
+                _decompressors[header] = primed
+            decompressor = primed.copy()
+            stream = stream[6:]
+        else:
+            decompressor = zlib.decompressobj()
+        if max_length is not None:
+            # Mỗi ký tự tối đa 4 byte UTF-8; ký tự bị cắt dở ở cuối được bỏ qua
+            data = decompressor.decompress(stream, max_length * 4)
+            return data.decode('utf-8', 'ignore')[:max_length]
+        data = decompressor.decompress(stream) + decompressor.flush()
+    except zlib.error as e:
+        raise ValueError(f"Văn bản nén bị hỏng: {e}") from e
+    return data.decode('utf-8')
+
+def register_text_codec(conn: sqlite3.Connection):
+    """Đăng ký hàm SQL vocab_text(x) giải nén một cột (dùng trong trigger FTS và LIKE)"""
+    conn.create_function('vocab_text', 1, decode_text, deterministic=True)
+
+def train_dictionary(samples: Iterable[str], size: int = DICTIONARY_SIZE) -> bytes:
+    """Từ điển zlib từ văn bản mẫu: các cụm 1-3 từ tiết kiệm nhiều byte nhất
+
+    zlib coi từ điển như dữ liệu đứng ngay trước chuỗi cần nén, khoảng cách
+    ngắn tốn ít bit hơn nên cụm có giá trị cao nhất được đặt ở cuối.
+    """
+    counts = Counter()
+    for text in samples:
+        words = text.split()
+        for length in range(1, _MAX_PHRASE_WORDS + 1):
+            for start in range(len(words) - length + 1):
+                counts[' '.join(words[start:start + length])] += 1
+
+    chosen = []
+    total = 0
+    ranked = sorted(((count * len(phrase), phrase) for phrase, count in counts.items()
+                     if count > 1 and len(phrase) > 2), reverse=True)
+    for _, phrase in ranked:
+        encoded = phrase.encode('utf-8') + b' '
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+    return b''.join(reversed(chosen))
@@ -0,0 +1,46 @@
+"""
+Vocabulary cache - Bộ nhớ đệm đọc-xuyên cho các truy vấn đọc toàn bảng
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class VocabularyCache:
+    """Lưu kết quả đọc theo tên và phạm vi, hợp lệ khi khóa phiên bản không đổi
+
+    Khóa phiên bản do VocabularyManager tính (PRAGMA data_version của kết nối
+    hiện tại) để phát hiện ghi từ process khác; ghi trong process này gọi
+    invalidate() vì data_version không đổi với thay đổi của chính kết nối đó.
+    data_version của hai kết nối không so sánh được với nhau nên mỗi kết nối
+    (`scope`) có mục riêng, các thread đọc không đẩy mục của nhau ra.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, Hashable], Tuple[Hashable, int, Any]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, key: Hashable, loader: Callable[[], Any],
+            scope: Hashable = None) -> Any:
+        """Trả về giá trị đã lưu nếu `key` khớp, ngược lại gọi loader và lưu lại"""
+        with self._lock:
+            entry = self._entries.get((name, scope))
+            generation = self._generation
+            if entry is not None and entry[0] == key and entry[1] == generation:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # Nạp ngoài khóa; nếu có ghi trong lúc nạp, generation đã tăng nên lần sau nạp lại
+        value = loader()
+        with self._lock:
+            self._entries[(name, scope)] = (key, generation, value)
+        return value
+
+    def invalidate(self):
+        """Bỏ toàn bộ giá trị đã lưu (gọi sau mỗi lần ghi)"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
@@ -0,0 +1,216 @@
+"""
+Vocabulary I/O - Đọc/ghi file từ vựng theo luồng để nhập và xuất hàng loạt
+"""
+
+import csv
+import html
+import json
+import os
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from ..utils.helpers import log_message
+
+# Thứ tự cột mặc định cho file CSV/TSV không có dòng tiêu đề
+IMPORT_FIELDS = ('word', 'definition', 'example', 'pronunciation', 'part_of_speech',
+                 'context_sentences', 'synonyms', 'antonyms')
+
+FORMATS = ('csv', 'tsv', 'jsonl')
+
+def detect_format(path: str) -> str:
+    """Đoán định dạng file theo phần mở rộng"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('txt', 'tab'):
+        return 'tsv'
+    if extension in ('json', 'ndjson'):
+        return 'jsonl'
+    if extension not in FORMATS:
+        raise ValueError(f"Không nhận dạng được định dạng file: {path}")
+    return extension
+
+def _read_delimited(path: str, delimiter: str) -> Iterator[Dict[str, str]]:
+    """Đọc CSV/TSV từng dòng; dùng dòng tiêu đề nếu có cột 'word'"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        first = next(reader, None)
+        if first is None:
+            return
+
+        header = [name.strip().lower() for name in first]
+        if 'word' in header:
+            fieldnames = header
+        else:
+            fieldnames = list(IMPORT_FIELDS)
+            yield dict(zip(fieldnames, first))
+
+        for row in reader:
+            if row:
+                yield dict(zip(fieldnames, row))
+
+def read_csv(path: str) -> Iterator[Dict[str, str]]:
+    """Đọc file CSV theo luồng"""
+    return _read_delimited(path, ',')
+
+def read_tsv(path: str) -> Iterator[Dict[str, str]]:
+    """Đọc file TSV theo luồng (tương thích file xuất từ Anki)"""
+    return _read_delimited(path, '\t')
+
+def read_jsonl(path: str) -> Iterator[Dict[str, str]]:
+    """Đọc file JSON Lines theo luồng, mỗi dòng một object"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                log_message(f"Bỏ qua dòng {line_number} không hợp lệ trong {path}: {e}", "WARNING")
+                continue
+            if isinstance(record, dict):
+                yield record
+
+READERS = {
+    'csv': read_csv,
+    'tsv': read_tsv,
+    'jsonl': read_jsonl,
+}
+
+def iter_chunks(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Chia một luồng bản ghi thành các lô có kích thước cố định"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def import_vocabulary_file(manager, path: str, file_format: Optional[str] = None,
+                           on_conflict: str = 'skip', chunk_size: int = 1000,
+                           progress: Optional[Callable[[int, Dict[str, int]], None]] = None
+                           ) -> Dict[str, int]:
+    """Nhập file từ vựng vào `manager` theo từng lô, bộ nhớ không phụ thuộc kích thước file
+
+    Mỗi lô là một lần gọi add_vocabulary_many (một transaction). `progress`
+    được gọi sau mỗi lô với (số hàng đã xử lý, thống kê theo trạng thái).
+    Trả về thống kê số hàng theo trạng thái.
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in READERS:
+        raise ValueError(f"Định dạng không hỗ trợ: {file_format}")
+
+    counts: Dict[str, int] = {}
+    processed = 0
+    for chunk in iter_chunks(READERS[file_format](path), chunk_size):
+        for outcome in manager.add_vocabulary_many(chunk, on_conflict=on_conflict):
+            counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        processed += len(chunk)
+        if progress:
+            progress(processed, dict(counts))
+
+    log_message(f"Đã nhập {processed} hàng từ {path}: {counts}")
+    return counts
+
+# Cột được xuất; CSV/TSV/JSONL có dòng tiêu đề nên nhập lại được bằng import_vocabulary_file
+EXPORT_FIELDS = IMPORT_FIELDS + ('created_at', 'last_reviewed', 'review_count',
+                                 'due_at', 'interval', 'ease', 'repetitions')
+
+EXPORT_FORMATS = ('csv', 'tsv', 'jsonl', 'anki')
+
+# Bộ đệm ghi file: ít lời gọi write() hệ thống khi xuất hàng triệu dòng
+EXPORT_BUFFER_SIZE = 1 << 16
+
+def detect_export_format(path: str) -> str:
+    """Đoán định dạng xuất theo phần mở rộng (.txt là file nhập cho Anki)"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'txt':
+        return 'anki'
+    if extension in ('json', 'ndjson'):
+        return 'jsonl'
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Không nhận dạng được định dạng file: {path}")
+    return extension
+
+RowWriter = Callable[[List[tuple]], None]
+
+def _delimited_writer(f: TextIO, delimiter: str) -> RowWriter:
+    writer = csv.writer(f, delimiter=delimiter)
+    writer.writerow(EXPORT_FIELDS)
+    return writer.writerows
+
+def _jsonl_writer(f: TextIO) -> RowWriter:
+    def write(rows: List[tuple]):
+        f.writelines(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+                     for row in rows)
+    return write
+
+_FIELD_INDEX = {field: index for index, field in enumerate(EXPORT_FIELDS)}
+
+def _anki_html(text: Optional[str]) -> str:
+    """Escape HTML, xuống dòng thành <br> (Anki đọc mỗi ghi chú trên một dòng)"""
+    return html.escape(text or '').replace('\r\n', '\n').replace('\n', '<br>').replace('\t', ' ')
+
+def _anki_note(row: tuple) -> tuple:
+    """Một ghi chú Basic: Front = từ, Back = nghĩa và các trường phụ, Tags = từ loại"""
+    value = lambda field: row[_FIELD_INDEX[field]]
+    back = [_anki_html(value('definition'))]
+    if value('pronunciation'):
+        back.append(f"[{_anki_html(value('pronunciation'))}]")
+    if value('example'):
+        back.append(f"<i>{_anki_html(value('example'))}</i>")
+    if value('synonyms'):
+        back.append(f"≈ {_anki_html(value('synonyms'))}")
+    if value('antonyms'):
+        back.append(f"≠ {_anki_html(value('antonyms'))}")
+    tags = '_'.join((value('part_of_speech') or '').split())
+    return _anki_html(value('word')), '<br>'.join(back), tags
+
+def _anki_writer(f: TextIO) -> RowWriter:
+    # Dòng tiêu đề theo định dạng file văn bản của Anki (2.1.55+)
+    f.write('#separator:tab\n#html:true\n#columns:Front\tBack\tTags\n#tags column:3\n')
+    writer = csv.writer(f, delimiter='\t')
+
+    def write(rows: List[tuple]):
+        writer.writerows(_anki_note(row) for row in rows)
+    return write
+
+WRITERS: Dict[str, Callable[[TextIO], RowWriter]] = {
+    'csv': lambda f: _delimited_writer(f, ','),
+    'tsv': lambda f: _delimited_writer(f, '\t'),
+    'jsonl': _jsonl_writer,
+    'anki': _anki_writer,
+}
+
+def export_vocabulary_file(manager, path: str, file_format: Optional[str] = None,
+                           batch_size: int = 1000,
+                           progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """Xuất toàn bộ từ vựng ra file theo từng lô fetchmany, bộ nhớ không phụ thuộc số từ
+
+    Ghi vào file tạm rồi đổi tên, nên file đích không bao giờ bị ghi dở.
+    `progress` được gọi sau mỗi lô với (số hàng đã ghi, tổng số từ).
+    Trả về số hàng đã ghi.
+    """
+    file_format = file_format or detect_export_format(path)
+    if file_format not in WRITERS:
+        raise ValueError(f"Định dạng không hỗ trợ: {file_format}")
+
+    total = manager.get_vocabulary_stats().get('total_words', 0)
+    temp_path = f'{path}.part'
+    written = 0
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='', buffering=EXPORT_BUFFER_SIZE) as f:
+            write = WRITERS[file_format](f)
+            for rows in manager.iter_export_batches(EXPORT_FIELDS, batch_size):
+                write(rows)
+                written += len(rows)
+                if progress:
+                    progress(written, total)
+        os.replace(temp_path, path)
+    except BaseException as e:
+        log_message(f"Lỗi xuất từ vựng ra {path}: {e}", "ERROR")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    log_message(f"Đã xuất {written} từ vựng ra {path} ({file_format})")
+    return written
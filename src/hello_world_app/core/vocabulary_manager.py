@@ -4,15 +4,102 @@ Vocabulary Manager - Quản lý kho từ vựng
 
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
+from .config_manager import config_manager
+from .database import ConnectionManager
+from .events import ADDED, DECK_CHANGED, DELETED, REVIEWED, UPDATED, EventBus
+from .fuzzy_index import FuzzyIndex
+from .migrations import DEFAULT_DECK_ID, FTS_COLUMNS, fts_available, migrate, set_fts_text_codec
+from .scheduler import (DEFAULT_QUALITY, MAX_QUALITY, MIN_QUALITY,
+                        ReviewState, format_timestamp, next_due, schedule_review, utc_now)
+from .tag_index import TagIndex, is_tag_query, normalize_tag
+from .text_codec import (COMPRESSED_FIELDS, add_dictionary_source, decode_text, encode_text,
+                         load_dictionaries, register_dictionary, remove_dictionary_source,
+                         train_dictionary)
+from .vocabulary_cache import VocabularyCache
+from .vocabulary_record import VocabularyRecord
+from .word_key import normalize_word
+from .word_relations import RELATIONS, SYNONYM, rewrite_relations
 from ..utils.helpers import log_message
 
+class ImportOutcome(NamedTuple):
+    """Kết quả nhập của một hàng trong add_vocabulary_many"""
+    index: int
+    word: str
+    status: str  # 'inserted', 'updated', 'skipped', 'invalid' hoặc 'error'
+
 class VocabularyManager:
-    """Class quản lý kho từ vựng"""
+    """Class quản lý kho từ vựng
+    
+    Mỗi từ thuộc đúng một bộ từ (deck); mọi truy vấn danh sách, tìm kiếm,
+    thống kê và thêm mới đều giới hạn trong bộ từ hiện tại `deck_id`
+    (đổi bằng set_deck). Tra cứu theo id hoặc khóa từ thì không, vì id và
+    word_key là duy nhất trên toàn kho.
+    """
+    
+    # Các cột được đánh chỉ mục full-text (thứ tự khớp với trọng số bm25)
+    FTS_COLUMNS = FTS_COLUMNS
+    FTS_WEIGHTS = (10.0, 4.0, 1.0, 1.0, 2.0, 2.0)
+    # Tokenizer trigram cần ít nhất 3 ký tự để dùng được chỉ mục
+    FTS_MIN_TERM_LENGTH = 3
+    
+    # Các cột có thể ghi khi thêm/nhập từ vựng
+    WRITABLE_FIELDS = ('word', 'definition', 'example', 'pronunciation', 'part_of_speech',
+                       'context_sentences', 'synonyms', 'antonyms')
+    CONFLICT_MODES = ('skip', 'update', 'fill_missing')
+    _RELATION_FIELD_INDEXES = (WRITABLE_FIELDS.index('synonyms'), WRITABLE_FIELDS.index('antonyms'))
+    _COMPRESSED_FIELD_INDEXES = tuple(map(WRITABLE_FIELDS.index, COMPRESSED_FIELDS))
+    # Thao tác ghi có thể gom vào một transaction bằng apply_writes
+    WRITE_OPERATIONS = ('update_vocabulary', 'delete_vocabulary', 'grade', 'mark_as_reviewed')
+    
+    # Giới hạn số tham số cho một truy vấn IN (...) (SQLite cũ chỉ cho 999)
+    MAX_QUERY_PARAMS = 900
     
-    def __init__(self):
-        self.db_path = self._get_db_path()
+    # Lấy mẫu ngẫu nhiên: dưới mật độ id này thì quay về ORDER BY RANDOM()
+    RANDOM_MIN_DENSITY = 0.05
+    RANDOM_MAX_ROUNDS = 20
+    # Số ngày chưa ôn để một từ có trọng số đầy đủ khi lấy mẫu có trọng số
+    RANDOM_STALE_DAYS = 30
+    RANDOM_MIN_WEIGHT = 0.01
+    _REVIEW_COUNT_INDEX = VocabularyRecord.LIGHT_FIELDS.index('review_count')
+    _LAST_REVIEWED_INDEX = VocabularyRecord.LIGHT_FIELDS.index('last_reviewed')
+    
+    # Đồ thị từ: độ sâu tối đa và số hàng tối đa CTE đệ quy được sinh ra
+    GRAPH_MAX_DEPTH = 4
+    GRAPH_MAX_ROWS = 2000
+    
+    # Cột SELECT cho bản ghi đầy đủ (tra cứu theo id/từ) và cho danh sách (nạp lười)
+    FULL_COLUMNS = VocabularyRecord.full_select_columns()
+    LIST_COLUMNS = VocabularyRecord.list_select_columns()
+    LIST_COLUMNS_V = VocabularyRecord.list_select_columns('v')
+    
+    def __init__(self, db_path: Optional[str] = None, cache: Optional[VocabularyCache] = None,
+                 events: Optional[EventBus] = None, text_compression: bool = False):
+        self.db_path = db_path or self._get_db_path()
+        self.db = ConnectionManager(self.db_path)
+        # Bộ nhớ đệm cho các lần đọc toàn bảng; None = luôn đọc từ database
+        self.cache = cache
+        # Sự kiện added/updated/deleted/reviewed cho các view
+        self.events = events or EventBus()
+        self.fts_enabled = False
+        # Bộ từ hiện tại; đọc một lần vào biến cục bộ ở đầu mỗi truy vấn
+        self.deck_id = DEFAULT_DECK_ID
+        # Chỉ mục trigram cho tìm kiếm gần đúng, dựng khi cần lần đầu
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        self._fuzzy_lock = threading.Lock()
+        # Bitset theo nhãn của bộ từ hiện tại, dựng khi lọc theo nhãn lần đầu
+        self._tag_index: Optional[TagIndex] = None
+        self._tag_lock = threading.Lock()
+        # Một bound method dùng chung cho mọi bản ghi thay vì tạo mới mỗi hàng
+        self._heavy_loader = self._load_heavy_fields
+        # Nén definition/example/context_sentences khi ghi; hàng cũ vẫn đọc được
+        self._text_compression = text_compression
+        # Từ điển zlib mới nhất trong text_dictionaries, None = nén không từ điển
+        self._text_dictionary: Optional[bytes] = None
+        add_dictionary_source(self.db_path)
         self._init_database()
     
     def _get_db_path(self) -> str:
@@ -21,74 +108,253 @@ class VocabularyManager:
         os.makedirs(data_dir, exist_ok=True)
         return os.path.join(data_dir, 'vocabulary.db')
     
+    def _connection(self) -> sqlite3.Connection:
+        """Lấy kết nối lâu dài của thread hiện tại"""
+        return self.db.get_connection()
+    
+    def close(self):
+        """Đóng tất cả kết nối database"""
+        self.db.close_all()
+        remove_dictionary_source(self.db_path)
+        self._fuzzy_index = None
+        self._tag_index = None
+        if self.cache:
+            self.cache.invalidate()
+    
+    def _changed(self, kind: str, ids: Iterable[int], fields: Iterable[str] = ()):
+        """Gọi sau mỗi lần ghi thành công: làm mất hiệu lực bộ nhớ đệm và phát sự kiện"""
+        if self.cache:
+            self.cache.invalidate()
+        if self._fuzzy_index is not None and kind != REVIEWED:
+            self._sync_fuzzy_index(kind, ids, fields)
+        if self._tag_index is not None and kind != REVIEWED:
+            self._sync_tag_index(kind, ids, fields)
+        self.events.publish(kind, ids, fields)
+    
+    def _cached(self, name: str, loader, *key):
+        """Đọc qua bộ nhớ đệm, nạp lại khi database bị process khác thay đổi
+        
+        data_version chỉ đổi khi kết nối khác commit và chỉ có nghĩa với chính
+        kết nối đó, nên mỗi kết nối (mỗi thread) có mục đệm riêng;
+        ghi qua chính kết nối này đã gọi _changed().
+        """
+        if not self.cache:
+            return loader()
+        conn = self._connection()
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        return self.cache.get(name, (data_version,) + key, loader, scope=id(conn))
+    
     def _init_database(self):
-        """Khởi tạo database"""
+        """Khởi tạo database: áp dụng các migration còn thiếu"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            conn = self._connection()
+            migrate(conn)
+            self.fts_enabled = fts_available(conn)
+            self._text_dictionary = load_dictionaries(conn)
+            if self._text_compression:
+                set_fts_text_codec(conn, True)
+            # Từ trùng khóa được migration word_key đánh dấu thay vì gộp
+            unmerged = conn.execute('SELECT COUNT(*) FROM vocabulary WHERE word_key IS NULL').fetchone()[0]
+            if unmerged:
+                log_message(f"{unmerged} từ vựng trùng chưa được gộp, "
+                            f"chạy scripts/merge_duplicate_words.py --apply", "WARNING")
             
-            # Tạo bảng vocabulary với các trường mới
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS vocabulary (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL UNIQUE,
-                    definition TEXT NOT NULL,
-                    example TEXT,
-                    pronunciation TEXT,
-                    part_of_speech TEXT,
-                    context_sentences TEXT,
-                    synonyms TEXT,
-                    antonyms TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_reviewed TIMESTAMP,
-                    review_count INTEGER DEFAULT 0
-                )
-            ''')
+            log_message(f"Database đã sẵn sàng: {self.db_path}")
             
-            # Thêm các cột mới vào bảng hiện có nếu chưa tồn tại
-            try:
-                cursor.execute('ALTER TABLE vocabulary ADD COLUMN context_sentences TEXT')
-                log_message("Đã thêm cột context_sentences")
-            except sqlite3.OperationalError:
-                pass  # Cột đã tồn tại
+        except Exception as e:
+            log_message(f"Lỗi khởi tạo database: {e}", "ERROR")
+    
+    def set_deck(self, deck_id: int) -> bool:
+        """Chuyển sang bộ từ `deck_id`, False nếu bộ từ không tồn tại"""
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute('SELECT 1 FROM decks WHERE id = ?', (deck_id,))
+            if cursor.fetchone() is None:
+                log_message(f"Không tìm thấy bộ từ ID: {deck_id}", "WARNING")
+                return False
             
-            try:
-                cursor.execute('ALTER TABLE vocabulary ADD COLUMN synonyms TEXT')
-                log_message("Đã thêm cột synonyms")
-            except sqlite3.OperationalError:
-                pass  # Cột đã tồn tại
-                
-            try:
-                cursor.execute('ALTER TABLE vocabulary ADD COLUMN antonyms TEXT')
-                log_message("Đã thêm cột antonyms")
-            except sqlite3.OperationalError:
-                pass  # Cột đã tồn tại
+        except Exception as e:
+            log_message(f"Lỗi chuyển bộ từ: {e}", "ERROR")
+            return False
+        
+        if deck_id != self.deck_id:
+            self.deck_id = deck_id
+            # Chỉ mục gần đúng và chỉ mục nhãn chỉ chứa từ của một bộ từ: dựng lại khi cần
+            self._fuzzy_index = None
+            self._tag_index = None
+            if self.cache:
+                self.cache.invalidate()
+            self.events.publish(DECK_CHANGED, (deck_id,))
+            log_message(f"Đã chuyển sang bộ từ ID: {deck_id}")
+        return True
+    
+    def add_deck(self, name: str) -> Optional[int]:
+        """Tạo bộ từ mới, trả về id hoặc None nếu tên trống/đã tồn tại"""
+        name = name.strip()
+        if not name:
+            return None
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute('INSERT INTO decks (name) VALUES (?)', (name,))
+                deck_id = cursor.lastrowid
+            log_message(f"Đã tạo bộ từ: {name}")
+            return deck_id
             
-            conn.commit()
-            conn.close()
-            log_message(f"Database đã sẵn sàng: {self.db_path}")
+        except sqlite3.IntegrityError:
+            log_message(f"Bộ từ '{name}' đã tồn tại", "WARNING")
+            return None
+        except Exception as e:
+            log_message(f"Lỗi tạo bộ từ: {e}", "ERROR")
+            return None
+    
+    def rename_deck(self, deck_id: int, name: str) -> bool:
+        """Đổi tên bộ từ"""
+        name = name.strip()
+        if not name:
+            return False
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute('UPDATE decks SET name = ? WHERE id = ?', (name, deck_id))
+            return cursor.rowcount > 0
             
+        except sqlite3.IntegrityError:
+            log_message(f"Bộ từ '{name}' đã tồn tại", "WARNING")
+            return False
         except Exception as e:
-            log_message(f"Lỗi khởi tạo database: {e}", "ERROR")
+            log_message(f"Lỗi đổi tên bộ từ: {e}", "ERROR")
+            return False
+    
+    def delete_deck(self, deck_id: int) -> bool:
+        """Xóa một bộ từ rỗng (không xóa được bộ từ mặc định hay bộ từ đang dùng)"""
+        if deck_id in (DEFAULT_DECK_ID, self.deck_id):
+            return False
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                # Tra chỉ mục (deck_id, ...) thay vì đếm
+                cursor.execute('SELECT 1 FROM vocabulary WHERE deck_id = ? LIMIT 1', (deck_id,))
+                if cursor.fetchone() is not None:
+                    log_message(f"Bộ từ ID {deck_id} còn từ vựng, không thể xóa", "WARNING")
+                    return False
+                cursor.execute('DELETE FROM deck_stats WHERE deck_id = ?', (deck_id,))
+                # id bộ từ có thể được dùng lại; review_log chỉ ghi thêm nên được giữ nguyên
+                cursor.execute('DELETE FROM review_daily WHERE deck_id = ?', (deck_id,))
+                cursor.execute('DELETE FROM decks WHERE id = ?', (deck_id,))
+                deleted = cursor.rowcount > 0
+            return deleted
+            
+        except Exception as e:
+            log_message(f"Lỗi xóa bộ từ: {e}", "ERROR")
+            return False
+    
+    def get_deck_id(self, name: str) -> Optional[int]:
+        """Id của bộ từ theo tên (không phân biệt hoa/thường)"""
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute('SELECT id FROM decks WHERE name = ?', (name.strip(),))
+            row = cursor.fetchone()
+            return row[0] if row else None
+            
+        except Exception as e:
+            log_message(f"Lỗi tìm bộ từ '{name}': {e}", "ERROR")
+            return None
+    
+    def get_deck_stats(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Mọi bộ từ kèm số từ, số từ đã ôn và số từ đến hạn, theo tên
+        
+        Tổng số đọc từ bộ đếm deck_stats; số từ đến hạn của tất cả bộ từ
+        được đếm bằng một GROUP BY trên chỉ mục (deck_id, due_at).
+        """
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute('''
+                SELECT d.id, d.name, COALESCE(s.total_words, 0), COALESCE(s.reviewed_words, 0),
+                       COALESCE(due.due_words, 0)
+                FROM decks d
+                LEFT JOIN deck_stats s ON s.deck_id = d.id
+                LEFT JOIN (
+                    SELECT deck_id, COUNT(*) AS due_words
+                    FROM vocabulary
+                    WHERE due_at <= ?
+                    GROUP BY deck_id
+                ) due ON due.deck_id = d.id
+                ORDER BY d.id != ?, d.name
+            ''', (format_timestamp(now or utc_now()), DEFAULT_DECK_ID))
+            return [{'id': deck_id, 'name': name, 'total_words': total,
+                     'reviewed_words': reviewed, 'due_words': due}
+                    for deck_id, name, total, reviewed, due in cursor.fetchall()]
+            
+        except Exception as e:
+            log_message(f"Lỗi lấy danh sách bộ từ: {e}", "ERROR")
+            return []
+    
+    def move_to_deck(self, ids: Iterable[int], deck_id: int) -> int:
+        """Chuyển các từ sang bộ từ `deck_id`, trả về số từ đã chuyển"""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return 0
+        try:
+            conn = self._connection()
+            current = self.deck_id
+            moved = []
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1 FROM decks WHERE id = ?', (deck_id,))
+                if cursor.fetchone() is None:
+                    log_message(f"Không tìm thấy bộ từ ID: {deck_id}", "WARNING")
+                    return 0
+                for start in range(0, len(ids), self.MAX_QUERY_PARAMS):
+                    chunk = ids[start:start + self.MAX_QUERY_PARAMS]
+                    placeholders = ', '.join('?' * len(chunk))
+                    cursor.execute(f'''
+                        SELECT id, deck_id FROM vocabulary
+                        WHERE id IN ({placeholders}) AND deck_id != ?
+                    ''', chunk + [deck_id])
+                    moved += cursor.fetchall()
+                    cursor.execute(f'''
+                        UPDATE vocabulary SET deck_id = ?
+                        WHERE id IN ({placeholders})
+                    ''', [deck_id] + chunk)
+            
+            # Với view của bộ từ hiện tại, từ chuyển đi là bị xóa, từ chuyển đến là được thêm
+            if deck_id == current:
+                self._changed(ADDED, [vocab_id for vocab_id, _ in moved])
+            else:
+                self._changed(DELETED, [vocab_id for vocab_id, old in moved if old == current])
+            log_message(f"Đã chuyển {len(moved)} từ vựng sang bộ từ ID: {deck_id}")
+            return len(moved)
+            
+        except Exception as e:
+            log_message(f"Lỗi chuyển bộ từ: {e}", "ERROR")
+            return 0
     
     def add_vocabulary(self, word: str, definition: str, example: str = "", 
                       pronunciation: str = "", part_of_speech: str = "",
                       context_sentences: str = "", synonyms: str = "", antonyms: str = "") -> bool:
         """Thêm từ vựng mới với tất cả các trường"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO vocabulary (word, definition, example, pronunciation, part_of_speech, 
-                                      context_sentences, synonyms, antonyms)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (word.strip(), definition.strip(), example.strip(), 
-                  pronunciation.strip(), part_of_speech.strip(),
-                  context_sentences.strip(), synonyms.strip(), antonyms.strip()))
-            
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT INTO vocabulary (word, definition, example, pronunciation, part_of_speech, 
+                                          context_sentences, synonyms, antonyms, word_key, deck_id,
+                                          due_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (word.strip(), self._encode(definition.strip()), self._encode(example.strip()),
+                      pronunciation.strip(), part_of_speech.strip(),
+                      self._encode(context_sentences.strip()), synonyms.strip(), antonyms.strip(),
+                      normalize_word(word), self.deck_id))
+                vocab_id = cursor.lastrowid
+                self._sync_relations(cursor, 'id', (vocab_id,))
+            
+            self._changed(ADDED, (vocab_id,))
             log_message(f"Đã thêm từ vựng: {word}")
             return True
             
@@ -99,27 +365,141 @@ class VocabularyManager:
             log_message(f"Lỗi thêm từ vựng: {e}", "ERROR")
             return False
     
+    def add_vocabulary_many(self, records: Iterable[Dict],
+                            on_conflict: str = 'skip') -> List[ImportOutcome]:
+        """Thêm/cập nhật nhiều từ vựng bằng executemany trong một transaction
+        
+        `on_conflict` quyết định cách xử lý từ đã tồn tại:
+        - 'skip': giữ nguyên bản ghi cũ
+        - 'update': ghi đè bằng giá trị mới (trường trống trong dữ liệu nhập giữ giá trị cũ)
+        - 'fill_missing': chỉ điền các trường đang trống của bản ghi cũ
+        
+        Từ mới được thêm vào bộ từ hiện tại; từ đã có ở bộ từ khác được xử lý
+        tại chỗ (không chuyển bộ từ). Trả về ImportOutcome cho từng hàng theo thứ tự đầu vào.
+        """
+        if on_conflict not in self.CONFLICT_MODES:
+            raise ValueError(f"on_conflict không hợp lệ: {on_conflict}")
+        
+        rows = []
+        for record in records:
+            row = tuple(str(record.get(field) or '').strip() for field in self.WRITABLE_FIELDS)
+            rows.append(row + (normalize_word(row[0]),))
+        if not rows:
+            return []
+        
+        deck_id = self.deck_id
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                
+                # Trùng theo khóa chuẩn hóa: "Run" và "run" là cùng một từ
+                existing = self._existing_words(cursor, {row[-1] for row in rows if row[-1]})
+                outcomes = []
+                params = []
+                conflict_status = 'skipped' if on_conflict == 'skip' else 'updated'
+                for index, row in enumerate(rows):
+                    word, definition, key = row[0], row[1], row[-1]
+                    if key and key in existing:
+                        status = conflict_status
+                    elif not key or not definition:
+                        status = 'invalid'
+                    else:
+                        status = 'inserted'
+                        existing.add(key)
+                    outcomes.append(ImportOutcome(index, word, status))
+                    if status != 'invalid':
+                        params.append(self._encode_row(row) + (deck_id,))
+                
+                cursor.executemany(self._upsert_sql(on_conflict), params)
+                # Chỉ hàng có đồng nghĩa/trái nghĩa trong dữ liệu nhập mới làm đổi quan hệ
+                self._sync_relations(cursor, 'word_key', {
+                    rows[outcome.index][-1] for outcome in outcomes
+                    if outcome.status in ('inserted', 'updated')
+                    and any(rows[outcome.index][i] for i in self._RELATION_FIELD_INDEXES)
+                })
+                
+                # Chỉ tra id khi có view cần biết hàng nào thay đổi
+                if (self.events.has_subscribers or self._fuzzy_index is not None
+                        or self._tag_index is not None):
+                    # Theo khóa; hàng đầu tiên quyết định (thêm rồi sửa trong cùng lô vẫn là 'inserted')
+                    changed = {}
+                    for outcome in outcomes:
+                        if outcome.status in ('inserted', 'updated'):
+                            changed.setdefault(rows[outcome.index][-1], outcome.status)
+                    word_ids = self._word_ids(cursor, changed)
+                else:
+                    changed, word_ids = {}, {}
+            
+            for status, kind in (('inserted', ADDED), ('updated', UPDATED)):
+                ids = [word_ids[key] for key, key_status in changed.items()
+                       if key_status == status and key in word_ids]
+                self._changed(kind, ids, self.WRITABLE_FIELDS[1:] if kind == UPDATED else ())
+            counts = {}
+            for outcome in outcomes:
+                counts[outcome.status] = counts.get(outcome.status, 0) + 1
+            log_message(f"Đã nhập {len(rows)} từ vựng: {counts}")
+            return outcomes
+            
+        except Exception as e:
+            log_message(f"Lỗi nhập nhiều từ vựng: {e}", "ERROR")
+            return [ImportOutcome(index, row[0], 'error') for index, row in enumerate(rows)]
+    
+    def _existing_words(self, cursor: sqlite3.Cursor, keys: Iterable[str]) -> set:
+        """Tìm các khóa từ (word_key) đã có trong database"""
+        return set(self._word_ids(cursor, keys))
+    
+    def _word_ids(self, cursor: sqlite3.Cursor, keys: Iterable[str]) -> Dict[str, int]:
+        """Tra id theo khóa từ (word_key) bằng truy vấn IN (...) theo lô"""
+        keys = list(keys)
+        word_ids = {}
+        for start in range(0, len(keys), self.MAX_QUERY_PARAMS):
+            chunk = keys[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'SELECT word_key, id FROM vocabulary WHERE word_key IN ({placeholders})', chunk)
+            word_ids.update(cursor.fetchall())
+        return word_ids
+    
+    def _upsert_sql(self, on_conflict: str) -> str:
+        """Câu lệnh INSERT ... ON CONFLICT(word_key) tương ứng với chế độ xử lý trùng"""
+        columns = ', '.join(self.WRITABLE_FIELDS)
+        placeholders = ', '.join('?' * len(self.WRITABLE_FIELDS))
+        fields = self.WRITABLE_FIELDS[1:]
+        
+        if on_conflict == 'skip':
+            action = 'DO NOTHING'
+        elif on_conflict == 'update':
+            assignments = ', '.join(
+                f"{field} = COALESCE(NULLIF(excluded.{field}, ''), vocabulary.{field})"
+                for field in fields
+            )
+            action = f'DO UPDATE SET {assignments}'
+        else:
+            assignments = ', '.join(
+                f"{field} = COALESCE(NULLIF(vocabulary.{field}, ''), excluded.{field})"
+                for field in fields
+            )
+            action = f'DO UPDATE SET {assignments}'
+        
+        return f'''
+            INSERT INTO vocabulary ({columns}, word_key, deck_id, due_at)
+            VALUES ({placeholders}, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(word_key) {action}
+        '''
+    
     def update_vocabulary(self, vocab_id: int, word: str, definition: str, 
                          example: str = "", pronunciation: str = "", 
                          part_of_speech: str = "", context_sentences: str = "",
                          synonyms: str = "", antonyms: str = "") -> bool:
         """Cập nhật từ vựng với tất cả các trường"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE vocabulary 
-                SET word = ?, definition = ?, example = ?, 
-                    pronunciation = ?, part_of_speech = ?, context_sentences = ?,
-                    synonyms = ?, antonyms = ?
-                WHERE id = ?
-            ''', (word.strip(), definition.strip(), example.strip(),
-                  pronunciation.strip(), part_of_speech.strip(), context_sentences.strip(),
-                  synonyms.strip(), antonyms.strip(), vocab_id))
+            conn = self._connection()
+            with conn:
+                updated = self._update_row(conn.cursor(), vocab_id, word, definition, example,
+                                           pronunciation, part_of_speech, context_sentences,
+                                           synonyms, antonyms)
             
-            conn.commit()
-            conn.close()
+            self._changed(UPDATED, (vocab_id,) if updated else (), self.WRITABLE_FIELDS)
             log_message(f"Đã cập nhật từ vựng: {word}")
             return True
             
@@ -127,16 +507,160 @@ class VocabularyManager:
             log_message(f"Lỗi cập nhật từ vựng: {e}", "ERROR")
             return False
     
+    def _update_row(self, cursor: sqlite3.Cursor, vocab_id: int, word: str, definition: str,
+                    example: str = "", pronunciation: str = "", part_of_speech: str = "",
+                    context_sentences: str = "", synonyms: str = "", antonyms: str = "") -> bool:
+        """UPDATE một hàng trong transaction hiện tại, True nếu hàng tồn tại"""
+        cursor.execute('''
+            UPDATE vocabulary 
+            SET word = ?, word_key = ?, definition = ?, example = ?, 
+                pronunciation = ?, part_of_speech = ?, context_sentences = ?,
+                synonyms = ?, antonyms = ?
+            WHERE id = ?
+        ''', (word.strip(), normalize_word(word), self._encode(definition.strip()),
+              self._encode(example.strip()), pronunciation.strip(), part_of_speech.strip(),
+              self._encode(context_sentences.strip()), synonyms.strip(), antonyms.strip(),
+              vocab_id))
+        if cursor.rowcount == 0:
+            return False
+        self._sync_relations(cursor, 'id', (vocab_id,))
+        return True
+    
+    def _sync_relations(self, cursor: sqlite3.Cursor, column: str, values: Iterable):
+        """Tách lại quan hệ đồng nghĩa/trái nghĩa của các hàng có `column` trong `values`"""
+        values = list(values)
+        for start in range(0, len(values), self.MAX_QUERY_PARAMS):
+            chunk = values[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT id, word_key, synonyms, antonyms FROM vocabulary
+                WHERE {column} IN ({placeholders})
+            ''', chunk)
+            rewrite_relations(cursor, cursor.fetchall())
+    
+    @property
+    def text_compression(self) -> bool:
+        """True nếu các cột văn bản dài được nén khi ghi"""
+        return self._text_compression
+    
+    @text_compression.setter
+    def text_compression(self, enabled: bool):
+        """Bật nén cần trigger FTS đọc qua vocab_text() trước khi ghi hàng nén đầu tiên"""
+        if enabled and not self._text_compression:
+            try:
+                set_fts_text_codec(self._connection(), True)
+            except Exception as e:
+                log_message(f"Lỗi bật nén văn bản: {e}", "ERROR")
+                return
+        self._text_compression = enabled
+    
+    def _encode(self, text: str):
+        """Giá trị lưu cho một cột nén được: BLOB nén nếu đang bật nén, ngược lại TEXT"""
+        if not self.text_compression or not text:
+            return text
+        return encode_text(text, self._text_dictionary)
+    
+    def _encode_row(self, row: tuple) -> tuple:
+        """Nén các cột văn bản dài của một hàng theo WRITABLE_FIELDS (+ word_key)"""
+        if not self.text_compression:
+            return row
+        row = list(row)
+        for index in self._COMPRESSED_FIELD_INDEXES:
+            row[index] = self._encode(row[index])
+        return tuple(row)
+    
+    def train_text_dictionary(self, sample_size: int = 2000) -> bool:
+        """Huấn luyện từ điển nén từ các hàng ngẫu nhiên và dùng nó cho các lần ghi sau
+        
+        Từ điển cũ được giữ lại vì các hàng đã nén bằng nó vẫn cần để giải nén.
+        """
+        try:
+            conn = self._connection()
+            rows = conn.execute(f'''
+                SELECT {', '.join(COMPRESSED_FIELDS)} FROM vocabulary
+                ORDER BY RANDOM() LIMIT ?
+            ''', (sample_size,)).fetchall()
+            dictionary = train_dictionary(decode_text(value) for row in rows
+                                          for value in row if value)
+            if not dictionary:
+                log_message("Chưa đủ dữ liệu để huấn luyện từ điển nén", "WARNING")
+                return False
+            
+            checksum = register_dictionary(dictionary)
+            with conn:
+                conn.execute('INSERT OR IGNORE INTO text_dictionaries (checksum, data) VALUES (?, ?)',
+                             (checksum, dictionary))
+            self._text_dictionary = dictionary
+            log_message(f"Đã huấn luyện từ điển nén {len(dictionary):,} byte từ {len(rows):,} từ vựng")
+            return True
+            
+        except Exception as e:
+            log_message(f"Lỗi huấn luyện từ điển nén: {e}", "ERROR")
+            return False
+    
+    def rewrite_text_storage(self, compress: bool = True, batch_size: int = 500,
+                             progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """Nén (hoặc giải nén) lại các cột văn bản dài của mọi từ đã có, trả về số hàng đã ghi
+        
+        Không đổi `text_compression` (quyết định cách ghi các hàng sau này).
+        Mỗi lô một transaction để không giữ khóa ghi lâu, sau mỗi lô phát UPDATED
+        cho các hàng đã ghi; nội dung không đổi nên trigger FTS bỏ qua việc đánh
+        chỉ mục lại. Giải nén hết khi không bật nén thì trả trigger FTS về đọc
+        thẳng cột. `progress` được gọi sau mỗi lô với (số hàng đã xét, tổng số hàng).
+        """
+        dictionary = self._text_dictionary
+        try:
+            conn = self._connection()
+            if compress:
+                set_fts_text_codec(conn, True)
+            total = conn.execute('SELECT COUNT(*) FROM vocabulary').fetchone()[0]
+            columns = ', '.join(COMPRESSED_FIELDS)
+            assignments = ', '.join(f'{field} = ?' for field in COMPRESSED_FIELDS)
+            last_id, done, written = 0, 0, 0
+            while True:
+                rows = conn.execute(f'''
+                    SELECT id, {columns} FROM vocabulary WHERE id > ? ORDER BY id LIMIT ?
+                ''', (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                
+                updates = []
+                for row in rows:
+                    values = tuple(decode_text(value) for value in row[1:])
+                    if compress:
+                        values = tuple(encode_text(value, dictionary) if value else value
+                                       for value in values)
+                    if values != row[1:]:
+                        updates.append(values + (row[0],))
+                if updates:
+                    with conn:
+                        conn.executemany(f'UPDATE vocabulary SET {assignments} WHERE id = ?', updates)
+                    self._changed(UPDATED, [update[-1] for update in updates], COMPRESSED_FIELDS)
+                
+                last_id = rows[-1][0]
+                done += len(rows)
+                written += len(updates)
+                if progress:
+                    progress(done, total)
+            
+            if not compress and not self._text_compression:
+                set_fts_text_codec(conn, False)
+            
+            log_message(f"Đã {'nén' if compress else 'giải nén'} lại {written:,}/{done:,} từ vựng")
+            return written
+            
+        except Exception as e:
+            log_message(f"Lỗi ghi lại văn bản nén: {e}", "ERROR")
+            return 0
+    
     def delete_vocabulary(self, vocab_id: int) -> bool:
         """Xóa từ vựng"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM vocabulary WHERE id = ?', (vocab_id,))
+            conn = self._connection()
+            with conn:
+                deleted = self._delete_row(conn.cursor(), vocab_id)
             
-            conn.commit()
-            conn.close()
+            self._changed(DELETED, (vocab_id,) if deleted else ())
             log_message(f"Đã xóa từ vựng ID: {vocab_id}")
             return True
             
@@ -144,145 +668,798 @@ class VocabularyManager:
             log_message(f"Lỗi xóa từ vựng: {e}", "ERROR")
             return False
     
-    def get_all_vocabulary(self) -> List[Dict]:
+    def _delete_row(self, cursor: sqlite3.Cursor, vocab_id: int) -> bool:
+        """DELETE một hàng trong transaction hiện tại, True nếu hàng tồn tại"""
+        cursor.execute('DELETE FROM vocabulary WHERE id = ?', (vocab_id,))
+        return cursor.rowcount > 0
+    
+    def apply_writes(self, operations: Iterable[Tuple[str, tuple]],
+                     synchronous: Optional[str] = None) -> List[bool]:
+        """Áp dụng nhiều thao tác ghi trong một transaction (một lần commit)
+        
+        Mỗi thao tác là (tên, tham số) với tên trong WRITE_OPERATIONS, tham số
+        giống phương thức cùng tên. `synchronous` (OFF/NORMAL/FULL) đặt mức bền
+        vững cho riêng lần commit này. Trả về kết quả từng thao tác theo thứ tự.
+        """
+        operations = list(operations)
+        for name, _ in operations:
+            if name not in self.WRITE_OPERATIONS:
+                raise ValueError(f"Thao tác ghi không hợp lệ: {name}")
+        if not operations:
+            return []
+        
+        try:
+            conn = self._connection()
+            if synchronous:
+                conn.execute(f'PRAGMA synchronous={synchronous}')
+            try:
+                results, changes = self._apply_operations(conn, operations)
+            finally:
+                if synchronous and synchronous != ConnectionManager.SYNCHRONOUS:
+                    conn.execute(f'PRAGMA synchronous={ConnectionManager.SYNCHRONOUS}')
+            
+            for kind, ids in changes.items():
+                self._changed(kind, ids, self.WRITABLE_FIELDS if kind == UPDATED else ())
+            log_message(f"Đã ghi {len(operations)} thao tác trong một transaction")
+            return results
+            
+        except Exception as e:
+            log_message(f"Lỗi ghi theo lô: {e}", "ERROR")
+            return [False] * len(operations)
+    
+    def _apply_operations(self, conn: sqlite3.Connection, operations: List[Tuple[str, tuple]]):
+        """Chạy các thao tác trong một transaction, trả về (kết quả, id thay đổi theo loại)"""
+        results = []
+        changes: Dict[str, List[int]] = {}
+        now = utc_now()
+        with conn:
+            cursor = conn.cursor()
+            for name, args in operations:
+                if name == 'delete_vocabulary':
+                    ok = self._delete_row(cursor, *args)
+                    kind = DELETED
+                elif name == 'update_vocabulary':
+                    ok = self._update_row(cursor, *args)
+                    kind = UPDATED
+                else:
+                    if name == 'mark_as_reviewed':
+                        args = (args[0], DEFAULT_QUALITY) + tuple(args[1:])
+                    vocab_id, quality, *latency = args
+                    ok = self._grade_row(cursor, vocab_id, quality, now, *latency) is not None
+                    kind = REVIEWED
+                results.append(ok)
+                if ok:
+                    changes.setdefault(kind, []).append(args[0])
+        return results, changes
+    
+    def get_all_vocabulary(self) -> List[VocabularyRecord]:
         """Lấy tất cả từ vựng"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            deck_id = self.deck_id
+            if self.cache:
+                return list(self._cached('all', lambda: self._load_all_records(deck_id), deck_id))
+            
+            conn = self._connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT id, word, definition, example, pronunciation, 
-                       part_of_speech, context_sentences, synonyms, antonyms,
-                       created_at, last_reviewed, review_count
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
                 FROM vocabulary 
-                ORDER BY created_at DESC
-            ''')
-            
-            rows = cursor.fetchall()
-            conn.close()
-            
-            vocabularies = []
-            for row in rows:
-                vocabularies.append({
-                    'id': row[0],
-                    'word': row[1],
-                    'definition': row[2],
-                    'example': row[3],
-                    'pronunciation': row[4],
-                    'part_of_speech': row[5],
-                    'context_sentences': row[6],
-                    'synonyms': row[7],
-                    'antonyms': row[8],
-                    'created_at': row[9],
-                    'last_reviewed': row[10],
-                    'review_count': row[11]
-                })
+                WHERE deck_id = ?
+                ORDER BY created_at DESC, id DESC
+            ''', (deck_id,))
             
-            return vocabularies
+            return [self._make_record(row) for row in cursor.fetchall()]
             
         except Exception as e:
             log_message(f"Lỗi lấy danh sách từ vựng: {e}", "ERROR")
             return []
     
-    def search_vocabulary(self, search_term: str) -> List[Dict]:
-        """Tìm kiếm từ vựng"""
+    def _make_record(self, row: tuple, full: bool = False) -> VocabularyRecord:
+        """Tạo VocabularyRecord từ một hàng
+        
+        `full=True` cho hàng theo FULL_COLUMNS; ngược lại hàng theo LIST_COLUMNS
+        và các cột nặng được nạp lười qua _load_heavy_fields.
+        """
+        return VocabularyRecord.from_row(row, None if full else self._heavy_loader)
+    
+    def _load_heavy_fields(self, vocab_id: int) -> Optional[Tuple[str, str]]:
+        """Đọc các cột văn bản dài của một từ vựng khi bản ghi cần đến"""
+        cursor = self._connection().cursor()
+        cursor.execute(f'''
+            SELECT {', '.join(VocabularyRecord.HEAVY_FIELDS)}
+            FROM vocabulary 
+            WHERE id = ?
+        ''', (vocab_id,))
+        return cursor.fetchone()
+    
+    def _load_all_records(self, deck_id: int) -> Tuple[VocabularyRecord, ...]:
+        """Đọc toàn bộ bộ từ cho bộ nhớ đệm (lỗi được ném ra để không bị lưu lại)"""
+        cursor = self._connection().cursor()
+        cursor.execute(f'''
+            SELECT {self.LIST_COLUMNS}
+            FROM vocabulary 
+            WHERE deck_id = ?
+            ORDER BY created_at DESC, id DESC
+        ''', (deck_id,))
+        return tuple(self._make_record(row) for row in cursor.fetchall())
+    
+    def iter_vocabulary(self, batch_size: int = 500) -> Iterator[VocabularyRecord]:
+        """Duyệt tất cả từ vựng (mới nhất trước)
+        
+        Có bộ nhớ đệm: duyệt bản trong bộ nhớ, chỉ đọc lại khi dữ liệu thay đổi.
+        Không có: đọc theo từng lô fetchmany, không nạp toàn bộ bảng vào bộ nhớ.
+        """
+        deck_id = self.deck_id
+        if not self.cache:
+            return self._iter_from_database(deck_id, batch_size)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            search_pattern = f"%{search_term.strip()}%"
-            cursor.execute('''
-                SELECT id, word, definition, example, pronunciation, 
-                       part_of_speech, context_sentences, synonyms, antonyms,
-                       created_at, last_reviewed, review_count
+            return iter(self._cached('all', lambda: self._load_all_records(deck_id), deck_id))
+        except Exception as e:
+            log_message(f"Lỗi duyệt danh sách từ vựng: {e}", "ERROR")
+            return iter(())
+    
+    def _iter_from_database(self, deck_id: int, batch_size: int) -> Iterator[VocabularyRecord]:
+        """Duyệt từ vựng theo từng lô fetchmany, hàng đầu tiên có ngay sau lô đầu"""
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
                 FROM vocabulary 
-                WHERE word LIKE ? OR definition LIKE ? OR example LIKE ? 
-                   OR context_sentences LIKE ? OR synonyms LIKE ? OR antonyms LIKE ?
-                ORDER BY created_at DESC
-            ''', (search_pattern, search_pattern, search_pattern, 
-                  search_pattern, search_pattern, search_pattern))
+                WHERE deck_id = ?
+                ORDER BY created_at DESC, id DESC
+            ''', (deck_id,))
             
-            rows = cursor.fetchall()
-            conn.close()
-            
-            vocabularies = []
-            for row in rows:
-                vocabularies.append({
-                    'id': row[0],
-                    'word': row[1],
-                    'definition': row[2],
-                    'example': row[3],
-                    'pronunciation': row[4],
-                    'part_of_speech': row[5],
-                    'context_sentences': row[6],
-                    'synonyms': row[7],
-                    'antonyms': row[8],
-                    'created_at': row[9],
-                    'last_reviewed': row[10],
-                    'review_count': row[11]
-                })
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._make_record(row)
+            
+        except Exception as e:
+            log_message(f"Lỗi duyệt danh sách từ vựng: {e}", "ERROR")
+    
+    def iter_export_batches(self, fields: Sequence[str] = VocabularyRecord.FIELDS,
+                            batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Duyệt các cột `fields` của mọi từ trong bộ từ hiện tại theo id, mỗi lần một lô fetchmany
+        
+        Trả về tuple thô (không tạo VocabularyRecord) để xuất file với bộ nhớ
+        không phụ thuộc số từ. Lỗi database được ném ra để bên xuất không ghi
+        thiếu mà không biết.
+        """
+        unknown = [field for field in fields if field not in VocabularyRecord.FIELDS]
+        if unknown:
+            raise ValueError(f"Cột không hợp lệ: {unknown}")
+        
+        columns = ', '.join(f'vocab_text({field})' if field in COMPRESSED_FIELDS else field
+                            for field in fields)
+        cursor = self._connection().cursor()
+        cursor.execute(f'SELECT {columns} FROM vocabulary WHERE deck_id = ? ORDER BY id',
+                       (self.deck_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+    
+    def get_vocabulary_page(self, after: Optional[Tuple[str, int]] = None,
+                            limit: int = 100, order: str = 'desc') -> List[VocabularyRecord]:
+        """Lấy một trang từ vựng bằng phân trang keyset trên (created_at, id)
+        
+        `after` là (created_at, id) của hàng cuối trang trước, None cho trang đầu.
+        `order` là 'desc' (mới nhất trước) hoặc 'asc'.
+        """
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"order không hợp lệ: {order}")
+        
+        try:
+            cursor = self._connection().cursor()
+            
+            direction = 'DESC' if order == 'desc' else 'ASC'
+            where = 'WHERE deck_id = ?'
+            params: tuple = (self.deck_id, limit)
+            if after is not None:
+                where += f" AND (created_at, id) {'<' if order == 'desc' else '>'} (?, ?)"
+                params = (self.deck_id, after[0], after[1], limit)
+            
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
+                FROM vocabulary 
+                {where}
+                ORDER BY created_at {direction}, id {direction}
+                LIMIT ?
+            ''', params)
             
-            return vocabularies
+            return [self._make_record(row) for row in cursor.fetchall()]
             
         except Exception as e:
-            log_message(f"Lỗi tìm kiếm từ vựng: {e}", "ERROR")
+            log_message(f"Lỗi lấy trang từ vựng: {e}", "ERROR")
             return []
     
-    def mark_as_reviewed(self, vocab_id: int) -> bool:
-        """Đánh dấu từ vựng đã được ôn tập"""
+    def get_vocabulary_by_id(self, vocab_id: int) -> Optional[VocabularyRecord]:
+        """Lấy một từ vựng theo id (tra khóa chính)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE vocabulary 
-                SET last_reviewed = CURRENT_TIMESTAMP, 
-                    review_count = review_count + 1
+            cursor = self._connection().cursor()
+            cursor.execute(f'''
+                SELECT {self.FULL_COLUMNS}
+                FROM vocabulary 
                 WHERE id = ?
             ''', (vocab_id,))
             
-            conn.commit()
-            conn.close()
-            log_message(f"Đã đánh dấu ôn tập từ vựng ID: {vocab_id}")
-            return True
+            row = cursor.fetchone()
+            return self._make_record(row, full=True) if row else None
             
         except Exception as e:
-            log_message(f"Lỗi đánh dấu ôn tập: {e}", "ERROR")
-            return False
+            log_message(f"Lỗi lấy từ vựng ID {vocab_id}: {e}", "ERROR")
+            return None
     
-    def get_vocabulary_stats(self) -> Dict:
-        """Lấy thống kê từ vựng"""
+    def get_by_word(self, word: str) -> Optional[VocabularyRecord]:
+        """Lấy một từ vựng theo từ, không phân biệt hoa/thường (tra chỉ mục UNIQUE của word_key)"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            cursor = self._connection().cursor()
+            cursor.execute(f'''
+                SELECT {self.FULL_COLUMNS}
+                FROM vocabulary 
+                WHERE word_key = ?
+            ''', (normalize_word(word),))
+            
+            row = cursor.fetchone()
+            return self._make_record(row, full=True) if row else None
+            
+        except Exception as e:
+            log_message(f"Lỗi lấy từ vựng '{word}': {e}", "ERROR")
+            return None
+    
+    def get_word_keys(self) -> List[Tuple[int, str, Optional[str]]]:
+        """Tất cả (id, từ, word_key) của bộ từ hiện tại theo thứ tự word_key, để dựng PrefixIndex"""
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute('SELECT id, word, word_key FROM vocabulary WHERE deck_id = ? ORDER BY word_key',
+                           (self.deck_id,))
+            return cursor.fetchall()
+            
+        except Exception as e:
+            log_message(f"Lỗi lấy danh sách từ: {e}", "ERROR")
+            return []
+    
+    def get_many(self, ids: Iterable[int]) -> List[VocabularyRecord]:
+        """Lấy nhiều từ vựng theo id bằng truy vấn IN (...), giữ thứ tự của `ids`
+        
+        Id không tồn tại bị bỏ qua. Danh sách rất dài được chia lô theo
+        MAX_QUERY_PARAMS.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        
+        try:
+            cursor = self._connection().cursor()
+            found = {}
+            for start in range(0, len(ids), self.MAX_QUERY_PARAMS):
+                chunk = ids[start:start + self.MAX_QUERY_PARAMS]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f'''
+                    SELECT {self.FULL_COLUMNS}
+                    FROM vocabulary 
+                    WHERE id IN ({placeholders})
+                ''', chunk)
+                for row in cursor.fetchall():
+                    found[row[0]] = self._make_record(row, full=True)
+            
+            return [found[vocab_id] for vocab_id in ids if vocab_id in found]
+            
+        except Exception as e:
+            log_message(f"Lỗi lấy danh sách từ vựng theo ID: {e}", "ERROR")
+            return []
+    
+    def search_vocabulary(self, search_term: str, fuzzy: bool = False) -> List[VocabularyRecord]:
+        """Tìm kiếm từ vựng
+        
+        Dùng chỉ mục FTS5 (xếp hạng bm25) khi có thể, ngược lại quét bằng LIKE.
+        Kết thúc bằng '*' để tìm các từ bắt đầu bằng chuỗi đã nhập, bắt đầu bằng
+        '~' để tìm gần đúng. Với `fuzzy`, tìm gần đúng khi không có kết quả chính xác.
+        Chuỗi có điều kiện `tag:` được lọc theo nhãn (xem filter_by_tags).
+        """
+        term = search_term.strip()
+        if term.startswith('~'):
+            return self.search_vocabulary_fuzzy(term[1:])
+        if is_tag_query(term):
+            return self.filter_by_tags(term)
+        
+        results = self._search_exact(term)
+        if fuzzy and not results and term:
+            return self.search_vocabulary_fuzzy(term.rstrip('*'))
+        return results
+    
+    def _search_exact(self, term: str) -> List[VocabularyRecord]:
+        """Tìm chuỗi con chính xác (FTS5 hoặc LIKE)"""
+        try:
+            conn = self._connection()
             cursor = conn.cursor()
             
-            # Tổng số từ
-            cursor.execute('SELECT COUNT(*) FROM vocabulary')
-            total_words = cursor.fetchone()[0]
+            prefix = term.endswith('*')
+            if prefix:
+                term = term.rstrip('*').strip()
+            
+            if self.fts_enabled and len(term) >= self.FTS_MIN_TERM_LENGTH:
+                self._execute_fts_search(cursor, term, prefix, self.deck_id)
+            else:
+                self._execute_like_search(cursor, term, prefix, self.deck_id)
             
-            # Số từ đã ôn tập
-            cursor.execute('SELECT COUNT(*) FROM vocabulary WHERE last_reviewed IS NOT NULL')
-            reviewed_words = cursor.fetchone()[0]
+            return [self._make_record(row) for row in cursor.fetchall()]
             
-            # Số từ chưa ôn tập
-            unreviewed_words = total_words - reviewed_words
+        except Exception as e:
+            log_message(f"Lỗi tìm kiếm từ vựng: {e}", "ERROR")
+            return []
+    
+    def search_vocabulary_fuzzy(self, search_term: str,
+                                limit: int = FuzzyIndex.DEFAULT_LIMIT) -> List[VocabularyRecord]:
+        """Tìm từ gần đúng (chấp nhận lỗi gõ), từ gần nhất trước"""
+        try:
+            matches = self._get_fuzzy_index().search(search_term, limit)
+            return self.get_many([vocab_id for vocab_id, _ in matches])
             
-            # Số từ thêm hôm nay
+        except Exception as e:
+            log_message(f"Lỗi tìm kiếm gần đúng: {e}", "ERROR")
+            return []
+    
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        """Chỉ mục trigram, dựng từ database ở lần gọi đầu"""
+        with self._fuzzy_lock:
+            fuzzy_index = self._fuzzy_index
+            if fuzzy_index is None:
+                deck_id = self.deck_id
+                fuzzy_index = FuzzyIndex()
+                fuzzy_index.load(self.get_word_keys())
+                # Bộ từ đổi trong lúc dựng: dùng một lần, không giữ lại
+                if deck_id == self.deck_id:
+                    self._fuzzy_index = fuzzy_index
+                log_message(f"Đã dựng chỉ mục tìm kiếm gần đúng: {len(fuzzy_index)} từ")
+            return fuzzy_index
+    
+    def _sync_fuzzy_index(self, kind: str, ids: Iterable[int], fields: Iterable[str]):
+        """Cập nhật chỉ mục trigram theo các hàng vừa ghi"""
+        fuzzy_index = self._fuzzy_index
+        try:
+            if kind == DELETED:
+                fuzzy_index.remove(ids)
+            elif kind == ADDED or 'word' in fields:
+                fuzzy_index.update((vocab['id'], vocab['word']) for vocab in self.get_many(ids))
+        except Exception as e:
+            # Dựng lại ở lần tìm tiếp theo
+            log_message(f"Lỗi cập nhật chỉ mục tìm kiếm gần đúng: {e}", "WARNING")
+            self._fuzzy_index = None
+    
+    def add_tags(self, ids: Iterable[int], tags: Iterable[str]) -> int:
+        """Gắn các nhãn cho các từ, trả về số cặp (từ, nhãn) mới"""
+        return self._write_tags(ids, tags, remove=False)
+    
+    def remove_tags(self, ids: Iterable[int], tags: Iterable[str]) -> int:
+        """Gỡ các nhãn khỏi các từ, trả về số cặp (từ, nhãn) đã gỡ"""
+        return self._write_tags(ids, tags, remove=True)
+    
+    def _write_tags(self, ids: Iterable[int], tags: Iterable[str], remove: bool) -> int:
+        """Thêm hoặc xóa các cặp (từ, nhãn) trong một transaction"""
+        ids = list(dict.fromkeys(ids))
+        tags = list(dict.fromkeys(tag for tag in map(normalize_tag, tags) if tag))
+        if not ids or not tags:
+            return 0
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                if remove:
+                    cursor.executemany('''
+                        DELETE FROM vocabulary_tags
+                        WHERE tag_id = (SELECT id FROM tags WHERE name = ?) AND vocab_id = ?
+                    ''', [(tag, vocab_id) for tag in tags for vocab_id in ids])
+                else:
+                    cursor.executemany('INSERT OR IGNORE INTO tags (name) VALUES (?)',
+                                       [(tag,) for tag in tags])
+                    # SELECT từ vocabulary để bỏ qua id không tồn tại
+                    cursor.executemany('''
+                        INSERT OR IGNORE INTO vocabulary_tags (tag_id, vocab_id)
+                        SELECT (SELECT id FROM tags WHERE name = ?), id FROM vocabulary WHERE id = ?
+                    ''', [(tag, vocab_id) for tag in tags for vocab_id in ids])
+                changed = cursor.rowcount
+            if changed > 0:
+                self._changed(UPDATED, ids, ('tags',))
+            return max(changed, 0)
+        
+        except Exception as e:
+            log_message(f"Lỗi cập nhật nhãn: {e}", "ERROR")
+            return 0
+    
+    def set_tags(self, vocab_id: int, tags: Iterable[str]) -> bool:
+        """Thay toàn bộ nhãn của một từ"""
+        tags = list(dict.fromkeys(tag for tag in map(normalize_tag, tags) if tag))
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1 FROM vocabulary WHERE id = ?', (vocab_id,))
+                if cursor.fetchone() is None:
+                    return False
+                cursor.execute('DELETE FROM vocabulary_tags WHERE vocab_id = ?', (vocab_id,))
+                cursor.executemany('INSERT OR IGNORE INTO tags (name) VALUES (?)',
+                                   [(tag,) for tag in tags])
+                cursor.executemany('''
+                    INSERT INTO vocabulary_tags (tag_id, vocab_id)
+                    SELECT id, ? FROM tags WHERE name = ?
+                ''', [(vocab_id, tag) for tag in tags])
+            self._changed(UPDATED, (vocab_id,), ('tags',))
+            return True
+        
+        except Exception as e:
+            log_message(f"Lỗi gắn nhãn cho từ vựng ID {vocab_id}: {e}", "ERROR")
+            return False
+    
+    def get_tags(self, vocab_id: int) -> List[str]:
+        """Các nhãn của một từ, theo tên"""
+        try:
+            cursor = self._connection().cursor()
             cursor.execute('''
-                SELECT COUNT(*) FROM vocabulary 
-                WHERE DATE(created_at) = DATE('now')
-            ''')
-            today_words = cursor.fetchone()[0]
+                SELECT t.name FROM vocabulary_tags vt
+                JOIN tags t ON t.id = vt.tag_id
+                WHERE vt.vocab_id = ?
+                ORDER BY t.name
+            ''', (vocab_id,))
+            return [name for name, in cursor.fetchall()]
+        
+        except Exception as e:
+            log_message(f"Lỗi lấy nhãn của từ vựng ID {vocab_id}: {e}", "ERROR")
+            return []
+    
+    def get_tag_counts(self) -> Dict[str, int]:
+        """Số từ của mỗi nhãn trong bộ từ hiện tại"""
+        try:
+            return self._get_tag_index().counts()
+        
+        except Exception as e:
+            log_message(f"Lỗi đếm nhãn: {e}", "ERROR")
+            return {}
+    
+    def filter_by_tags(self, query: str, limit: Optional[int] = None) -> List[VocabularyRecord]:
+        """Lọc bộ từ hiện tại theo biểu thức nhãn, từ mới thêm trước
+        
+        VD: `tag:travel AND NOT tag:mastered`, `tag:ielts (tag:verb OR tag:noun)`.
+        Biểu thức được tính bằng phép toán bit trong bộ nhớ, rồi chỉ các từ khớp
+        được đọc từ database bằng get_many.
+        """
+        try:
+            ids = self._get_tag_index().match(query, limit)
+            return self.get_many(ids)
+        
+        except ValueError as e:
+            log_message(f"Biểu thức nhãn không hợp lệ: {e}", "WARNING")
+            return []
+        except Exception as e:
+            log_message(f"Lỗi lọc theo nhãn: {e}", "ERROR")
+            return []
+    
+    def _get_tag_index(self) -> TagIndex:
+        """Chỉ mục nhãn của bộ từ hiện tại, dựng từ database ở lần gọi đầu"""
+        with self._tag_lock:
+            tag_index = self._tag_index
+            if tag_index is None:
+                deck_id = self.deck_id
+                tag_index = TagIndex()
+                tag_index.load(*self._load_tag_rows(deck_id))
+                # Bộ từ đổi trong lúc dựng: dùng một lần, không giữ lại
+                if deck_id == self.deck_id:
+                    self._tag_index = tag_index
+                log_message(f"Đã dựng chỉ mục nhãn: {len(tag_index)} từ")
+            return tag_index
+    
+    def _load_tag_rows(self, deck_id: int, ids: Optional[List[int]] = None
+                       ) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """Id các từ của bộ từ (chỉ trong `ids` nếu có) và các cặp (id, nhãn) của chúng"""
+        cursor = self._connection().cursor()
+        if ids is None:
+            cursor.execute('SELECT id FROM vocabulary WHERE deck_id = ?', (deck_id,))
+            deck_ids = [vocab_id for vocab_id, in cursor.fetchall()]
+            cursor.execute('''
+                SELECT vt.vocab_id, t.name FROM vocabulary_tags vt
+                JOIN tags t ON t.id = vt.tag_id
+                JOIN vocabulary v ON v.id = vt.vocab_id
+                WHERE v.deck_id = ?
+            ''', (deck_id,))
+            return deck_ids, cursor.fetchall()
+        
+        deck_ids, rows = [], []
+        for start in range(0, len(ids), self.MAX_QUERY_PARAMS):
+            chunk = ids[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT id FROM vocabulary WHERE id IN ({placeholders}) AND deck_id = ?
+            ''', chunk + [deck_id])
+            found = [vocab_id for vocab_id, in cursor.fetchall()]
+            if not found:
+                continue
+            deck_ids += found
+            placeholders = ', '.join('?' * len(found))
+            cursor.execute(f'''
+                SELECT vt.vocab_id, t.name FROM vocabulary_tags vt
+                JOIN tags t ON t.id = vt.tag_id
+                WHERE vt.vocab_id IN ({placeholders})
+            ''', found)
+            rows += cursor.fetchall()
+        return deck_ids, rows
+    
+    def _sync_tag_index(self, kind: str, ids: Iterable[int], fields: Iterable[str]):
+        """Cập nhật chỉ mục nhãn theo các hàng vừa ghi"""
+        tag_index = self._tag_index
+        try:
+            if kind == DELETED:
+                tag_index.remove(ids)
+            elif kind == ADDED or 'tags' in fields:
+                tag_index.set_rows(*self._load_tag_rows(self.deck_id, list(ids)))
+        except Exception as e:
+            # Dựng lại ở lần lọc tiếp theo
+            log_message(f"Lỗi cập nhật chỉ mục nhãn: {e}", "WARNING")
+            self._tag_index = None
+    
+    def get_words_listing(self, word: str, relation: str = SYNONYM) -> List[VocabularyRecord]:
+        """Các từ trong kho liệt kê `word` là từ đồng nghĩa (hoặc trái nghĩa)
+        
+        Tra chỉ mục related_key của word_relations thay vì LIKE trên cột chuỗi.
+        Như tra cứu theo từ, kết quả không giới hạn trong bộ từ hiện tại.
+        """
+        if relation not in RELATIONS:
+            raise ValueError(f"Loại quan hệ không hợp lệ: {relation}")
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS_V}
+                FROM word_relations r
+                JOIN vocabulary v ON v.id = r.vocab_id
+                WHERE r.related_key = ? AND r.relation = ?
+                ORDER BY v.word_key
+            ''', (normalize_word(word), relation))
+            return [self._make_record(row) for row in cursor.fetchall()]
             
-            conn.close()
+        except Exception as e:
+            log_message(f"Lỗi tìm từ liệt kê '{word}': {e}", "ERROR")
+            return []
+    
+    def get_word_graph(self, word: str, max_depth: int = 2,
+                       relations: Sequence[str] = RELATIONS) -> Dict[str, List]:
+        """Các từ cách `word` tối đa `max_depth` cạnh quan hệ, theo cả hai chiều
+        
+        Một CTE đệ quy duyệt theo chiều rộng trên word_relations: mỗi bước đi
+        theo cạnh ra (khóa chính word_key) và cạnh vào (chỉ mục related_key).
+        Trả về {'nodes': [{'key', 'word', 'depth', 'vocab_id'}], 'edges':
+        [(khóa nguồn, quan hệ, khóa đích)]}; vocab_id là None với từ chỉ được
+        nhắc tới mà chưa có trong kho. Số hàng duyệt bị giới hạn bởi GRAPH_MAX_ROWS.
+        """
+        if not 0 <= max_depth <= self.GRAPH_MAX_DEPTH:
+            raise ValueError(f"Độ sâu phải trong khoảng 0..{self.GRAPH_MAX_DEPTH}: {max_depth}")
+        relations = list(dict.fromkeys(relations))
+        if not relations or not set(relations) <= set(RELATIONS):
+            raise ValueError(f"Loại quan hệ không hợp lệ: {relations}")
+        
+        root = normalize_word(word)
+        try:
+            cursor = self._connection().cursor()
+            placeholders = ', '.join('?' * len(relations))
+            cursor.execute(f'''
+                WITH RECURSIVE graph(key, depth, source, relation, target, label) AS (
+                    SELECT ?, 0, NULL, NULL, NULL, ?
+                    UNION
+                    SELECT CASE WHEN r.word_key = g.key THEN r.related_key ELSE r.word_key END,
+                           g.depth + 1, r.word_key, r.relation, r.related_key,
+                           CASE WHEN r.word_key = g.key THEN r.related_word END
+                    FROM graph g
+                    JOIN word_relations r ON r.word_key = g.key OR r.related_key = g.key
+                    WHERE g.depth < ? AND r.relation IN ({placeholders})
+                    LIMIT ?
+                )
+                SELECT g.key, g.depth, g.source, g.relation, g.target,
+                       COALESCE(v.word, g.label), v.id
+                FROM graph g
+                LEFT JOIN vocabulary v ON v.word_key = g.key
+            ''', [root, word.strip(), max_depth] + relations + [self.GRAPH_MAX_ROWS])
             
+            nodes: Dict[str, Dict] = {}
+            edges = {}
+            for key, depth, source, relation, target, label, vocab_id in cursor.fetchall():
+                node = nodes.get(key)
+                if node is None or depth < node['depth']:
+                    nodes[key] = {'key': key, 'word': label or key, 'depth': depth, 'vocab_id': vocab_id}
+                if relation:
+                    edges[(source, relation, target)] = None
             return {
-                'total_words': total_words,
-                'reviewed_words': reviewed_words,
-                'unreviewed_words': unreviewed_words,
-                'today_words': today_words
+                'nodes': sorted(nodes.values(), key=lambda node: (node['depth'], node['key'])),
+                'edges': list(edges),
             }
             
+        except Exception as e:
+            log_message(f"Lỗi duyệt đồ thị từ '{word}': {e}", "ERROR")
+            return {'nodes': [], 'edges': []}
+    
+    def _execute_fts_search(self, cursor: sqlite3.Cursor, term: str, prefix: bool,
+                            deck_id: int):
+        """Tìm kiếm qua chỉ mục FTS5, xếp hạng theo bm25"""
+        # Đặt trong ngoặc kép để FTS5 hiểu là chuỗi con, không phải cú pháp truy vấn
+        phrase = '"' + term.replace('"', '""') + '"'
+        weights = ', '.join(str(weight) for weight in self.FTS_WEIGHTS)
+        
+        if prefix:
+            match_query = f'word : {phrase}'
+            prefix_filter = "AND vocabulary_fts.word LIKE ? ESCAPE '\\'"
+            params = (match_query, deck_id, self._escape_like(term) + '%')
+        else:
+            match_query = phrase
+            prefix_filter = ''
+            params = (match_query, deck_id)
+        
+        cursor.execute(f'''
+            SELECT {self.LIST_COLUMNS_V}
+            FROM vocabulary_fts
+            JOIN vocabulary v ON v.id = vocabulary_fts.rowid
+            WHERE vocabulary_fts MATCH ? AND v.deck_id = ? {prefix_filter}
+            ORDER BY bm25(vocabulary_fts, {weights}), v.created_at DESC, v.id DESC
+        ''', params)
+    
+    def _execute_like_search(self, cursor: sqlite3.Cursor, term: str, prefix: bool,
+                             deck_id: int):
+        """Tìm kiếm bằng LIKE (quét các hàng của bộ từ) khi không dùng được FTS5"""
+        if prefix:
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
+                FROM vocabulary 
+                WHERE deck_id = ? AND word LIKE ? ESCAPE '\\'
+                ORDER BY created_at DESC, id DESC
+            ''', (deck_id, self._escape_like(term) + '%'))
+            return
+        
+        search_pattern = f"%{term}%"
+        cursor.execute(f'''
+            SELECT {self.LIST_COLUMNS}
+            FROM vocabulary 
+            WHERE deck_id = ?
+              AND (word LIKE ? OR vocab_text(definition) LIKE ? OR vocab_text(example) LIKE ? 
+                   OR vocab_text(context_sentences) LIKE ? OR synonyms LIKE ? OR antonyms LIKE ?)
+            ORDER BY created_at DESC, id DESC
+        ''', (deck_id, search_pattern, search_pattern, search_pattern, 
+              search_pattern, search_pattern, search_pattern))
+    
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        """Escape ký tự đặc biệt của LIKE (dùng với ESCAPE '\\')"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    def grade(self, vocab_id: int, quality: int, latency_ms: Optional[int] = None) -> bool:
+        """Chấm điểm một lần ôn tập (0-5) và lập lịch lần ôn tiếp theo theo SM-2
+        
+        Mỗi lần chấm được ghi thêm vào review_log; `latency_ms` là thời gian
+        người học cần để trả lời (None nếu không đo).
+        """
+        if not MIN_QUALITY <= quality <= MAX_QUALITY:
+            raise ValueError(f"Điểm ôn tập phải trong khoảng {MIN_QUALITY}-{MAX_QUALITY}: {quality}")
+        if latency_ms is not None and latency_ms < 0:
+            raise ValueError(f"Thời gian trả lời không hợp lệ: {latency_ms}")
+        
+        try:
+            conn = self._connection()
+            with conn:
+                state = self._grade_row(conn.cursor(), vocab_id, quality, utc_now(), latency_ms)
+            if state is None:
+                log_message(f"Không tìm thấy từ vựng ID: {vocab_id}", "WARNING")
+                return False
+            
+            self._changed(REVIEWED, (vocab_id,))
+            log_message(f"Đã chấm điểm {quality} cho từ vựng ID: {vocab_id}, "
+                        f"ôn lại sau {state.interval:g} ngày")
+            return True
+            
+        except Exception as e:
+            log_message(f"Lỗi chấm điểm ôn tập: {e}", "ERROR")
+            return False
+    
+    def _grade_row(self, cursor: sqlite3.Cursor, vocab_id: int, quality: int,
+                   now: datetime, latency_ms: Optional[int] = None) -> Optional[ReviewState]:
+        """Cập nhật lịch ôn của một hàng và ghi review_log trong transaction hiện tại
+        
+        None nếu không có hàng. Trigger của review_log cộng dồn vào review_daily.
+        """
+        if not MIN_QUALITY <= quality <= MAX_QUALITY:
+            raise ValueError(f"Điểm ôn tập phải trong khoảng {MIN_QUALITY}-{MAX_QUALITY}: {quality}")
+        
+        cursor.execute('SELECT repetitions, interval, ease, deck_id FROM vocabulary WHERE id = ?',
+                       (vocab_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        
+        state = schedule_review(quality, *row[:3])
+        reviewed_at = format_timestamp(now)
+        cursor.execute('''
+            UPDATE vocabulary
+            SET last_reviewed = ?,
+                review_count = review_count + 1,
+                repetitions = ?, interval = ?, ease = ?, due_at = ?
+            WHERE id = ?
+        ''', (reviewed_at, state.repetitions, state.interval, state.ease,
+              next_due(state.interval, now), vocab_id))
+        cursor.execute('''
+            INSERT INTO review_log (vocab_id, deck_id, ts, grade, latency_ms)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (vocab_id, row[3], reviewed_at, quality, latency_ms))
+        return state
+    
+    def mark_as_reviewed(self, vocab_id: int, latency_ms: Optional[int] = None) -> bool:
+        """Đánh dấu từ vựng đã được ôn tập (grade với điểm mặc định)"""
+        return self.grade(vocab_id, DEFAULT_QUALITY, latency_ms)
+    
+    def get_review_log(self, vocab_id: int, limit: Optional[int] = None) -> List[Dict]:
+        """Lịch sử ôn tập của một từ (mới nhất trước), đọc theo chỉ mục (vocab_id, ts)"""
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute('''
+                SELECT ts, grade, latency_ms FROM review_log
+                WHERE vocab_id = ?
+                ORDER BY ts DESC, id DESC
+                LIMIT ?
+            ''', (vocab_id, -1 if limit is None else limit))
+            return [{'ts': ts, 'grade': grade, 'latency_ms': latency_ms}
+                    for ts, grade, latency_ms in cursor.fetchall()]
+            
+        except Exception as e:
+            log_message(f"Lỗi đọc lịch sử ôn tập: {e}", "ERROR")
+            return []
+    
+    def get_daily_reviews(self, days: int = 365, now: Optional[datetime] = None) -> List[Dict]:
+        """Số lần ôn mỗi ngày (UTC) của bộ từ hiện tại trong `days` ngày gần nhất, cũ trước
+        
+        Đọc bảng tổng hợp review_daily (tối đa `days` hàng liền nhau theo khóa
+        chính) thay vì gom nhóm nhật ký. Ngày không ôn không có trong kết quả.
+        """
+        if days < 1:
+            raise ValueError(f"Số ngày phải >= 1: {days}")
+        
+        try:
+            first_day = ((now or utc_now()) - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+            cursor = self._connection().cursor()
+            cursor.execute('''
+                SELECT day, reviews, lapses, latency_ms, timed_reviews FROM review_daily
+                WHERE deck_id = ? AND day >= ? AND reviews > 0
+                ORDER BY day
+            ''', (self.deck_id, first_day))
+            return [{'day': day, 'reviews': reviews, 'lapses': lapses,
+                     'avg_latency_ms': latency_ms / timed if timed else None}
+                    for day, reviews, lapses, latency_ms, timed in cursor.fetchall()]
+            
+        except Exception as e:
+            log_message(f"Lỗi đọc thống kê ôn tập theo ngày: {e}", "ERROR")
+            return []
+    
+    def get_due(self, limit: int = 20, now: Optional[datetime] = None) -> List[VocabularyRecord]:
+        """Lấy các từ đã đến hạn ôn tập (sớm nhất trước), đọc thẳng từ chỉ mục (deck_id, due_at)"""
+        try:
+            cursor = self._connection().cursor()
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
+                FROM vocabulary
+                WHERE deck_id = ? AND due_at <= ?
+                ORDER BY due_at
+                LIMIT ?
+            ''', (self.deck_id, format_timestamp(now or utc_now()), limit))
+            return [self._make_record(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            log_message(f"Lỗi lấy từ vựng đến hạn: {e}", "ERROR")
+            return []
+    
+    def get_vocabulary_stats(self) -> Dict:
+        """Lấy thống kê từ vựng của bộ từ hiện tại"""
+        try:
+            # Số từ "hôm nay" đổi theo ngày nên ngày hiện tại là một phần của khóa
+            deck_id = self.deck_id
+            return dict(self._cached('stats', lambda: self._load_stats(deck_id),
+                                     utc_now().date(), deck_id))
+            
         except Exception as e:
             log_message(f"Lỗi lấy thống kê: {e}", "ERROR")
             return {
@@ -292,43 +1469,162 @@ class VocabularyManager:
                 'today_words': 0
             }
     
-    def get_random_vocabulary(self, limit: int = 10) -> List[Dict]:
-        """Lấy từ vựng ngẫu nhiên để ôn tập"""
+    def _load_stats(self, deck_id: int) -> Dict:
+        """Đọc thống kê của một bộ từ từ database"""
+        conn = self._connection()
+        cursor = conn.cursor()
+        
+        # Tổng số từ và số từ đã ôn tập: đọc từ bộ đếm do trigger duy trì
+        cursor.execute('SELECT total_words, reviewed_words FROM deck_stats WHERE deck_id = ?', (deck_id,))
+        total_words, reviewed_words = cursor.fetchone() or (0, 0)
+        
+        # Số từ chưa ôn tập
+        unreviewed_words = total_words - reviewed_words
+        
+        # Số từ thêm hôm nay: so sánh khoảng để dùng được chỉ mục (deck_id, created_at)
+        cursor.execute('''
+            SELECT COUNT(*) FROM vocabulary 
+            WHERE deck_id = ? AND created_at >= DATE('now') AND created_at < DATE('now', '+1 day')
+        ''', (deck_id,))
+        today_words = cursor.fetchone()[0]
+        
+        return {
+            'total_words': total_words,
+            'reviewed_words': reviewed_words,
+            'unreviewed_words': unreviewed_words,
+            'today_words': today_words
+        }
+    
+    def get_random_vocabulary(self, limit: int = 10, weighted: bool = False) -> List[VocabularyRecord]:
+        """Lấy từ vựng ngẫu nhiên để ôn tập
+        
+        Chọn id ngẫu nhiên trong khoảng [MIN(id), MAX(id)] rồi tra khóa chính
+        (thử lại khi rơi vào khoảng trống), nên chi phí là O(k log n) thay vì
+        sắp xếp cả bảng. `weighted=True` ưu tiên từ ít được ôn và lâu chưa ôn.
+        """
+        deck_id = self.deck_id
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT id, word, definition, example, pronunciation, 
-                       part_of_speech, context_sentences, synonyms, antonyms,
-                       created_at, last_reviewed, review_count
-                FROM vocabulary 
-                ORDER BY RANDOM()
-                LIMIT ?
-            ''', (limit,))
+            # Hai truy vấn con riêng để SQLite tối ưu MIN/MAX thành một lần tra khóa chính
+            cursor.execute('SELECT (SELECT MIN(id) FROM vocabulary), (SELECT MAX(id) FROM vocabulary)')
+            min_id, max_id = cursor.fetchone()
+            if min_id is None or limit <= 0:
+                return []
             
-            rows = cursor.fetchall()
-            conn.close()
-            
-            vocabularies = []
-            for row in rows:
-                vocabularies.append({
-                    'id': row[0],
-                    'word': row[1],
-                    'definition': row[2],
-                    'example': row[3],
-                    'pronunciation': row[4],
-                    'part_of_speech': row[5],
-                    'context_sentences': row[6],
-                    'synonyms': row[7],
-                    'antonyms': row[8],
-                    'created_at': row[9],
-                    'last_reviewed': row[10],
-                    'review_count': row[11]
-                })
+            # Mật độ id của bộ từ trong khoảng id của cả bảng
+            cursor.execute('SELECT total_words FROM deck_stats WHERE deck_id = ?', (deck_id,))
+            row = cursor.fetchone()
+            total = row[0] if row else 0
+            density = total / (max_id - min_id + 1)
+            
+            if total <= limit or density < self.RANDOM_MIN_DENSITY:
+                # Bộ từ quá nhỏ hoặc quá thưa: thử id ngẫu nhiên sẽ trượt quá nhiều
+                return self._random_by_sort(cursor, deck_id, limit, weighted)
             
-            return vocabularies
+            chosen: Dict[int, VocabularyRecord] = {}
+            for _ in range(self.RANDOM_MAX_ROUNDS):
+                needed = limit - len(chosen)
+                if needed <= 0:
+                    break
+                
+                # Số id cần thử để nhiều khả năng đủ `needed` hàng sau khi trừ khoảng trống
+                batch_size = min(int(needed / density * 1.5) + 8, self.MAX_QUERY_PARAMS)
+                candidates = []
+                seen = set(chosen)
+                while len(candidates) < batch_size:
+                    candidate = random.randint(min_id, max_id)
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        candidates.append(candidate)
+                
+                placeholders = ', '.join('?' * len(candidates))
+                cursor.execute(f'''
+                    SELECT {self.LIST_COLUMNS}
+                    FROM vocabulary 
+                    WHERE id IN ({placeholders}) AND deck_id = ?
+                ''', candidates + [deck_id])
+                found = {row[0]: row for row in cursor.fetchall()}
+                
+                # Duyệt theo thứ tự bốc thăm để giữ phân phối đều
+                for candidate in candidates:
+                    row = found.get(candidate)
+                    if row is None:
+                        continue
+                    if weighted and random.random() >= self._review_weight(row):
+                        continue
+                    chosen[candidate] = self._make_record(row)
+                    if len(chosen) == limit:
+                        break
+            
+            records = list(chosen.values())
+            if len(records) < limit:
+                # Hiếm khi xảy ra: bổ sung phần còn thiếu bằng cách sắp xếp ngẫu nhiên
+                records += self._random_by_sort(cursor, deck_id, limit - len(records), weighted,
+                                                exclude=chosen)
+            return records
             
         except Exception as e:
             log_message(f"Lỗi lấy từ vựng ngẫu nhiên: {e}", "ERROR")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _random_by_sort(self, cursor: sqlite3.Cursor, deck_id: int, limit: int, weighted: bool,
+                        exclude: Iterable[int] = ()) -> List[VocabularyRecord]:
+        """Lấy mẫu bằng ORDER BY RANDOM(), dùng cho bộ từ nhỏ hoặc quá thưa"""
+        exclude = list(exclude)
+        where = 'WHERE deck_id = ?'
+        if exclude:
+            where += f" AND id NOT IN ({', '.join('?' * len(exclude))})"
+        params = [deck_id] + exclude
+        if weighted:
+            # Khóa ngẫu nhiên theo trọng số (Efraimidis-Spirakis): u^(1/w), lấy lớn nhất
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
+                FROM vocabulary 
+                {where}
+            ''', params)
+            rows = cursor.fetchall()
+            rows.sort(key=lambda row: random.random() ** (1.0 / self._review_weight(row)), reverse=True)
+            rows = rows[:limit]
+        else:
+            cursor.execute(f'''
+                SELECT {self.LIST_COLUMNS}
+                FROM vocabulary 
+                {where}
+                ORDER BY RANDOM()
+                LIMIT ?
+            ''', params + [limit])
+            rows = cursor.fetchall()
+        return [self._make_record(row) for row in rows]
+    
+    def _review_weight(self, row: tuple) -> float:
+        """Trọng số trong (0, 1]: cao cho từ ít được ôn và lâu chưa ôn"""
+        review_count = row[self._REVIEW_COUNT_INDEX] or 0
+        weight = 1.0 / (1 + review_count)
+        
+        last_reviewed = row[self._LAST_REVIEWED_INDEX]
+        if last_reviewed:
+            try:
+                reviewed_at = datetime.strptime(last_reviewed[:19], '%Y-%m-%d %H:%M:%S')
+                days = max((datetime.utcnow() - reviewed_at).total_seconds() / 86400, 0.0)
+                weight *= min(1.0, (days + 1) / (self.RANDOM_STALE_DAYS + 1))
+            except ValueError:
+                pass
+        return max(weight, self.RANDOM_MIN_WEIGHT)
+
+_shared_managers: Dict[Optional[str], VocabularyManager] = {}
+_shared_lock = threading.Lock()
+
+def get_vocabulary_manager(db_path: Optional[str] = None) -> VocabularyManager:
+    """VocabularyManager dùng chung trong process, có bộ nhớ đệm đọc
+    
+    Các cửa sổ cùng đọc một bản trong bộ nhớ thay vì mỗi cửa sổ tự đọc lại bảng.
+    """
+    with _shared_lock:
+        manager = _shared_managers.get(db_path)
+        if manager is None:
+            manager = VocabularyManager(db_path, cache=VocabularyCache(), text_compression=bool(
+                config_manager.get_vocabulary_setting('compress_text', False)))
+            _shared_managers[db_path] = manager
+        return manager
@@ -0,0 +1,168 @@
+"""
+Vocabulary Record - Bản ghi từ vựng gọn nhẹ
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .text_codec import COMPRESSED_FIELDS, decode_text
+
+# Hàm nạp các cột nặng theo id, trả về (example, context_sentences) như lưu trong database
+HeavyLoader = Callable[[int], Optional[Tuple[str, str]]]
+
+class VocabularyRecord:
+    """Một hàng từ vựng dùng __slots__, các cột văn bản dài được nạp lười
+
+    Cột đang lưu ở dạng nén (BLOB) chỉ được giải nén khi đọc giá trị đầy đủ;
+    preview() chỉ giải nén phần đầu.
+    Hỗ trợ truy cập kiểu dict (`record['word']`, `record.get(...)`) để tương
+    thích với code GUI cũ vốn làm việc với dict.
+    """
+
+    # Thứ tự cột đầy đủ, giống với dict trả về trước đây
+    FIELDS = ('id', 'word', 'definition', 'example', 'pronunciation',
+              'part_of_speech', 'context_sentences', 'synonyms', 'antonyms',
+              'created_at', 'last_reviewed', 'review_count',
+              'due_at', 'interval', 'ease', 'repetitions', 'deck_id')
+    # Cột văn bản dài, chỉ nạp khi được truy cập
+    HEAVY_FIELDS = ('example', 'context_sentences')
+    LIGHT_FIELDS = ('id', 'word', 'definition', 'pronunciation', 'part_of_speech',
+                    'synonyms', 'antonyms', 'created_at', 'last_reviewed', 'review_count',
+                    'due_at', 'interval', 'ease', 'repetitions', 'deck_id')
+    # Số ký tự xem trước được đọc sẵn cho mỗi cột nặng (đủ để biết có cần '...')
+    PREVIEW_LENGTH = 64
+
+    __slots__ = tuple(field for field in LIGHT_FIELDS if field != 'definition') + (
+        '_definition', '_heavy', '_previews', '_loader')
+
+    def __init__(self, values: Dict[str, Any], loader: Optional[HeavyLoader] = None,
+                 previews: Optional[Tuple[str, str]] = None):
+        for field in self.LIGHT_FIELDS:
+            setattr(self, field, values.get(field))
+        if all(field in values for field in self.HEAVY_FIELDS):
+            self._heavy = tuple(values[field] for field in self.HEAVY_FIELDS)
+        else:
+            self._heavy = None
+        self._previews = previews
+        self._loader = loader
+
+    @classmethod
+    def from_row(cls, row: tuple, loader: Optional[HeavyLoader] = None) -> 'VocabularyRecord':
+        """Factory duy nhất tạo bản ghi từ một hàng SQL
+
+        Không có loader: hàng đầy đủ theo full_select_columns(), bản ghi hoàn chỉnh.
+        Có loader: hàng theo list_select_columns(), cột nặng được nạp lười.
+        """
+        if loader is None:
+            return cls(dict(zip(cls.FIELDS, row)))
+
+        light_count = len(cls.LIGHT_FIELDS)
+        return cls(dict(zip(cls.LIGHT_FIELDS, row[:light_count])),
+                   loader=loader, previews=tuple(row[light_count:]))
+
+    @classmethod
+    def full_select_columns(cls, alias: str = '') -> str:
+        """Danh sách cột SELECT cho bản ghi đầy đủ"""
+        prefix = f'{alias}.' if alias else ''
+        return ', '.join(prefix + field for field in cls.FIELDS)
+
+    @classmethod
+    def list_select_columns(cls, alias: str = '') -> str:
+        """Danh sách cột SELECT cho danh sách: cột nhẹ và phần đầu của cột nặng
+
+        substr() trên BLOB cắt giữa luồng nén, nên giá trị nén được lấy nguyên
+        (vốn đã nhỏ) và chỉ giải nén phần đầu khi xem trước.
+        """
+        prefix = f'{alias}.' if alias else ''
+        columns = [prefix + field for field in cls.LIGHT_FIELDS]
+        columns += [f"CASE WHEN typeof({prefix}{field}) = 'blob' THEN {prefix}{field} "
+                    f"ELSE substr({prefix}{field}, 1, {cls.PREVIEW_LENGTH}) END"
+                    for field in cls.HEAVY_FIELDS]
+        return ', '.join(columns)
+
+    def _load_heavy(self) -> Tuple[str, str]:
+        """Nạp các cột nặng (một lần) qua loader"""
+        if self._heavy is None:
+            values = self._loader(self.id) if self._loader else None
+            self._heavy = values or ('',) * len(self.HEAVY_FIELDS)
+            self._previews = None
+        return self._heavy
+
+    def _heavy_field(self, index: int) -> str:
+        """Một cột nặng, giải nén (một lần) nếu đang lưu ở dạng nén"""
+        heavy = self._load_heavy()
+        value = heavy[index]
+        if isinstance(value, bytes):
+            value = decode_text(value)
+            self._heavy = heavy[:index] + (value,) + heavy[index + 1:]
+        return value
+
+    @property
+    def definition(self) -> str:
+        value = self._definition
+        if isinstance(value, bytes):
+            value = self._definition = decode_text(value)
+        return value
+
+    @definition.setter
+    def definition(self, value: Any):
+        self._definition = value
+
+    @property
+    def example(self) -> str:
+        return self._heavy_field(0)
+
+    @property
+    def context_sentences(self) -> str:
+        return self._heavy_field(1)
+
+    @property
+    def heavy_loaded(self) -> bool:
+        """True nếu các cột nặng đã có trong bộ nhớ"""
+        return self._heavy is not None
+
+    def preview(self, field: str, max_length: int = 50) -> str:
+        """Lấy đoạn đầu của một cột để hiển thị, không nạp hay giải nén hết nếu chưa cần"""
+        if field in self.HEAVY_FIELDS and self._heavy is None and self._previews is not None:
+            value = self._previews[self.HEAVY_FIELDS.index(field)]
+            if not isinstance(value, bytes) and max_length >= self.PREVIEW_LENGTH:
+                value = self._load_heavy()[self.HEAVY_FIELDS.index(field)]
+        elif field in self.HEAVY_FIELDS:
+            value = self._load_heavy()[self.HEAVY_FIELDS.index(field)]
+        elif field in COMPRESSED_FIELDS:
+            value = self._definition
+        else:
+            value = self[field]
+        # Đọc thêm một ký tự để biết có cần '...'
+        text = decode_text(value, max_length + 1) or ''
+        return text[:max_length] + "..." if len(text) > max_length else text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Chuyển thành dict đầy đủ (nạp cột nặng nếu cần)"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    # Giao diện kiểu dict
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self.FIELDS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, VocabularyRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"VocabularyRecord(id={self.id!r}, word={self.word!r})"
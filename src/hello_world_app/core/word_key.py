@@ -0,0 +1,131 @@
+"""
+Word key - Khóa chuẩn hóa để so khớp từ vựng không phân biệt hoa/thường và dạng Unicode
+"""
+
+import sqlite3
+import unicodedata
+from typing import List, Tuple
+
+def normalize_word(word: str) -> str:
+    """NFKC + casefold + gộp khoảng trắng: "Run", " run ", "ｒｕｎ" đều thành "run" """
+    return ' '.join(unicodedata.normalize('NFKC', word or '').casefold().split())
+
+def register_word_key(conn: sqlite3.Connection):
+    """Đăng ký hàm SQL word_key(word) trên kết nối (dùng khi backfill/tìm và gộp trùng)"""
+    conn.create_function('word_key', 1, normalize_word)
+
+# Cột văn bản lấy từ bản trùng khi bản giữ lại đang trống
+_MERGE_TEXT_FIELDS = ('definition', 'example', 'pronunciation', 'part_of_speech',
+                      'context_sentences', 'synonyms', 'antonyms')
+
+# Lịch ôn SM-2 lấy nguyên từ một bản của nhóm
+_SCHEDULE_FIELDS = ('repetitions', 'interval', 'ease', 'due_at')
+
+def find_duplicate_groups(cursor: sqlite3.Cursor) -> List[Tuple[str, int, str]]:
+    """Các nhóm trùng khóa: (word_key, số bản ghi, các từ gốc nối bằng ' | ')
+
+    Tính khóa từ cột word nên dùng được cả với database chưa có cột word_key.
+    """
+    register_word_key(cursor.connection)
+    cursor.execute('''
+        SELECT word_key(word) AS word_key, COUNT(*), GROUP_CONCAT(word, ' | ')
+        FROM vocabulary
+        GROUP BY 1
+        HAVING COUNT(*) > 1
+        ORDER BY 1
+    ''')
+    return cursor.fetchall()
+
+def mark_duplicates(cursor: sqlite3.Cursor) -> int:
+    """Bỏ word_key (NULL) của các bản trùng, chỉ bản cũ nhất mỗi nhóm giữ khóa
+
+    Để tạo được chỉ mục UNIQUE mà không xóa dữ liệu; các bản bị đánh dấu vẫn
+    hiện trong danh sách cho tới khi được gộp bằng merge_duplicates().
+    Trả về số bản ghi đã đánh dấu.
+    """
+    cursor.execute('''
+        UPDATE vocabulary SET word_key = NULL
+        WHERE word_key IS NOT NULL
+          AND id NOT IN (SELECT MIN(id) FROM vocabulary WHERE word_key IS NOT NULL GROUP BY word_key)
+    ''')
+    return cursor.rowcount
+
+def merge_duplicates(cursor: sqlite3.Cursor) -> List[int]:
+    """Gộp các bản ghi cùng khóa chuẩn hóa vào bản cũ nhất bằng vài câu lệnh SQL theo tập
+
+    Bản giữ lại (id nhỏ nhất) được điền các cột văn bản đang trống từ bản trùng,
+    cộng dồn review_count, lấy created_at sớm nhất, last_reviewed muộn nhất và
+    nhận thêm nhãn của bản trùng. Lịch SM-2 (repetitions, interval, ease, due_at)
+    không trộn được nên lấy nguyên của bản ôn nhiều nhất (review_count lớn nhất,
+    rồi last_reviewed muộn nhất, rồi id nhỏ nhất) để không mất tiến độ ôn tập.
+    Khóa được tính từ cột word nên gộp được cả các bản mark_duplicates() đã bỏ
+    word_key. Cần schema mới nhất, chạy trong transaction của người gọi; trả về
+    id các bản giữ lại (quan hệ đồng nghĩa/trái nghĩa của chúng cần được tách lại).
+    """
+    register_word_key(cursor.connection)
+    cursor.execute('DROP TABLE IF EXISTS temp.word_key_merge')
+    cursor.execute('''
+        CREATE TEMP TABLE word_key_merge (
+            id INTEGER PRIMARY KEY,
+            keeper INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO temp.word_key_merge (id, keeper)
+        SELECT v.id, g.keeper
+        FROM vocabulary v
+        JOIN (SELECT word_key(word) AS word_key, MIN(id) AS keeper FROM vocabulary
+              GROUP BY 1 HAVING COUNT(*) > 1) g
+        ON word_key(v.word) = g.word_key
+    ''')
+    cursor.execute('CREATE INDEX temp.idx_word_key_merge_keeper ON word_key_merge(keeper)')
+    # Bản của mỗi nhóm có lịch ôn được giữ lại
+    cursor.execute('DROP TABLE IF EXISTS temp.word_key_schedule')
+    cursor.execute('''
+        CREATE TEMP TABLE word_key_schedule AS
+        SELECT k.keeper, (SELECT d.id FROM vocabulary d
+                          JOIN temp.word_key_merge m ON m.id = d.id
+                          WHERE m.keeper = k.keeper
+                          ORDER BY COALESCE(d.review_count, 0) DESC, d.last_reviewed DESC, d.id
+                          LIMIT 1) AS source
+        FROM (SELECT DISTINCT keeper FROM temp.word_key_merge) k
+    ''')
+
+    members = 'SELECT id FROM temp.word_key_merge WHERE keeper = vocabulary.id'
+    fills = ',\n            '.join(
+        f'''{field} = COALESCE(NULLIF({field}, ''), (SELECT {field} FROM vocabulary d
+                WHERE d.id IN ({members}) AND d.{field} != '' ORDER BY d.id LIMIT 1), {field})'''
+        for field in _MERGE_TEXT_FIELDS
+    )
+    source = 'SELECT source FROM temp.word_key_schedule WHERE keeper = vocabulary.id'
+    schedule = ',\n            '.join(
+        f'{field} = (SELECT s.{field} FROM vocabulary s WHERE s.id = ({source}))'
+        for field in _SCHEDULE_FIELDS
+    )
+    cursor.execute(f'''
+        UPDATE vocabulary SET
+            {fills},
+            review_count = (SELECT SUM(COALESCE(review_count, 0)) FROM vocabulary d
+                            WHERE d.id IN ({members})),
+            {schedule},
+            created_at = (SELECT MIN(created_at) FROM vocabulary d WHERE d.id IN ({members})),
+            last_reviewed = (SELECT MAX(last_reviewed) FROM vocabulary d WHERE d.id IN ({members}))
+        WHERE id IN (SELECT DISTINCT keeper FROM temp.word_key_merge)
+    ''')
+    cursor.execute('''
+        INSERT OR IGNORE INTO vocabulary_tags (tag_id, vocab_id)
+        SELECT t.tag_id, m.keeper FROM vocabulary_tags t
+        JOIN temp.word_key_merge m ON t.vocab_id = m.id
+        WHERE m.id != m.keeper
+    ''')
+    cursor.execute('''
+        DELETE FROM vocabulary
+        WHERE id IN (SELECT id FROM temp.word_key_merge WHERE id != keeper)
+    ''')
+    cursor.execute('UPDATE vocabulary SET word_key = word_key(word) '
+                   'WHERE id IN (SELECT keeper FROM temp.word_key_merge)')
+    cursor.execute('SELECT DISTINCT keeper FROM temp.word_key_merge ORDER BY keeper')
+    keepers = [row[0] for row in cursor.fetchall()]
+    cursor.execute('DROP TABLE temp.word_key_merge')
+    cursor.execute('DROP TABLE temp.word_key_schedule')
+    return keepers
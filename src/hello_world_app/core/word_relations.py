@@ -0,0 +1,58 @@
+"""
+Word relations - Tách chuỗi từ đồng nghĩa/trái nghĩa thành các hàng quan hệ có chỉ mục
+"""
+
+import re
+import sqlite3
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .word_key import normalize_word
+
+SYNONYM = 'synonym'
+ANTONYM = 'antonym'
+# Loại quan hệ -> cột chuỗi nguồn trong bảng vocabulary
+RELATION_COLUMNS = ((SYNONYM, 'synonyms'), (ANTONYM, 'antonyms'))
+RELATIONS = tuple(relation for relation, _ in RELATION_COLUMNS)
+
+# AI và người dùng nối bằng dấu phẩy; chấp nhận cả ';' và xuống dòng
+_SEPARATOR_RE = re.compile(r'[,;\n]')
+
+# (vocab_id, word_key, quan hệ, khóa từ liên quan, từ liên quan)
+RelationRow = Tuple[int, str, str, str, str]
+
+def split_related_words(text: Optional[str]) -> List[Tuple[str, str]]:
+    """Các cặp (khóa, từ) trong chuỗi "a, b, c", bỏ phần trống và khóa trùng"""
+    related = {}
+    for part in _SEPARATOR_RE.split(text or ''):
+        word = ' '.join(part.split())
+        key = normalize_word(word)
+        if key and key not in related:
+            related[key] = word
+    return [(key, word) for key, word in related.items()]
+
+def relation_rows(vocab_id: int, word_key: str, synonyms: Optional[str],
+                  antonyms: Optional[str]) -> List[RelationRow]:
+    """Các hàng word_relations của một từ (bỏ quan hệ với chính nó)"""
+    rows = []
+    for relation, text in ((SYNONYM, synonyms), (ANTONYM, antonyms)):
+        for key, word in split_related_words(text):
+            if key != word_key:
+                rows.append((vocab_id, word_key, relation, key, word))
+    return rows
+
+def rewrite_relations(cursor: sqlite3.Cursor, rows: Iterable[Sequence]) -> int:
+    """Ghi lại quan hệ của các hàng (id, word_key, synonyms, antonyms) theo lô
+
+    Chạy trong transaction của người gọi, trả về số hàng quan hệ đã ghi.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    cursor.executemany('DELETE FROM word_relations WHERE vocab_id = ?',
+                       [(row[0],) for row in rows])
+    relations = [relation for row in rows if row[1] for relation in relation_rows(*row)]
+    cursor.executemany('''
+        INSERT INTO word_relations (vocab_id, word_key, relation, related_key, related_word)
+        VALUES (?, ?, ?, ?, ?)
+    ''', relations)
+    return len(relations)
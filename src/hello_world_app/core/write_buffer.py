@@ -0,0 +1,161 @@
+"""
+Write buffer - Gom các thao tác ghi liên tiếp thành một lần commit
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config_manager import config_manager
+from .db_executor import call_on_main_loop
+from .scheduler import MAX_QUALITY, MIN_QUALITY
+from ..utils.helpers import log_message
+
+# Mức bền vững -> PRAGMA synchronous dùng khi commit một lô
+DURABILITY_LEVELS = {
+    'off': 'OFF',        # Nhanh nhất, có thể mất lô cuối khi mất điện
+    'normal': 'NORMAL',  # Mặc định của WAL: không fsync mỗi commit
+    'full': 'FULL',      # fsync mỗi lô
+}
+
+class WriteBuffer:
+    """Gom mark_as_reviewed/grade/update_vocabulary/delete_vocabulary rồi ghi theo lô
+
+    Một lô được ghi (một transaction) khi đủ `max_operations` thao tác hoặc
+    sau `flush_interval_ms` kể từ thao tác đầu tiên của lô. Các lần đọc thấy
+    thay đổi sau khi lô được ghi; gọi flush() để ghi ngay.
+    """
+
+    DEFAULT_INTERVAL_MS = 250
+    DEFAULT_MAX_OPERATIONS = 100
+
+    def __init__(self, manager, flush_interval_ms: int = DEFAULT_INTERVAL_MS,
+                 max_operations: int = DEFAULT_MAX_OPERATIONS, durability: str = 'normal'):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Mức bền vững không hợp lệ: {durability}")
+        self.manager = manager
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_operations = max_operations
+        self.durability = durability
+        self.commits = 0
+
+        self._condition = threading.Condition()
+        # Giữ trong lúc lấy và ghi một lô để các lô được ghi đúng thứ tự
+        self._flush_lock = threading.Lock()
+        self._pending: List[Tuple[str, tuple, Optional[Callable[[bool], None]]]] = []
+        self._first_pending_at = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='vocab-write-buffer', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: str, *args, callback: Optional[Callable[[bool], None]] = None):
+        """Xếp một thao tác ghi vào lô; `callback(kết quả)` chạy trên main loop sau khi ghi"""
+        if operation not in self.manager.WRITE_OPERATIONS:
+            raise ValueError(f"Thao tác ghi không hợp lệ: {operation}")
+        if operation == 'grade' and not MIN_QUALITY <= args[1] <= MAX_QUALITY:
+            raise ValueError(f"Điểm ôn tập phải trong khoảng {MIN_QUALITY}-{MAX_QUALITY}: {args[1]}")
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("WriteBuffer đã đóng")
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append((operation, args, callback))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_operations:
+                self._condition.notify()
+
+    def mark_as_reviewed(self, vocab_id: int, latency_ms: Optional[int] = None,
+                         callback: Optional[Callable[[bool], None]] = None):
+        self.submit('mark_as_reviewed', vocab_id, latency_ms, callback=callback)
+
+    def grade(self, vocab_id: int, quality: int, latency_ms: Optional[int] = None,
+              callback: Optional[Callable[[bool], None]] = None):
+        self.submit('grade', vocab_id, quality, latency_ms, callback=callback)
+
+    def update_vocabulary(self, vocab_id: int, *fields, callback: Optional[Callable[[bool], None]] = None):
+        self.submit('update_vocabulary', vocab_id, *fields, callback=callback)
+
+    def delete_vocabulary(self, vocab_id: int, callback: Optional[Callable[[bool], None]] = None):
+        self.submit('delete_vocabulary', vocab_id, callback=callback)
+
+    @property
+    def pending(self) -> int:
+        """Số thao tác đang chờ ghi"""
+        with self._condition:
+            return len(self._pending)
+
+    def _run(self):
+        """Thread nền: chờ đủ thời gian hoặc đủ số thao tác rồi ghi lô"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                deadline = self._first_pending_at + self.flush_interval
+                while (self._pending and len(self._pending) < self.max_operations
+                       and not self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self.flush()
+
+    def flush(self) -> int:
+        """Ghi ngay các thao tác đang chờ trong một transaction, trả về số thao tác đã ghi"""
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            results = self.manager.apply_writes(
+                [(operation, args) for operation, args, _ in batch],
+                synchronous=DURABILITY_LEVELS[self.durability]
+            )
+            self.commits += 1
+
+        for (_, _, callback), result in zip(batch, results):
+            if callback:
+                call_on_main_loop(callback, result)
+        return len(batch)
+
+    def close(self):
+        """Ghi nốt các thao tác còn lại và dừng thread nền"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        flushed = self.flush()
+        log_message(f"Đã đóng write buffer ({flushed} thao tác cuối, {self.commits} lần commit)")
+
+_shared_buffers: Dict[int, WriteBuffer] = {}
+_shared_lock = threading.Lock()
+
+def get_write_buffer(manager) -> Optional[WriteBuffer]:
+    """WriteBuffer dùng chung cho manager nếu được bật trong cấu hình, ngược lại None"""
+    if not config_manager.get_vocabulary_setting('write_buffer', False):
+        return None
+    with _shared_lock:
+        buffer = _shared_buffers.get(id(manager))
+        if buffer is None or buffer._closed:
+            buffer = WriteBuffer(
+                manager,
+                flush_interval_ms=config_manager.get_vocabulary_setting(
+                    'write_buffer_interval_ms', WriteBuffer.DEFAULT_INTERVAL_MS),
+                max_operations=config_manager.get_vocabulary_setting(
+                    'write_buffer_max_operations', WriteBuffer.DEFAULT_MAX_OPERATIONS),
+                durability=config_manager.get_vocabulary_setting('write_durability', 'normal'),
+            )
+            _shared_buffers[id(manager)] = buffer
+        return buffer
+
+def flush_write_buffers():
+    """Đóng và ghi nốt mọi write buffer (gọi khi thoát hoặc nhận SIGTERM)"""
+    with _shared_lock:
+        buffers = list(_shared_buffers.values())
+        _shared_buffers.clear()
+    for buffer in buffers:
+        buffer.close()
@@ -6,10 +6,15 @@ import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk, GLib
 from typing import Optional, Dict
+import os
 import threading
 
 from ..core.config import AppConfig
-from ..core.vocabulary_manager import VocabularyManager
+from ..core.events import ADDED, DECK_CHANGED, DELETED, REVIEWED, UPDATED
+from ..core.db_executor import get_database_executor
+from ..core.prefix_index import PrefixIndex
+from ..core.write_buffer import get_write_buffer
+from ..core.vocabulary_manager import get_vocabulary_manager
 from ..gui.settings_window import SettingsWindow
 from ..utils.helpers import format_system_info, log_message
 from ..utils.ai_helper import ai_helper
@@ -18,10 +23,26 @@ from ..core.config_manager import config_manager
 class MainWindow:
     """Quản lý cửa sổ chính của ứng dụng"""
     
+    # Số hàng thêm vào danh sách mỗi lần idle
+    POPULATE_BATCH_SIZE = 200
+    
     def __init__(self, app_instance):
         self.app = app_instance
         self.window = None
-        self.vocab_manager = VocabularyManager()
+        self.vocab_manager = get_vocabulary_manager()
+        # Mọi truy vấn từ GUI chạy nền, kết quả trả về main loop
+        self.db_executor = get_database_executor(self.vocab_manager)
+        # Ôn tập/sửa/xóa liên tiếp được gom thành một commit nếu bật write buffer
+        self.write_buffer = get_write_buffer(self.vocab_manager)
+        # Mở lại bộ từ dùng lần trước (bộ từ đã bị xóa thì giữ bộ từ mặc định)
+        saved_deck = config_manager.get_vocabulary_setting('current_deck')
+        if saved_deck:
+            self.vocab_manager.set_deck(saved_deck)
+        
+        # Bộ từ: combo trên header bar, id theo thứ tự các mục
+        self.deck_combo = None
+        self._deck_ids = []
+        self._deck_handler_id = None
         
         # Stack và switcher để chuyển đổi chế độ
         self.stack = None
@@ -58,8 +79,26 @@ class MainWindow:
         self.save_button = None
         self.cancel_button = None
         self.stats_content = None
+        self._populate_source_id = None
+        # Model hiện tại của danh sách và id -> Gtk.TreeIter để sửa từng hàng khi có sự kiện
+        self._vocabulary_store = None
+        self._row_iters = {}
+        # Tăng mỗi lần yêu cầu nạp danh sách; kết quả của yêu cầu cũ bị bỏ qua
+        self._list_request = 0
+        # Chỉ mục tiền tố cho gợi ý khi gõ từ; nạp nền một lần rồi cập nhật theo sự kiện
+        self.word_index = PrefixIndex()
+        self.word_completion_store = None
+        self._word_index_loading = False
+        self._word_index_stale = False
+        # Phần trăm sao lưu đã hiển thị, chỉ cập nhật nhãn khi đổi
+        self._backup_percent = None
         
         self.setup_ui()
+        self.vocab_manager.events.subscribe(self._on_vocabulary_changed)
+        self.vocab_manager.events.subscribe(self._on_words_changed,
+                                            kinds=(ADDED, UPDATED, DELETED, DECK_CHANGED))
+        self._load_word_index()
+        self._load_decks()
     
     def setup_ui(self):
         """Thiết lập giao diện người dùng"""
@@ -113,6 +152,17 @@ class MainWindow:
         header.pack_start(mode_button)
         self.mode_button = mode_button
         
+        # Chọn bộ từ và tạo bộ từ mới
+        self.deck_combo = Gtk.ComboBoxText()
+        self.deck_combo.set_tooltip_text("Bộ từ đang học")
+        self._deck_handler_id = self.deck_combo.connect("changed", self._on_deck_changed)
+        header.pack_start(self.deck_combo)
+        
+        new_deck_button = Gtk.Button(label="➕")
+        new_deck_button.set_tooltip_text("Tạo bộ từ mới")
+        new_deck_button.connect("clicked", self._on_new_deck_clicked)
+        header.pack_start(new_deck_button)
+        
         # Nút Settings
         settings_button = Gtk.Button()
         settings_button.set_label("⚙️ Cấu hình")
@@ -223,6 +273,14 @@ class MainWindow:
         self.word_entry = Gtk.Entry()
         self.word_entry.set_placeholder_text("Nhập từ vựng...")
         self.word_entry.connect("activate", self._on_quick_add_word)
+        self.word_entry.connect("changed", self._on_word_entry_changed)
+        # Gợi ý lấy từ PrefixIndex nên completion không tự lọc lại
+        self.word_completion_store = Gtk.ListStore(str)
+        word_completion = Gtk.EntryCompletion()
+        word_completion.set_model(self.word_completion_store)
+        word_completion.set_text_column(0)
+        word_completion.set_match_func(lambda completion, key, tree_iter: True)
+        self.word_entry.set_completion(word_completion)
         word_hbox.pack_start(word_label, False, False, 0)
         word_hbox.pack_start(self.word_entry, True, True, 0)
         form_vbox.pack_start(word_hbox, False, False, 0)
@@ -545,6 +603,8 @@ class MainWindow:
         search_label.set_halign(Gtk.Align.START)
         self.search_entry = Gtk.Entry()
         self.search_entry.set_placeholder_text("Nhập từ vựng để tìm...")
+        self.search_entry.set_tooltip_text("Không thấy kết quả chính xác sẽ gợi ý từ gần đúng; "
+                                           "'từ*' tìm theo tiền tố, '~từ' luôn tìm gần đúng")
         self.search_entry.connect("activate", self._on_search_vocabulary)
         vbox.pack_start(search_label, False, False, 0)
         vbox.pack_start(self.search_entry, False, False, 0)
@@ -648,17 +708,20 @@ class MainWindow:
                 antonyms = self.quick_antonyms_entry.get_text().strip()
         
         # Thêm từ vựng vào database với tất cả các trường
-        success = self.vocab_manager.add_vocabulary(
+        self.db_executor.submit_write(
+            self.vocab_manager.add_vocabulary,
             word, definition, example, pronunciation, part_of_speech,
-            context_sentences, synonyms, antonyms
+            context_sentences, synonyms, antonyms,
+            callback=lambda success: self._on_quick_add_done(word, success)
         )
-        
+    
+    def _on_quick_add_done(self, word, success):
+        """Kết quả thêm từ vựng nhanh (chạy trên main loop)"""
         if success:
             self._update_status(f"✅ Đã thêm từ '{word}' thành công!", "success")
             # Clear form sau khi thêm thành công
             self._clear_quick_form()
-            # Refresh danh sách từ vựng để hiển thị realtime
-            self.refresh_vocabulary_list()
+            # Danh sách được cập nhật qua sự kiện 'added' của vocab_manager
             # Focus vào word entry để tiếp tục thêm
             if self.word_entry:
                 self.word_entry.grab_focus()
@@ -666,6 +729,129 @@ class MainWindow:
         else:
             self._update_status(f"❌ Từ '{word}' đã tồn tại hoặc có lỗi!", "error")
     
+    def _load_word_index(self):
+        """Nạp (lại) chỉ mục tiền tố trên thread đọc"""
+        self._word_index_loading = True
+        self._word_index_stale = False
+        self.db_executor.submit_read(self._build_word_index, callback=self._on_word_index_loaded)
+    
+    def _build_word_index(self):
+        """Đọc và sắp xếp toàn bộ từ ngoài main loop"""
+        word_index = PrefixIndex()
+        word_index.load(self.vocab_manager.get_word_keys())
+        return word_index
+    
+    def _on_word_index_loaded(self, word_index):
+        self.word_index = word_index
+        self._word_index_loading = False
+        if self._word_index_stale:
+            # Có thay đổi trong lúc nạp, bản vừa đọc có thể đã cũ
+            self._load_word_index()
+        log_message(f"Đã nạp chỉ mục gợi ý: {len(self.word_index)} từ")
+    
+    def _on_words_changed(self, event):
+        """Cập nhật chỉ mục tiền tố theo từng hàng thay đổi"""
+        if event.kind == DECK_CHANGED:
+            # Chỉ mục chỉ chứa từ của bộ từ hiện tại
+            if self._word_index_loading:
+                self._word_index_stale = True
+            else:
+                self._load_word_index()
+        elif self._word_index_loading:
+            self._word_index_stale = True
+        elif event.kind == DELETED:
+            self.word_index.remove(event.ids)
+        else:
+            self.db_executor.submit_read(
+                self.vocab_manager.get_many, event.ids,
+                callback=lambda vocabularies: self.word_index.update(
+                    (vocab['id'], vocab['word']) for vocab in vocabularies)
+            )
+    
+    def _load_decks(self):
+        """Nạp danh sách bộ từ (kèm số từ) vào combo trên thread đọc"""
+        self.db_executor.submit_read(self.vocab_manager.get_deck_stats, callback=self._populate_decks)
+    
+    def _populate_decks(self, decks):
+        """Điền combo bộ từ, chọn bộ từ hiện tại mà không phát lại 'changed'"""
+        if not self.deck_combo:
+            return
+        self.deck_combo.handler_block(self._deck_handler_id)
+        self.deck_combo.remove_all()
+        self._deck_ids = []
+        for deck in decks:
+            self.deck_combo.append_text(f"{deck['name']} ({deck['total_words']})")
+            self._deck_ids.append(deck['id'])
+        if self.vocab_manager.deck_id in self._deck_ids:
+            self.deck_combo.set_active(self._deck_ids.index(self.vocab_manager.deck_id))
+        self.deck_combo.handler_unblock(self._deck_handler_id)
+    
+    def _on_deck_changed(self, combo):
+        """Chuyển bộ từ: các view nạp lại khi nhận sự kiện DECK_CHANGED"""
+        index = combo.get_active()
+        if index < 0 or index >= len(self._deck_ids):
+            return
+        deck_id = self._deck_ids[index]
+        
+        def on_done(switched):
+            if switched:
+                config_manager.set_vocabulary_setting('current_deck', deck_id)
+            else:
+                self._load_decks()
+        
+        self.db_executor.submit_write(self._set_deck, deck_id, callback=on_done)
+    
+    def _set_deck(self, deck_id):
+        """Ghi nốt write buffer rồi chuyển bộ từ (chạy trên thread ghi)"""
+        # Các thao tác đang chờ phải được ghi trước khi bộ từ hiện tại đổi
+        if self.write_buffer:
+            self.write_buffer.flush()
+        return self.vocab_manager.set_deck(deck_id)
+    
+    def _on_new_deck_clicked(self, widget):
+        """Hỏi tên rồi tạo bộ từ mới và chuyển sang bộ từ đó"""
+        dialog = Gtk.Dialog(title="Tạo bộ từ mới", transient_for=self.window, modal=True)
+        dialog.add_buttons(Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL,
+                           Gtk.STOCK_OK, Gtk.ResponseType.OK)
+        dialog.set_default_response(Gtk.ResponseType.OK)
+        entry = Gtk.Entry()
+        entry.set_placeholder_text("Tên bộ từ (VD: IELTS)")
+        entry.set_activates_default(True)
+        dialog.get_content_area().pack_start(entry, False, False, 10)
+        dialog.show_all()
+        response = dialog.run()
+        name = entry.get_text().strip()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or not name:
+            return
+        
+        def on_created(deck_id):
+            if deck_id is None:
+                self._update_status(f"❌ Bộ từ '{GLib.markup_escape_text(name)}' đã tồn tại!", "error")
+                return
+            
+            def on_switched(switched):
+                if switched:
+                    config_manager.set_vocabulary_setting('current_deck', deck_id)
+                self._load_decks()
+            
+            self.db_executor.submit_write(self._set_deck, deck_id, callback=on_switched)
+        
+        self.db_executor.submit_write(self.vocab_manager.add_deck, name, callback=on_created)
+    
+    def _on_word_entry_changed(self, entry):
+        """Gợi ý từ đã có và cảnh báo trùng ngay khi gõ (không truy vấn SQLite)"""
+        text = entry.get_text()
+        self.word_completion_store.clear()
+        for word in self.word_index.complete(text):
+            self.word_completion_store.append([word])
+        
+        if text.strip() and self.word_index.lookup(text) is not None:
+            entry.set_icon_from_icon_name(Gtk.EntryIconPosition.SECONDARY, "dialog-warning-symbolic")
+            entry.set_icon_tooltip_text(Gtk.EntryIconPosition.SECONDARY, "Từ này đã có trong kho")
+        else:
+            entry.set_icon_from_icon_name(Gtk.EntryIconPosition.SECONDARY, None)
+    
     def _on_clear_quick_form(self, widget):
         """Xóa form thêm nhanh"""
         self._clear_quick_form()
@@ -719,9 +905,25 @@ class MainWindow:
         self.quick_add_status_label.set_markup(markup)
         
         # Tự động xóa thông báo sau 3 giây (trừ khi đang loading)
-        if message and "Đang sinh nghĩa" not in message:
+        if message and "Đang sinh nghĩa" not in message and "Đang sao lưu" not in message:
             GLib.timeout_add_seconds(3, lambda: self._update_status("", ""))
     
+    def show_backup_progress(self, done: int, total: int):
+        """Hiển thị tiến độ sao lưu (gọi trên main loop)"""
+        percent = done * 100 // total
+        if percent != self._backup_percent:
+            self._backup_percent = percent
+            self._update_status(f"💾 Đang sao lưu... {percent}%", "info")
+    
+    def show_backup_result(self, path):
+        """Hiển thị kết quả sao lưu (gọi trên main loop)"""
+        self._backup_percent = None
+        if path:
+            name = GLib.markup_escape_text(os.path.basename(path))
+            self._update_status(f"💾 Đã sao lưu: {name}", "success")
+        else:
+            self._update_status("❌ Sao lưu thất bại, xem log để biết chi tiết", "error")
+    
     def _on_hide_clicked(self, widget):
         """Xử lý khi click nút ẩn"""
         self.hide()
@@ -1167,15 +1369,37 @@ class MainWindow:
             self._show_message("Vui lòng nhập cả từ vựng và nghĩa!", "error")
             return
         
+        # Cập nhật nếu đang chỉnh sửa, ngược lại thêm mới
+        if self.current_editing_id is not None:
+            self._submit_write(
+                'update_vocabulary',
+                self.current_editing_id, word, definition, example, pronunciation,
+                part_of_speech, context_sentences, synonyms, antonyms,
+                callback=lambda success: self._on_vocabulary_updated(word, success)
+            )
+            return
+        
         # Lưu vào database với tất cả các trường
-        success = self.vocab_manager.add_vocabulary(
+        self.db_executor.submit_write(
+            self.vocab_manager.add_vocabulary,
             word, definition, example, pronunciation, part_of_speech,
-            context_sentences, synonyms, antonyms
+            context_sentences, synonyms, antonyms,
+            callback=lambda success: self._on_vocabulary_added(word, success)
         )
+    
+    def _on_vocabulary_updated(self, word, success):
+        """Kết quả cập nhật từ form quản lý đầy đủ"""
+        if success:
+            self._show_message(f"Đã cập nhật từ '{word}' thành công!", "success")
+            self._on_cancel_vocabulary(None)
+        else:
+            self._show_message("Lỗi khi cập nhật từ vựng!", "error")
+    
+    def _on_vocabulary_added(self, word, success):
+        """Kết quả thêm từ form quản lý đầy đủ"""
         if success:
             self._show_message(f"Đã thêm từ '{word}' thành công!", "success")
             self._clear_full_form()
-            self.refresh_vocabulary_list()
         else:
             self._show_message(f"Từ '{word}' đã tồn tại hoặc có lỗi!", "error")
     
@@ -1183,22 +1407,62 @@ class MainWindow:
         """Xử lý hủy chỉnh sửa từ vựng"""
         self._clear_full_form()
         self.current_editing_id = None
+        if self.save_button:
+            self.save_button.set_label("💾 Lưu từ vựng")
     
     def _on_search_vocabulary(self, widget):
         """Xử lý tìm kiếm từ vựng"""
         if not self.search_entry:
             return
-        search_term = self.search_entry.get_text().strip()
-        if search_term:
-            vocabularies = self.vocab_manager.search_vocabulary(search_term)
-        else:
-            vocabularies = self.vocab_manager.get_all_vocabulary()
-        self._populate_vocabulary_list(vocabularies)
+        self.refresh_vocabulary_list()
     
     def _on_vocabulary_row_activated(self, treeview, path, column):
         """Xử lý khi double-click vào hàng trong danh sách từ vựng"""
-        # Hiện tại chỉ làm gì đó đơn giản vì không có get_vocabulary_by_id
-        log_message("Đã click vào hàng từ vựng")
+        model = treeview.get_model()
+        vocab_id = model.get_value(model.get_iter(path), 8)  # ID ở cột cuối
+        self._edit_vocabulary(vocab_id)
+    
+    def _submit_write(self, operation, *args, callback=None):
+        """Gửi một thao tác ghi qua write buffer nếu được bật, ngược lại qua executor"""
+        if self.write_buffer:
+            self.write_buffer.submit(operation, *args, callback=callback)
+        else:
+            self.db_executor.submit_write(getattr(self.vocab_manager, operation), *args, callback=callback)
+    
+    def _edit_vocabulary(self, vocab_id):
+        """Nạp từ vựng vào form quản lý đầy đủ để chỉnh sửa"""
+        self.db_executor.submit_read(
+            self.vocab_manager.get_vocabulary_by_id, vocab_id,
+            callback=lambda vocab: self._fill_edit_form(vocab_id, vocab)
+        )
+    
+    def _fill_edit_form(self, vocab_id, vocab):
+        """Điền form chỉnh sửa khi đã đọc xong từ vựng"""
+        if not vocab:
+            self._show_message("Không tìm thấy từ vựng!", "error")
+            return
+        
+        self.full_word_entry.set_text(vocab['word'] or "")
+        self.definition_textview.get_buffer().set_text(vocab['definition'] or "")
+        self.example_textview.get_buffer().set_text(vocab['example'] or "")
+        self.context_sentences_textview.get_buffer().set_text(vocab['context_sentences'] or "")
+        self.pronunciation_entry.set_text(vocab['pronunciation'] or "")
+        self.synonyms_entry.set_text(vocab['synonyms'] or "")
+        self.antonyms_entry.set_text(vocab['antonyms'] or "")
+        
+        # Chọn loại từ tương ứng trong combo
+        part_of_speech = vocab['part_of_speech'] or ""
+        self.part_of_speech_combo.set_active(0)
+        for i, row in enumerate(self.part_of_speech_combo.get_model()):
+            if row[0] == part_of_speech:
+                self.part_of_speech_combo.set_active(i)
+                break
+        
+        self.current_editing_id = vocab_id
+        if self.save_button:
+            self.save_button.set_label("💾 Cập nhật")
+        self.full_word_entry.grab_focus()
+        log_message(f"Bắt đầu chỉnh sửa từ vựng: {vocab['word']}")
     
     def _on_vocabulary_selection_changed(self, selection):
         """Xử lý khi thay đổi lựa chọn trong danh sách từ vựng"""
@@ -1246,36 +1510,118 @@ class MainWindow:
             self.part_of_speech_combo.set_active(0)
 
     def _populate_vocabulary_list(self, vocabularies):
-        """Điền danh sách từ vựng vào TreeView"""
+        """Điền danh sách từ vựng vào TreeView theo từng lô trong idle
+        
+        `vocabularies` có thể là list hoặc iterator (VD: iter_vocabulary) nên
+        các hàng đầu hiển thị ngay mà không cần đọc hết bảng.
+        """
         if not self.vocabulary_list:
             return
+        
+        # Hủy lần nạp trước nếu vẫn đang chạy
+        if self._populate_source_id:
+            GLib.source_remove(self._populate_source_id)
+            self._populate_source_id = None
             
         # Tạo model cho TreeView với nhiều cột hơn
         store = Gtk.ListStore(str, str, str, str, str, str, str, str, int)  # word, definition, part_of_speech, pronunciation, synonyms, antonyms, context_sentences, example, id
+        self.vocabulary_list.set_model(store)
+        self._vocabulary_store = store
+        self._row_iters = {}
         
-        for vocab in vocabularies:
-            store.append([
-                vocab.get('word', ''),
-                vocab.get('definition', ''),
-                vocab.get('part_of_speech', ''),
-                vocab.get('pronunciation', ''),
-                vocab.get('synonyms', ''),
-                vocab.get('antonyms', ''),
-                vocab.get('context_sentences', ''),
-                vocab.get('example', ''),
-                vocab.get('id', 0)
-            ])
+        iterator = iter(vocabularies)
+        if self._append_vocabulary_batch(store, iterator):
+            self._populate_source_id = GLib.idle_add(self._append_vocabulary_batch, store, iterator)
+    
+    def _append_vocabulary_batch(self, store, iterator):
+        """Thêm một lô hàng vào store, trả về True nếu còn dữ liệu (cho GLib.idle_add)"""
+        for _ in range(self.POPULATE_BATCH_SIZE):
+            vocab = next(iterator, None)
+            if vocab is None:
+                self._populate_source_id = None
+                self._update_vocabulary_count()
+                return False
+            
+            self._row_iters[vocab['id']] = store.append(self._vocabulary_row(vocab))
+        return True
+    
+    def _vocabulary_row(self, vocab):
+        """Giá trị các cột của một hàng trong danh sách từ vựng"""
+        return [
+            vocab.get('word', ''),
+            vocab.get('definition', ''),
+            vocab.get('part_of_speech', ''),
+            vocab.get('pronunciation', ''),
+            vocab.get('synonyms', ''),
+            vocab.get('antonyms', ''),
+            vocab.preview('context_sentences'),
+            vocab.preview('example'),
+            vocab.get('id', 0)
+        ]
+    
+    def _update_vocabulary_count(self):
+        """Cập nhật thống kê"""
+        if self.stats_content and self._vocabulary_store is not None:
+            self.stats_content.set_text(f"Tổng số từ vựng: {len(self._vocabulary_store)}")
+    
+    def _on_vocabulary_changed(self, event):
+        """Sửa đúng các hàng bị ảnh hưởng thay vì nạp lại cả danh sách"""
+        store = self._vocabulary_store
+        if store is None or event.kind == REVIEWED:
+            return
+        if event.kind == DECK_CHANGED:
+            self.refresh_vocabulary_list()
+            self._load_decks()
+            return
         
-        self.vocabulary_list.set_model(store)
+        searching = bool(self.search_entry and self.search_entry.get_text().strip())
+        if self._populate_source_id or (searching and event.kind != DELETED):
+            # Danh sách đang nạp dở chưa có đủ hàng; kết quả tìm kiếm phụ thuộc nội dung
+            self.refresh_vocabulary_list()
+            return
         
-        # Cập nhật thống kê
-        if self.stats_content:
-            self.stats_content.set_text(f"Tổng số từ vựng: {len(vocabularies)}")
+        if event.kind in (ADDED, UPDATED):
+            self.db_executor.submit_read(
+                self.vocab_manager.get_many, event.ids,
+                callback=lambda vocabularies: self._apply_vocabulary_rows(store, event.kind, vocabularies)
+            )
+            return
+        
+        for vocab_id in event.ids:
+            tree_iter = self._row_iters.pop(vocab_id, None)
+            if tree_iter is not None:
+                store.remove(tree_iter)
+        self._update_vocabulary_count()
+    
+    def _apply_vocabulary_rows(self, store, kind, vocabularies):
+        """Thêm/sửa các hàng sau khi đọc nền xong"""
+        if store is not self._vocabulary_store:
+            return  # Danh sách đã được nạp lại trong lúc chờ
+        for vocab in vocabularies:
+            if kind == ADDED:
+                # Danh sách sắp xếp mới nhất trước
+                self._row_iters[vocab['id']] = store.prepend(self._vocabulary_row(vocab))
+            else:
+                tree_iter = self._row_iters.get(vocab['id'])
+                if tree_iter is not None:
+                    store[tree_iter] = self._vocabulary_row(vocab)
+        self._update_vocabulary_count()
     
     def refresh_vocabulary_list(self):
-        """Làm mới danh sách từ vựng"""
-        vocabularies = self.vocab_manager.get_all_vocabulary()
-        self._populate_vocabulary_list(vocabularies)
+        """Làm mới danh sách từ vựng (đọc nền, điền vào danh sách khi xong)"""
+        search_term = self.search_entry.get_text().strip() if self.search_entry else ""
+        self._list_request += 1
+        request = self._list_request
+        
+        def on_loaded(vocabularies):
+            if request == self._list_request:
+                self._populate_vocabulary_list(vocabularies)
+        
+        if search_term:
+            self.db_executor.submit_read(self.vocab_manager.search_vocabulary, search_term, True,
+                                         callback=on_loaded)
+        else:
+            self.db_executor.submit_read(self.vocab_manager.get_all_vocabulary, callback=on_loaded)
         return False  # For GLib.idle_add
     
     def _show_message(self, message, message_type="info"):
@@ -8,6 +8,8 @@ from gi.repository import Gtk, Gdk, GObject
 from typing import Optional
 
 from ..core.config_manager import config_manager
+from ..core.db_executor import get_database_executor
+from ..core.vocabulary_manager import get_vocabulary_manager
 from ..utils.helpers import log_message
 from ..utils.ai_helper import ai_helper
 
@@ -25,6 +27,7 @@ class SettingsWindow:
         self.show_context_check = None
         self.show_synonyms_check = None
         self.show_antonyms_check = None
+        self.compress_text_check = None
         self.setup_ui()
         self.load_settings()
     
@@ -221,6 +224,22 @@ class SettingsWindow:
         display_frame.add(display_vbox)
         vbox.pack_start(display_frame, False, False, 0)
         
+        # Storage settings
+        storage_frame = Gtk.Frame(label="💾 Lưu trữ")
+        storage_vbox = Gtk.VBox(spacing=10)
+        storage_vbox.set_margin_left(15)
+        storage_vbox.set_margin_right(15)
+        storage_vbox.set_margin_top(15)
+        storage_vbox.set_margin_bottom(15)
+        
+        self.compress_text_check = Gtk.CheckButton(label="Nén định nghĩa, ví dụ và ngữ cảnh khi lưu")
+        self.compress_text_check.set_tooltip_text(
+            "Áp dụng cho từ thêm/sửa từ nay; nén từ đã có bằng lệnh: hello-world-vocab compress")
+        storage_vbox.pack_start(self.compress_text_check, False, False, 0)
+        
+        storage_frame.add(storage_vbox)
+        vbox.pack_start(storage_frame, False, False, 0)
+        
         return vbox
     
     def _create_button_box(self) -> Gtk.Widget:
@@ -282,6 +301,7 @@ class SettingsWindow:
         self.show_context_check.set_active(config_manager.get_vocabulary_setting('show_context', True))
         self.show_synonyms_check.set_active(config_manager.get_vocabulary_setting('show_synonyms', True))
         self.show_antonyms_check.set_active(config_manager.get_vocabulary_setting('show_antonyms', True))
+        self.compress_text_check.set_active(config_manager.get_vocabulary_setting('compress_text', False))
     
     def _on_toggle_api_key_visibility(self, entry, icon_pos, event):
         """Toggle hiển thị/ẩn API key"""
@@ -363,6 +383,15 @@ class SettingsWindow:
             config_manager.set_vocabulary_setting('show_context', self.show_context_check.get_active())
             config_manager.set_vocabulary_setting('show_synonyms', self.show_synonyms_check.get_active())
             config_manager.set_vocabulary_setting('show_antonyms', self.show_antonyms_check.get_active())
+            compress_text = self.compress_text_check.get_active()
+            config_manager.set_vocabulary_setting('compress_text', compress_text)
+            # Bật nén cài lại trigger FTS nên chạy trên thread ghi như mọi lệnh ghi khác
+            vocab_manager = get_vocabulary_manager()
+            
+            def apply_compression():
+                vocab_manager.text_compression = compress_text
+            
+            get_database_executor(vocab_manager).submit_write(apply_compression)
             
             # Reinitialize AI helper
             ai_helper.reinitialize()
@@ -52,6 +52,11 @@ class SystemTray:
         hotkey_info.set_sensitive(False)  # Chỉ để hiển thị thông tin
         menu.append(hotkey_info)
         
+        # Menu item sao lưu database
+        backup_item = Gtk.MenuItem(label="Sao lưu từ vựng")
+        backup_item.connect("activate", self._on_backup_clicked)
+        menu.append(backup_item)
+        
         # Separator
         separator = Gtk.SeparatorMenuItem()
         menu.append(separator)
@@ -68,6 +73,10 @@ class SystemTray:
         """Xử lý khi click menu hiển thị"""
         self.app.show_window()
     
+    def _on_backup_clicked(self, widget):
+        """Xử lý khi click menu sao lưu"""
+        self.app.start_backup()
+    
     def _on_quit_clicked(self, widget):
         """Xử lý khi click menu thoát"""
         self.app.quit()
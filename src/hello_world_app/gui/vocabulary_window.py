@@ -4,22 +4,35 @@ Vocabulary Window - Giao diện quản lý từ vựng
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GObject
+from gi.repository import Gtk, Gdk, GObject, GLib
 from typing import Optional, Dict
 
-from ..core.vocabulary_manager import VocabularyManager
+from ..core.events import ADDED, DECK_CHANGED, DELETED, REVIEWED, UPDATED
+from ..core.db_executor import call_on_main_loop, get_database_executor
+from ..core.tag_index import split_tags
+from ..core.vocabulary_io import export_vocabulary_file
+from ..core.write_buffer import get_write_buffer
+from ..core.vocabulary_manager import get_vocabulary_manager
 from ..utils.helpers import log_message
 from ..utils.ai_helper import ai_helper
 
 class VocabularyWindow:
     """Class quản lý cửa sổ từ vựng"""
     
+    # Số hàng thêm vào danh sách mỗi lần idle
+    POPULATE_BATCH_SIZE = 200
+    
     def __init__(self, parent_window=None):
         self.parent_window = parent_window
-        self.vocab_manager = VocabularyManager()
+        self.vocab_manager = get_vocabulary_manager()
+        # Mọi truy vấn từ GUI chạy nền, kết quả trả về main loop
+        self.db_executor = get_database_executor(self.vocab_manager)
+        # Ôn tập/sửa/xóa liên tiếp được gom thành một commit nếu bật write buffer
+        self.write_buffer = get_write_buffer(self.vocab_manager)
         self.window = None
         self.vocabulary_list = None
         self.search_entry = None
+        self.export_button = None
         self.word_entry = None
         self.definition_textview = None
         self.example_textview = None
@@ -29,8 +42,14 @@ class VocabularyWindow:
         self.synonyms_entry = None
         self.antonyms_entry = None
         self.current_editing_id = None
+        self._populate_source_id = None
+        # id -> Gtk.TreeIter (iter của ListStore ổn định) để sửa từng hàng khi có sự kiện
+        self._row_iters: Dict[int, Gtk.TreeIter] = {}
+        # Tăng mỗi lần yêu cầu nạp danh sách; kết quả của yêu cầu cũ bị bỏ qua
+        self._list_request = 0
         self.setup_ui()
         self.refresh_vocabulary_list()
+        self._events_subscription = self.vocab_manager.events.subscribe(self._on_vocabulary_changed)
     
     def setup_ui(self):
         """Thiết lập giao diện người dùng"""
@@ -91,6 +110,7 @@ class VocabularyWindow:
         vbox.pack_start(self._create_context_sentences_field(), True, True, 0)
         vbox.pack_start(self._create_synonyms_field(), False, False, 0)
         vbox.pack_start(self._create_antonyms_field(), False, False, 0)
+        vbox.pack_start(self._create_tags_field(), False, False, 0)
         
         # Buttons
         button_box = self._create_button_box()
@@ -240,6 +260,20 @@ class VocabularyWindow:
         
         return vbox
 
+    def _create_tags_field(self) -> Gtk.VBox:
+        """Tạo field nhập nhãn"""
+        vbox = Gtk.VBox(spacing=5)
+        
+        label = Gtk.Label("Nhãn")
+        label.set_halign(Gtk.Align.START)
+        vbox.pack_start(label, False, False, 0)
+        
+        self.tags_entry = Gtk.Entry()
+        self.tags_entry.set_placeholder_text("VD: travel, ielts (cách nhau bằng dấu phẩy)")
+        vbox.pack_start(self.tags_entry, False, False, 0)
+        
+        return vbox
+
     def _create_button_box(self) -> Gtk.HBox:
         """Tạo box chứa các nút"""
         hbox = Gtk.HBox(spacing=10)
@@ -326,7 +360,9 @@ class VocabularyWindow:
         search_box.pack_start(search_label, False, False, 0)
         
         self.search_entry = Gtk.Entry()
-        self.search_entry.set_placeholder_text("Tìm kiếm từ vựng...")
+        self.search_entry.set_placeholder_text("Tìm kiếm từ vựng... (hoặc tag:travel AND NOT tag:mastered)")
+        self.search_entry.set_tooltip_text("Không thấy kết quả chính xác sẽ gợi ý từ gần đúng; "
+                                           "'từ*' tìm theo tiền tố, '~từ' luôn tìm gần đúng")
         self.search_entry.connect("changed", self._on_search_changed)
         search_box.pack_start(self.search_entry, True, True, 0)
         
@@ -335,6 +371,11 @@ class VocabularyWindow:
         refresh_button.connect("clicked", self._on_refresh_clicked)
         search_box.pack_start(refresh_button, False, False, 0)
         
+        self.export_button = Gtk.Button(label="📤")
+        self.export_button.set_tooltip_text("Xuất từ vựng (CSV, TSV, JSONL, Anki)")
+        self.export_button.connect("clicked", self._on_export_clicked)
+        search_box.pack_start(self.export_button, False, False, 0)
+        
         vbox.pack_start(search_box, False, False, 0)
         
         return vbox
@@ -500,6 +541,7 @@ class VocabularyWindow:
         # Lấy synonyms và antonyms
         synonyms = self.synonyms_entry.get_text().strip()
         antonyms = self.antonyms_entry.get_text().strip()
+        tags = split_tags(self.tags_entry.get_text())
         
         # Validation
         if not word or not definition:
@@ -508,31 +550,55 @@ class VocabularyWindow:
         
         # Lưu hoặc cập nhật
         if self.current_editing_id is not None:
-            # Cập nhật
-            success = self.vocab_manager.update_vocabulary(
-                self.current_editing_id, word, definition, example, pronunciation, 
-                part_of_speech, context_sentences, synonyms, antonyms
+            # Cập nhật rồi gắn nhãn trên cùng thread ghi, chỉ khi cập nhật thành công
+            vocab_id = self.current_editing_id
+            
+            def update_with_tags():
+                # Ghi trực tiếp nên các thao tác đang chờ trong write buffer phải ghi trước
+                if self.write_buffer:
+                    self.write_buffer.flush()
+                updated = self.vocab_manager.update_vocabulary(
+                    vocab_id, word, definition, example, pronunciation,
+                    part_of_speech, context_sentences, synonyms, antonyms)
+                if updated:
+                    self.vocab_manager.set_tags(vocab_id, tags)
+                return updated
+            
+            self.db_executor.submit_write(
+                update_with_tags,
+                callback=lambda success: self._on_save_done(word, success, updated=True)
+            )
+        else:
+            # Thêm mới rồi gắn nhãn trên cùng thread ghi
+            def add_with_tags():
+                added = self.vocab_manager.add_vocabulary(
+                    word, definition, example, pronunciation, part_of_speech,
+                    context_sentences, synonyms, antonyms)
+                if added and tags:
+                    vocab = self.vocab_manager.get_by_word(word)
+                    if vocab:
+                        self.vocab_manager.set_tags(vocab['id'], tags)
+                return added
+            
+            self.db_executor.submit_write(
+                add_with_tags,
+                callback=lambda success: self._on_save_done(word, success, updated=False)
             )
+    
+    def _on_save_done(self, word, success, updated):
+        """Kết quả lưu từ vựng (chạy trên main loop)"""
+        if updated:
             if success:
                 self._show_message(f"Đã cập nhật từ '{word}' thành công!", "success")
                 self._cancel_edit_mode()
             else:
                 self._show_message("Lỗi khi cập nhật từ vựng!", "error")
         else:
-            # Thêm mới
-            success = self.vocab_manager.add_vocabulary(
-                word, definition, example, pronunciation, part_of_speech,
-                context_sentences, synonyms, antonyms
-            )
             if success:
                 self._show_message(f"Đã thêm từ '{word}' thành công!", "success")
                 self._clear_form()
             else:
                 self._show_message(f"Từ '{word}' đã tồn tại hoặc có lỗi xảy ra!", "error")
-        
-        if success:
-            self.refresh_vocabulary_list()
-            self._update_stats()
     
     def _on_clear_clicked(self, widget):
         """Xử lý khi click nút Clear"""
@@ -544,13 +610,7 @@ class VocabularyWindow:
     
     def _on_search_changed(self, widget):
         """Xử lý khi thay đổi text tìm kiếm"""
-        search_text = self.search_entry.get_text().strip()
-        if search_text:
-            vocabularies = self.vocab_manager.search_vocabulary(search_text)
-        else:
-            vocabularies = self.vocab_manager.get_all_vocabulary()
-        
-        self._populate_list(vocabularies)
+        self.refresh_vocabulary_list()
     
     def _on_refresh_clicked(self, widget):
         """Xử lý khi click nút refresh"""
@@ -596,6 +656,11 @@ class VocabularyWindow:
         reviewed_item.connect("activate", lambda x: self._mark_reviewed_from_path(path))
         menu.append(reviewed_item)
         
+        # Menu Related words
+        related_item = Gtk.MenuItem(label="🔗 Từ liên quan")
+        related_item.connect("activate", lambda x: self._show_related_from_path(path))
+        menu.append(related_item)
+        
         menu.show_all()
         menu.popup(None, None, None, None, event.button, event.time)
     
@@ -606,6 +671,33 @@ class VocabularyWindow:
         vocab_id = model.get_value(iter, 9)
         self._edit_vocabulary(vocab_id)
     
+    def _show_related_from_path(self, path):
+        """Hiển thị các từ đồng nghĩa/trái nghĩa quanh từ tại path (2 bước)"""
+        model = self.vocabulary_list.get_model()
+        word = model.get_value(model.get_iter(path), 0)
+        self.db_executor.submit_read(
+            self.vocab_manager.get_word_graph, word, 2,
+            callback=lambda graph: self._show_related(word, graph)
+        )
+    
+    def _show_related(self, word, graph):
+        """Liệt kê đồ thị từ theo khoảng cách"""
+        nodes = graph['nodes'][1:]
+        if not nodes:
+            self._show_message(f"Từ '{word}' chưa có từ đồng nghĩa hay trái nghĩa nào.")
+            return
+        root = graph['nodes'][0]['key']
+        # Trái nghĩa trực tiếp của từ gốc, theo chiều nào cũng được
+        antonyms = {source if target == root else target
+                    for source, relation, target in graph['edges']
+                    if relation == 'antonym' and root in (source, target)}
+        lines = []
+        for node in nodes:
+            marker = "≠" if node['depth'] == 1 and node['key'] in antonyms else "≈"
+            owned = "" if node['vocab_id'] is None else " ★"
+            lines.append(f"{'  ' * (node['depth'] - 1)}{marker} {node['word']}{owned}")
+        self._show_message(f"Từ liên quan đến '{word}' (★ = đã có trong kho):\n\n" + "\n".join(lines))
+    
     def _delete_vocabulary_from_path(self, path):
         """Xóa từ vựng từ path"""
         try:
@@ -636,16 +728,10 @@ class VocabularyWindow:
             if response == Gtk.ResponseType.YES:
                 log_message(f"User confirmed deletion of vocab ID: {vocab_id}")
                 
-                delete_result = self.vocab_manager.delete_vocabulary(vocab_id)
-                log_message(f"Delete operation result: {delete_result}")
-                
-                if delete_result:
-                    self.refresh_vocabulary_list()
-                    self._update_stats()
-                    log_message(f"Successfully deleted vocabulary: {word}")
-                else:
-                    self._show_message("Lỗi khi xóa từ vựng!", "error")
-                    log_message(f"Failed to delete vocabulary: {word}")
+                self._submit_write(
+                    'delete_vocabulary', vocab_id,
+                    callback=lambda delete_result: self._on_delete_done(word, delete_result)
+                )
             else:
                 log_message("User cancelled deletion")
             
@@ -655,6 +741,15 @@ class VocabularyWindow:
             log_message(f"ERROR in _delete_vocabulary_from_path: {e}")
             self._show_message(f"Lỗi xóa từ vựng: {str(e)}", "error")
     
+    def _on_delete_done(self, word, delete_result):
+        """Kết quả xóa từ vựng (chạy trên main loop)"""
+        log_message(f"Delete operation result: {delete_result}")
+        if delete_result:
+            log_message(f"Successfully deleted vocabulary: {word}")
+        else:
+            self._show_message("Lỗi khi xóa từ vựng!", "error")
+            log_message(f"Failed to delete vocabulary: {word}")
+    
     def _mark_reviewed_from_path(self, path):
         """Đánh dấu đã ôn từ path"""
         model = self.vocabulary_list.get_model()
@@ -662,18 +757,35 @@ class VocabularyWindow:
         vocab_id = model.get_value(iter, 9)
         word = model.get_value(iter, 0)
         
-        if self.vocab_manager.mark_as_reviewed(vocab_id):
-            self._show_message(f"Đã đánh dấu ôn tập từ '{word}'!", "success")
-            self._update_stats()
+        def on_done(success):
+            if success:
+                self._show_message(f"Đã đánh dấu ôn tập từ '{word}'!", "success")
+            else:
+                self._show_message("Lỗi khi đánh dấu ôn tập!", "error")
+        
+        self._submit_write('mark_as_reviewed', vocab_id, callback=on_done)
+    
+    def _submit_write(self, operation, *args, callback=None):
+        """Gửi một thao tác ghi qua write buffer nếu được bật, ngược lại qua executor"""
+        if self.write_buffer:
+            self.write_buffer.submit(operation, *args, callback=callback)
         else:
-            self._show_message("Lỗi khi đánh dấu ôn tập!", "error")
+            self.db_executor.submit_write(getattr(self.vocab_manager, operation), *args, callback=callback)
     
     def _edit_vocabulary(self, vocab_id):
         """Chỉnh sửa từ vựng"""
         # Lấy thông tin từ vựng
-        vocabularies = self.vocab_manager.get_all_vocabulary()
-        vocab = next((v for v in vocabularies if v['id'] == vocab_id), None)
-        
+        self.db_executor.submit_read(
+            self.vocab_manager.get_vocabulary_by_id, vocab_id,
+            callback=lambda vocab: self._fill_edit_form(vocab_id, vocab)
+        )
+        self.db_executor.submit_read(
+            self.vocab_manager.get_tags, vocab_id,
+            callback=lambda tags: self.tags_entry.set_text(", ".join(tags))
+        )
+    
+    def _fill_edit_form(self, vocab_id, vocab):
+        """Điền form chỉnh sửa khi đã đọc xong từ vựng"""
         if not vocab:
             self._show_message("Không tìm thấy từ vựng!", "error")
             return
@@ -738,6 +850,7 @@ class VocabularyWindow:
         # Clear entries
         self.synonyms_entry.set_text("")
         self.antonyms_entry.set_text("")
+        self.tags_entry.set_text("")
         
         # Focus vào word entry
         self.word_entry.grab_focus()
@@ -749,53 +862,121 @@ class VocabularyWindow:
         self.cancel_edit_button.show()
     
     def _populate_list(self, vocabularies):
-        """Điền dữ liệu vào danh sách"""
+        """Điền dữ liệu vào danh sách theo từng lô trong idle
+        
+        `vocabularies` có thể là list hoặc iterator (VD: iter_vocabulary).
+        """
+        # Hủy lần nạp trước nếu vẫn đang chạy
+        if self._populate_source_id:
+            GLib.source_remove(self._populate_source_id)
+            self._populate_source_id = None
+        
         self.list_store.clear()
+        self._row_iters.clear()
         
-        for vocab in vocabularies:
-            # Format ngày tạo
-            created_at = vocab['created_at'][:10] if vocab['created_at'] else ""
+        iterator = iter(vocabularies)
+        if self._append_list_batch(iterator):
+            self._populate_source_id = GLib.idle_add(self._append_list_batch, iterator)
+    
+    def _append_list_batch(self, iterator):
+        """Thêm một lô hàng vào list_store, trả về True nếu còn dữ liệu (cho GLib.idle_add)"""
+        for _ in range(self.POPULATE_BATCH_SIZE):
+            vocab = next(iterator, None)
+            if vocab is None:
+                self._populate_source_id = None
+                log_message(f"Populated list with {len(self.list_store)} vocabularies")
+                return False
             
-            # Validate vocab ID
-            vocab_id = vocab.get('id')
-            if vocab_id is None:
-                log_message(f"WARNING: Missing ID for vocabulary: {vocab.get('word', 'unknown')}")
-                continue
-                
-            try:
-                vocab_id = int(vocab_id)
-            except (ValueError, TypeError):
-                log_message(f"ERROR: Invalid ID type for vocabulary {vocab.get('word', 'unknown')}: {vocab_id} (type: {type(vocab_id)})")
-                continue
+            row = self._vocabulary_row(vocab)
+            if row is not None:
+                self._row_iters[row[-1]] = self.list_store.append(row)
+        return True
+    
+    def _vocabulary_row(self, vocab):
+        """Giá trị các cột của một hàng trong list_store, None nếu ID không hợp lệ"""
+        # Format ngày tạo
+        created_at = vocab['created_at'][:10] if vocab['created_at'] else ""
+        
+        # Validate vocab ID
+        vocab_id = vocab.get('id')
+        if vocab_id is None:
+            log_message(f"WARNING: Missing ID for vocabulary: {vocab.get('word', 'unknown')}")
+            return None
             
-            if vocab_id <= 0:
-                log_message(f"ERROR: Invalid ID value for vocabulary {vocab.get('word', 'unknown')}: {vocab_id}")
+        try:
+            vocab_id = int(vocab_id)
+        except (ValueError, TypeError):
+            log_message(f"ERROR: Invalid ID type for vocabulary {vocab.get('word', 'unknown')}: {vocab_id} (type: {type(vocab_id)})")
+            return None
+        
+        if vocab_id <= 0:
+            log_message(f"ERROR: Invalid ID value for vocabulary {vocab.get('word', 'unknown')}: {vocab_id}")
+            return None
+        
+        return [
+            vocab['word'] or "",
+            vocab['pronunciation'] or "",
+            vocab['part_of_speech'] or "",
+            # Chỉ lấy đoạn đầu để không nạp toàn bộ văn bản dài
+            vocab.preview('definition'),
+            vocab.preview('example'),
+            vocab.preview('context_sentences'),
+            vocab.preview('synonyms'),
+            vocab.preview('antonyms'),
+            created_at,
+            vocab_id  # Cột ẩn chứa ID (đã validate)
+        ]
+    
+    def _on_vocabulary_changed(self, event):
+        """Sửa đúng các hàng bị ảnh hưởng thay vì nạp lại cả danh sách"""
+        if not self.window:
+            return
+        
+        searching = bool(self.search_entry and self.search_entry.get_text().strip())
+        if event.kind == REVIEWED:
+            pass  # Danh sách không hiển thị trạng thái ôn tập
+        elif event.kind == DECK_CHANGED or self._populate_source_id or (searching and event.kind != DELETED):
+            # Danh sách đang nạp dở chưa có đủ hàng; kết quả tìm kiếm phụ thuộc nội dung
+            self.refresh_vocabulary_list()
+        elif event.kind in (ADDED, UPDATED):
+            request = self._list_request
+            self.db_executor.submit_read(
+                self.vocab_manager.get_many, event.ids,
+                callback=lambda vocabularies: self._apply_vocabulary_rows(request, event.kind, vocabularies)
+            )
+        elif event.kind == DELETED:
+            for vocab_id in event.ids:
+                tree_iter = self._row_iters.pop(vocab_id, None)
+                if tree_iter is not None:
+                    self.list_store.remove(tree_iter)
+        
+        self._update_stats()
+    
+    def _apply_vocabulary_rows(self, request, kind, vocabularies):
+        """Thêm/sửa các hàng sau khi đọc nền xong"""
+        if request != self._list_request:
+            return  # Danh sách đã được nạp lại trong lúc chờ
+        for vocab in vocabularies:
+            row = self._vocabulary_row(vocab)
+            if row is None:
                 continue
-            
-            # Truncate long text for display
-            def truncate_text(text, max_length=50):
-                if not text:
-                    return ""
-                return text[:max_length] + "..." if len(text) > max_length else text
-            
-            self.list_store.append([
-                vocab['word'] or "",
-                vocab['pronunciation'] or "",
-                vocab['part_of_speech'] or "",
-                truncate_text(vocab['definition'] or ""),
-                truncate_text(vocab['example'] or ""),
-                truncate_text(vocab['context_sentences'] or ""),
-                truncate_text(vocab['synonyms'] or ""),
-                truncate_text(vocab['antonyms'] or ""),
-                created_at,
-                vocab_id  # Cột ẩn chứa ID (đã validate)
-            ])
-            
-        log_message(f"Populated list with {len(vocabularies)} vocabularies")
+            if kind == ADDED:
+                # Danh sách sắp xếp mới nhất trước
+                self._row_iters[row[-1]] = self.list_store.prepend(row)
+            else:
+                tree_iter = self._row_iters.get(row[-1])
+                if tree_iter is not None:
+                    self.list_store[tree_iter] = row
     
     def _update_stats(self):
-        """Cập nhật thống kê"""
-        stats = self.vocab_manager.get_vocabulary_stats()
+        """Cập nhật thống kê (đọc nền)"""
+        self.db_executor.submit_read(self.vocab_manager.get_vocabulary_stats,
+                                     callback=self._show_stats)
+    
+    def _show_stats(self, stats):
+        """Hiển thị thống kê đã đọc"""
+        if not self.window:
+            return
         stats_text = f"""📊 Tổng số từ: {stats['total_words']}
 ✅ Đã ôn tập: {stats['reviewed_words']}
 🆕 Hôm nay: {stats['today_words']}
@@ -803,6 +984,53 @@ class VocabularyWindow:
         
         self.stats_content.set_markup(f'<span size="small">{stats_text}</span>')
     
+    def _on_export_clicked(self, widget):
+        """Chọn file rồi xuất toàn bộ từ vựng trên thread nền"""
+        dialog = Gtk.FileChooserDialog(
+            title="Xuất từ vựng",
+            transient_for=self.window,
+            action=Gtk.FileChooserAction.SAVE
+        )
+        dialog.add_buttons(Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL,
+                           Gtk.STOCK_SAVE, Gtk.ResponseType.OK)
+        dialog.set_do_overwrite_confirmation(True)
+        dialog.set_current_name("vocabulary.csv")
+        for name, pattern in (("CSV (*.csv)", "*.csv"), ("TSV (*.tsv)", "*.tsv"),
+                              ("JSON Lines (*.jsonl)", "*.jsonl"), ("Anki (*.txt)", "*.txt")):
+            file_filter = Gtk.FileFilter()
+            file_filter.set_name(name)
+            file_filter.add_pattern(pattern)
+            dialog.add_filter(file_filter)
+        
+        response = dialog.run()
+        path = dialog.get_filename()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or not path:
+            return
+        
+        def on_progress(done, total):
+            # Gọi từ thread đọc
+            call_on_main_loop(self._show_export_progress, done, total)
+        
+        def on_done(written):
+            self.export_button.set_label("📤")
+            self.export_button.set_sensitive(True)
+            self._show_message(f"Đã xuất {written} từ vựng ra {path}", "success")
+        
+        def on_error(error):
+            self.export_button.set_label("📤")
+            self.export_button.set_sensitive(True)
+            self._show_message(f"Lỗi xuất từ vựng: {error}", "error")
+        
+        self.export_button.set_sensitive(False)
+        self.db_executor.submit_read(export_vocabulary_file, self.vocab_manager, path,
+                                     None, 1000, on_progress,
+                                     callback=on_done, error_callback=on_error)
+    
+    def _show_export_progress(self, done, total):
+        if self.export_button and total:
+            self.export_button.set_label(f"📤 {done * 100 // total}%")
+    
     def _show_message(self, message, message_type="info"):
         """Hiển thị thông báo"""
         if message_type == "error":
@@ -861,15 +1089,20 @@ class VocabularyWindow:
         log_message("Refreshing vocabulary list...")
         search_text = self.search_entry.get_text().strip() if self.search_entry else ""
         
+        self._list_request += 1
+        request = self._list_request
+        
+        def on_loaded(vocabularies):
+            if request == self._list_request and self.window:
+                self._populate_list(vocabularies)
+        
         if search_text:
             log_message(f"Searching vocabularies with term: '{search_text}'")
-            vocabularies = self.vocab_manager.search_vocabulary(search_text)
+            self.db_executor.submit_read(self.vocab_manager.search_vocabulary, search_text, True,
+                                         callback=on_loaded)
         else:
-            log_message("Getting all vocabularies")
-            vocabularies = self.vocab_manager.get_all_vocabulary()
-        
-        log_message(f"Retrieved {len(vocabularies)} vocabularies from database")
-        self._populate_list(vocabularies)
+            log_message("Loading all vocabularies")
+            self.db_executor.submit_read(self.vocab_manager.get_all_vocabulary, callback=on_loaded)
     
     def show(self):
         """Hiển thị cửa sổ"""
@@ -885,5 +1118,8 @@ class VocabularyWindow:
     
     def destroy(self):
         """Hủy cửa sổ"""
+        self.vocab_manager.events.unsubscribe(self._events_subscription)
         if self.window:
-            self.window.destroy() 
\ No newline at end of file
+            self.window.destroy()
+            self.window = None
+        # vocab_manager dùng chung với cửa sổ chính, được đóng khi ứng dụng thoát
@@ -0,0 +1,42 @@
+"""
+Fixture dùng chung cho các test
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.events import EventBus
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'sync_events: fixture `manager` giao sự kiện đồng bộ')
+
+
+def dispatch_now(callback, event):
+    """Giao sự kiện ngay trên thread phát thay vì qua main loop GTK"""
+    callback(event)
+
+
+@pytest.fixture
+def manager_options():
+    """Tham số thêm cho VocabularyManager của fixture `manager` (module ghi đè khi cần)"""
+    return {}
+
+
+@pytest.fixture
+def manager(request, tmp_path, manager_options):
+    """VocabularyManager dùng database tạm
+
+    Module cần dữ liệu sẵn thì mở rộng bằng một fixture `manager(manager)` riêng;
+    đánh dấu `sync_events` để nhận sự kiện ngay khi phát.
+    """
+    options = dict(manager_options)
+    if request.node.get_closest_marker('sync_events'):
+        options['events'] = EventBus(dispatcher=dispatch_now)
+    vocab_manager = VocabularyManager(str(tmp_path / 'vocabulary.db'), **options)
+    yield vocab_manager
+    vocab_manager.close()
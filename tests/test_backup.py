@@ -0,0 +1,85 @@
+"""
+Test cases cho BackupService
+"""
+
+import os
+import pytest
+import sqlite3
+import sys
+import threading
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.backup import BackupService
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có đủ từ để sao lưu qua nhiều bước"""
+    manager.add_vocabulary_many([{'word': f"w{i}", 'definition': "nghĩa " * 20}
+                                 for i in range(2000)])
+    return manager
+
+
+def count_words(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM vocabulary').fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestBackupService:
+    """Test cases cho sao lưu trực tuyến"""
+
+    def test_backup_while_writing(self, manager, tmp_path):
+        """Sao lưu từng bước trong khi vẫn ghi được, bản sao nhất quán"""
+        service = BackupService(manager.db_path, keep=3, pages=4, pause_ms=1)
+        progress = []
+        written = []
+
+        def step(done, total):
+            progress.append((done, total))
+            # Ghi giữa các bước không bị chặn
+            if len(written) < 3:
+                written.append(manager.add_vocabulary(f"extra{len(progress)}", "thêm"))
+
+        path = service.backup_now(progress=step)
+
+        assert path and os.path.dirname(path) == str(tmp_path / 'backups')
+        assert all(written) and len(progress) > 3
+        assert progress[-1][0] == progress[-1][1]
+        assert count_words(path) in range(2000, 2004)
+        assert not [name for name in os.listdir(service.backup_dir) if name.endswith('.part')]
+
+    def test_rotation(self, manager, tmp_path):
+        """Chỉ giữ lại `keep` bản mới nhất"""
+        service = BackupService(manager.db_path, backup_dir=str(tmp_path / 'b'), keep=2)
+        paths = [service.backup_now() for _ in range(4)]
+
+        assert service.list_backups() == paths[:1:-1]
+        assert not service.is_due(1)
+
+    def test_background_cancel(self, manager):
+        """Sao lưu nền chỉ chạy một bản; hủy thì không để lại file"""
+        service = BackupService(manager.db_path, pages=1, pause_ms=20)
+        results = []
+        finished = threading.Event()
+
+        def on_done(path):
+            results.append(path)
+            finished.set()
+
+        assert service.start(callback=on_done)
+        assert not service.start()
+        service.cancel(timeout=5)
+
+        assert finished.wait(timeout=5)
+        assert results == [None] and not service.running
+        assert os.listdir(service.backup_dir) == []
+        assert service.is_due(24)
+
+    def test_invalid_settings(self, manager):
+        with pytest.raises(ValueError):
+            BackupService(manager.db_path, keep=0)
@@ -0,0 +1,82 @@
+"""
+Test cases cho DatabaseExecutor
+"""
+
+import pytest
+import sys
+import threading
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.db_executor import DatabaseExecutor
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có vài từ"""
+    for word in ("alpha", "beta", "gamma"):
+        manager.add_vocabulary(word, f"nghĩa của {word}")
+    return manager
+
+
+@pytest.fixture
+def executor(manager):
+    db_executor = DatabaseExecutor(manager)
+    yield db_executor
+    db_executor.shutdown()
+
+
+class TestDatabaseExecutor:
+    """Test cases cho thread ghi/nhóm thread đọc"""
+
+    def test_read_results_unchanged(self, manager, executor):
+        """Kết quả đọc nền giống hệt gọi trực tiếp"""
+        future = executor.submit_read(manager.search_vocabulary, "alp")
+        assert future.result(timeout=5) == manager.search_vocabulary("alp")
+        assert executor.submit_read(manager.get_vocabulary_stats).result(timeout=5)['total_words'] == 3
+
+    def test_writes_run_on_single_thread(self, manager, executor):
+        """Mọi lệnh ghi chạy tuần tự trên cùng một thread"""
+        threads = set()
+
+        def add(word):
+            threads.add(threading.current_thread().name)
+            return manager.add_vocabulary(word, "x")
+
+        futures = [executor.submit_write(add, f"w{i}") for i in range(20)]
+        assert all(future.result(timeout=5) for future in futures)
+        assert len(threads) == 1
+        assert threading.current_thread().name not in threads
+        assert manager.get_vocabulary_stats()['total_words'] == 23
+
+    def test_callbacks_and_metrics(self, manager, executor):
+        """callback nhận kết quả, error_callback nhận lỗi, số liệu được cập nhật"""
+        results, errors = [], []
+        read_done, write_done = threading.Event(), threading.Event()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        executor.submit_read(manager.get_by_word, "beta",
+                             callback=lambda vocab: (results.append(vocab), read_done.set()))
+        future = executor.submit_write(fail, error_callback=lambda e: (errors.append(e), write_done.set()))
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        assert read_done.wait(5) and write_done.wait(5)
+
+        assert results[0]['word'] == "beta"
+        assert isinstance(errors[0], RuntimeError)
+        metrics = executor.metrics()
+        assert metrics['read']['completed'] == 1
+        assert metrics['write']['failed'] == 1
+        assert metrics['read']['pending'] == metrics['write']['pending'] == 0
+        assert metrics['read']['max_wait_ms'] >= 0
+
+    def test_shutdown_waits_for_writes(self, manager):
+        """shutdown chờ các lệnh ghi đã xếp hàng"""
+        db_executor = DatabaseExecutor(manager)
+        for i in range(50):
+            db_executor.submit_write(manager.add_vocabulary, f"queued{i}", "x")
+        db_executor.shutdown()
+        assert manager.get_vocabulary_stats()['total_words'] == 53
@@ -0,0 +1,90 @@
+"""
+Test cases cho bộ từ (deck)
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+from hello_world_app.core.events import DECK_CHANGED, DELETED
+from hello_world_app.core.migrations import DEFAULT_DECK_ID
+
+
+pytestmark = pytest.mark.sync_events
+
+
+class TestDecks:
+    """Test cases cho phạm vi truy vấn theo bộ từ"""
+
+    def test_queries_are_scoped_to_current_deck(self, manager):
+        """Danh sách, tìm kiếm, từ đến hạn và thống kê chỉ thấy bộ từ hiện tại"""
+        manager.add_vocabulary("alpha", "a")
+        ielts = manager.add_deck("IELTS")
+        assert manager.set_deck(ielts)
+        manager.add_vocabulary("albeit", "mặc dù")
+
+        assert [v['word'] for v in manager.get_all_vocabulary()] == ["albeit"]
+        assert [v['word'] for v in manager.search_vocabulary("al")] == ["albeit"]
+        assert [v['word'] for v in manager.get_due()] == ["albeit"]
+        assert manager.get_vocabulary_stats()['total_words'] == 1
+
+        assert manager.set_deck(DEFAULT_DECK_ID)
+        assert [v['word'] for v in manager.get_all_vocabulary()] == ["alpha"]
+        # Tra theo từ vẫn thấy mọi bộ từ vì từ là duy nhất trên toàn kho
+        assert manager.get_by_word("albeit")['deck_id'] == ielts
+
+    def test_deck_stats_and_move(self, manager):
+        """Bộ đếm theo bộ từ được trigger cập nhật khi chuyển từ"""
+        manager.add_vocabulary_many([{'word': f"w{i}", 'definition': "d"} for i in range(3)])
+        manager.mark_as_reviewed(manager.get_by_word("w0")['id'])
+        travel = manager.add_deck("Travel")
+        events = []
+        manager.events.subscribe(events.append)
+
+        moved = manager.move_to_deck([manager.get_by_word("w0")['id'], manager.get_by_word("w1")['id']],
+                                     travel)
+
+        assert moved == 2
+        assert [e.kind for e in events] == [DELETED]
+        stats = {deck['name']: deck for deck in manager.get_deck_stats()}
+        assert (stats["Travel"]['total_words'], stats["Travel"]['reviewed_words']) == (2, 1)
+        assert stats["Mặc định"]['total_words'] == 1
+        assert stats["Travel"]['due_words'] == 1
+        assert manager.get_vocabulary_stats()['total_words'] == 1
+
+    def test_set_and_delete_deck_rules(self, manager):
+        """Không chuyển tới bộ từ không tồn tại; chỉ xóa được bộ từ rỗng khác bộ từ đang dùng"""
+        events = []
+        manager.events.subscribe(events.append, kinds=(DECK_CHANGED,))
+        assert not manager.set_deck(999)
+        assert manager.add_deck("mặc định") is None
+
+        empty = manager.add_deck("Empty")
+        full = manager.add_deck("Full")
+        manager.set_deck(full)
+        manager.add_vocabulary("run", "chạy")
+        assert len(events) == 1
+
+        assert not manager.delete_deck(DEFAULT_DECK_ID)
+        assert not manager.delete_deck(full)
+        manager.set_deck(DEFAULT_DECK_ID)
+        assert not manager.delete_deck(full)
+        assert manager.delete_deck(empty)
+        assert manager.get_deck_id("empty") is None
+
+    def test_cli_deck_option(self, tmp_path):
+        """--deck tạo bộ từ khi import và giới hạn export theo bộ từ"""
+        db_path = str(tmp_path / 'cli.db')
+        source = tmp_path / 'in.tsv'
+        source.write_text("run\tchạy\n", encoding='utf-8')
+        target = tmp_path / 'out.tsv'
+
+        assert cli.main(['--db', db_path, '--deck', "IELTS", 'import', str(source)]) == 0
+        assert cli.main(['--db', db_path, '--deck', "Khác", 'export', str(target)]) == 1
+        assert cli.main(['--db', db_path, 'export', str(target)]) == 0
+        assert "run" not in target.read_text(encoding='utf-8')
+        assert cli.main(['--db', db_path, '--deck', "ielts", 'export', str(target)]) == 0
+        assert "run" in target.read_text(encoding='utf-8')
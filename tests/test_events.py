@@ -0,0 +1,74 @@
+"""
+Test cases cho sự kiện thay đổi từ vựng
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.events import VocabularyEvent
+
+
+pytestmark = pytest.mark.sync_events
+
+
+@pytest.fixture
+def received(manager):
+    """Danh sách sự kiện nhận được"""
+    events = []
+    manager.events.subscribe(events.append)
+    return events
+
+
+class TestVocabularyEvents:
+    """Test cases cho các sự kiện VocabularyManager phát ra"""
+
+    def test_add_update_delete(self, manager, received):
+        """Thêm/sửa/xóa phát sự kiện với đúng id"""
+        manager.add_vocabulary("alpha", "a")
+        vocab_id = manager.get_by_word("alpha")['id']
+        manager.update_vocabulary(vocab_id, "alpha", "b")
+        manager.mark_as_reviewed(vocab_id)
+        manager.delete_vocabulary(vocab_id)
+
+        assert [(e.kind, e.ids) for e in received] == [
+            ('added', (vocab_id,)), ('updated', (vocab_id,)),
+            ('reviewed', (vocab_id,)), ('deleted', (vocab_id,)),
+        ]
+        assert 'definition' in received[1].fields
+
+    def test_no_event_for_missing_row(self, manager, received):
+        """Xóa/sửa id không tồn tại không phát sự kiện"""
+        manager.delete_vocabulary(999)
+        manager.update_vocabulary(999, "x", "y")
+        assert received == []
+
+    def test_bulk_import_events(self, manager, received):
+        """Nhập hàng loạt phát 'added' cho từ mới và 'updated' cho từ đã có"""
+        manager.add_vocabulary("alpha", "a")
+        received.clear()
+        manager.add_vocabulary_many([{'word': "alpha", 'definition': "a2"},
+                                     {'word': "beta", 'definition': "b"}], on_conflict='update')
+
+        by_kind = {event.kind: event.ids for event in received}
+        assert by_kind['added'] == (manager.get_by_word("beta")['id'],)
+        assert by_kind['updated'] == (manager.get_by_word("alpha")['id'],)
+
+    def test_kind_filter_and_unsubscribe(self, manager):
+        """Chỉ nhận loại đã đăng ký và không nhận sau khi hủy"""
+        deleted = []
+        subscription = manager.events.subscribe(deleted.append, kinds=['deleted'])
+        manager.add_vocabulary("alpha", "a")
+        manager.delete_vocabulary(manager.get_by_word("alpha")['id'])
+        manager.events.unsubscribe(subscription)
+        manager.add_vocabulary("beta", "b")
+        manager.delete_vocabulary(2)
+
+        assert deleted == [VocabularyEvent('deleted', (1,))]
+
+    def test_invalid_kind(self, manager):
+        """Loại sự kiện không tồn tại bị từ chối"""
+        with pytest.raises(ValueError):
+            manager.events.subscribe(print, kinds=['renamed'])
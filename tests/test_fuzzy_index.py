@@ -0,0 +1,81 @@
+"""
+Test cases cho tìm kiếm gần đúng (FuzzyIndex)
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.fuzzy_index import FuzzyIndex, edit_distance
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có vài từ dễ gõ nhầm"""
+    for word in ("receive", "deceive", "recipe", "believe", "cat", "Separate"):
+        manager.add_vocabulary(word, f"nghĩa của {word}")
+    return manager
+
+
+class TestEditDistance:
+    """Test cases cho khoảng cách có giới hạn"""
+
+    def test_distance(self):
+        assert edit_distance("kitten", "sitting", 3) == 3
+        assert edit_distance("same", "same", 0) == 0
+
+    def test_transposition_is_one_edit(self):
+        assert edit_distance("recieve", "receive", 2) == 1
+        assert edit_distance("teh", "the", 1) == 1
+
+    def test_bound(self):
+        """Vượt giới hạn trả về None"""
+        assert edit_distance("kitten", "sitting", 2) is None
+        assert edit_distance("a", "abcd", 2) is None
+
+
+class TestFuzzySearch:
+    """Test cases cho chỉ mục trigram và search_vocabulary"""
+
+    def test_ranked_matches(self):
+        index = FuzzyIndex()
+        index.load([(1, "receive", None), (2, "deceive", None), (3, "recipe", None),
+                    (4, "relieve", None)])
+        assert index.search("recieve", max_distance=1) == [(4, 1), (1, 1)]
+        assert index.search("recieve") == [(4, 1), (1, 1)]
+        # Chỉ nới tới 2 lỗi khi không có kết quả 1 lỗi
+        assert index.search("rceieve") == []
+        assert index.search("rceieve", max_distance=2) == [(4, 2), (1, 2)]
+        assert index.search("recieve", limit=1) == [(4, 1)]
+        assert index.search("xyzzy") == []
+
+    def test_manager_fuzzy_search(self, manager):
+        """Gõ sai vẫn tìm thấy, từ gần nhất trước"""
+        assert [v['word'] for v in manager.search_vocabulary_fuzzy("seperate")] == ["Separate"]
+        assert manager.search_vocabulary_fuzzy("recieve")[0]['word'] == "receive"
+        assert [v['word'] for v in manager.search_vocabulary("~cta")] == ["cat"]
+        assert [v['word'] for v in manager.search_vocabulary("~kat")] == ["cat"]
+        assert manager.search_vocabulary("~dog") == []
+
+    def test_fallback_only_without_exact_results(self, manager):
+        """fuzzy=True chỉ dùng khi tìm chính xác không có kết quả"""
+        assert manager.search_vocabulary("recieve") == []
+        assert manager.search_vocabulary("recieve", True)[0]['word'] == "receive"
+        assert [v['word'] for v in manager.search_vocabulary("recip", True)] == ["recipe"]
+
+    def test_index_follows_writes(self, manager):
+        """Thêm/sửa/xóa sau khi dựng chỉ mục được phản ánh ngay"""
+        assert manager.search_vocabulary_fuzzy("beleive")[0]['word'] == "believe"
+        manager.add_vocabulary("necessary", "cần thiết")
+        manager.add_vocabulary_many([{'word': "occurrence", 'definition': "sự xảy ra"}])
+        believe_id = manager.get_by_word("believe")['id']
+        manager.update_vocabulary(believe_id, "achieve", "đạt được")
+        manager.delete_vocabulary(manager.get_by_word("cat")['id'])
+
+        assert [v['word'] for v in manager.search_vocabulary_fuzzy("neccessary")] == ["necessary"]
+        assert [v['word'] for v in manager.search_vocabulary_fuzzy("occurence")] == ["occurrence"]
+        assert [v['word'] for v in manager.search_vocabulary_fuzzy("acheive")] == ["achieve"]
+        assert "believe" not in [v['word'] for v in manager.search_vocabulary_fuzzy("beleive")]
+        assert manager.search_vocabulary_fuzzy("cat") == []
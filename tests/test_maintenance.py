@@ -0,0 +1,115 @@
+"""
+Test cases cho bảo trì database theo lát thời gian
+"""
+
+import pytest
+import sqlite3
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+from hello_world_app.core.maintenance import TASKS, MaintenanceRunner, MaintenanceTask, needs_incremental_vacuum
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có nhiều từ rồi xóa bớt để có trang trống"""
+    for start in range(0, 3000, 300):
+        # Nhiều lô nhỏ để FTS5 có nhiều segment
+        manager.add_vocabulary_many([{'word': f"word{i}", 'definition': "nghĩa dài " * 30}
+                                     for i in range(start, start + 300)])
+    conn = manager.db.get_connection()
+    with conn:
+        conn.execute("DELETE FROM vocabulary WHERE id % 3 != 0")
+    return manager
+
+
+def pragma(manager, name):
+    return manager.db.get_connection().execute(f'PRAGMA {name}').fetchone()[0]
+
+
+class TestMaintenance:
+    """Test cases cho MaintenanceRunner"""
+
+    def test_run_all_tasks(self, manager):
+        """Mọi tác vụ chạy xong, ghi nhật ký và không đụng tới dữ liệu"""
+        assert pragma(manager, 'freelist_count') > 0
+        runner = MaintenanceRunner(manager, budget_ms=1)
+
+        assert runner.run_all() == len(TASKS)
+
+        conn = manager.db.get_connection()
+        logged = {row[0]: row[1] for row in conn.execute('SELECT task, slices FROM maintenance_log')}
+        assert set(logged) == {task.name for task in TASKS}
+        assert pragma(manager, 'freelist_count') == 0
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()[0]
+        assert [v['word'] for v in manager.search_vocabulary("word2999")] == ["word2999"]
+        assert pragma(manager, 'integrity_check') == 'ok'
+
+    def test_only_due_tasks(self, manager):
+        """Tác vụ vừa chạy chưa đến hạn, trừ khi ép chạy"""
+        runner = MaintenanceRunner(manager)
+        runner.run_all()
+
+        assert runner.begin() == 0
+        assert runner.begin(force=True) == len(TASKS)
+
+    def test_slices_respect_budget(self, manager):
+        """Tác vụ dài được chia thành nhiều lát, lỗi một tác vụ không chặn tác vụ sau"""
+        calls = []
+
+        def slow(conn, deadline, state):
+            state['steps'] = state.get('steps', 0) + 1
+            calls.append(state['steps'])
+            return state['steps'] == 3
+
+        def broken(conn, deadline, state):
+            conn.execute('SELECT * FROM missing_table')
+
+        runner = MaintenanceRunner(manager, tasks=[MaintenanceTask('broken', 1, broken),
+                                                   MaintenanceTask('slow', 1, slow)])
+        assert runner.begin() == 2
+        while runner.run_slice():
+            pass
+
+        assert calls == [1, 2, 3]
+        logged = dict(manager.db.get_connection().execute('SELECT task, slices FROM maintenance_log'))
+        assert logged == {'broken': 0, 'slow': 3}
+        assert runner.begin() == 0
+
+    def test_old_database_not_vacuumed_when_idle(self, tmp_path, capsys):
+        """Database cũ (auto_vacuum=NONE) chỉ được VACUUM đầy đủ khi người dùng chạy lệnh vacuum"""
+        db_path = str(tmp_path / 'old.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE filler (data BLOB)')
+        conn.commit()
+        conn.close()
+        old = VocabularyManager(db_path)
+        try:
+            old.add_vocabulary_many([{'word': f"w{i}", 'definition': "nghĩa dài " * 30} for i in range(2000)])
+            conn = old.db.get_connection()
+            with conn:
+                conn.execute('DELETE FROM vocabulary')
+            free_pages = pragma(old, 'freelist_count')
+            assert needs_incremental_vacuum(conn) and free_pages > 0
+
+            MaintenanceRunner(old).run_all()
+            assert needs_incremental_vacuum(conn)
+            # FTS merge có thể giải phóng thêm trang, nhưng không trang nào bị trả lại
+            assert pragma(old, 'freelist_count') >= free_pages
+        finally:
+            old.close()
+
+        assert cli.main(['--db', db_path, 'vacuum']) == 0
+        assert "Đã bật auto_vacuum=INCREMENTAL" in capsys.readouterr().out
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+            assert conn.execute('PRAGMA freelist_count').fetchone()[0] == 0
+        finally:
+            conn.close()
+        assert cli.main(['--db', db_path, 'vacuum']) == 0
+        assert "đã được bật" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+"""
+Test cases cho migration schema theo PRAGMA user_version
+"""
+
+import pytest
+import sqlite3
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.migrations import LATEST_VERSION, Migration, get_version, migrate
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+
+class TestMigrations:
+    """Test cases cho bộ chạy migration"""
+
+    def test_new_database_at_latest_version(self, manager):
+        """Database mới được nâng lên phiên bản mới nhất với đủ chỉ mục"""
+        conn = manager.db.get_connection()
+        assert get_version(conn) == LATEST_VERSION
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'idx_vocabulary_deck_created', 'idx_vocabulary_deck_due',
+                'idx_vocabulary_deck_word'} <= indexes
+
+    def test_up_to_date_only_reads_version(self, manager):
+        """Database đã mới nhất: migrate chỉ đọc user_version"""
+        conn = manager.db.get_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            assert migrate(conn) == LATEST_VERSION
+        finally:
+            conn.set_trace_callback(None)
+        assert statements == ['PRAGMA user_version']
+
+    def test_unversioned_database_is_upgraded_in_place(self, manager):
+        """Database tạo bởi bản chưa có user_version được nâng cấp mà không mất dữ liệu"""
+        manager.add_vocabulary("alpha", "a")
+        manager.mark_as_reviewed(manager.get_by_word("alpha")['id'])
+        conn = manager.db.get_connection()
+        conn.execute('PRAGMA user_version = 0')
+        manager.close()
+
+        reopened = VocabularyManager(manager.db_path)
+        try:
+            assert get_version(reopened.db.get_connection()) == LATEST_VERSION
+            stats = reopened.get_vocabulary_stats()
+            assert (stats['total_words'], stats['reviewed_words']) == (1, 1)
+            assert [v['word'] for v in reopened.search_vocabulary("alp")] == ["alpha"]
+        finally:
+            reopened.close()
+
+    def test_failed_migration_rolls_back(self, tmp_path):
+        """Migration lỗi không để lại thay đổi dở dang"""
+        def broken(cursor):
+            cursor.execute('CREATE TABLE half_done (x)')
+            raise RuntimeError("boom")
+
+        conn = sqlite3.connect(str(tmp_path / 'broken.db'))
+        migrations = [Migration(1, "ok", lambda cursor: cursor.execute('CREATE TABLE done (x)')),
+                      Migration(2, "broken", broken)]
+        with pytest.raises(RuntimeError):
+            migrate(conn, migrations)
+
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert tables == set()
+        assert get_version(conn) == 0
+        conn.close()
@@ -0,0 +1,57 @@
+"""
+Test cases cho PrefixIndex
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.prefix_index import PrefixIndex
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có vài từ"""
+    for word in ("Run", "runner", "running", "rust", "walk"):
+        manager.add_vocabulary(word, f"nghĩa của {word}")
+    return manager
+
+
+@pytest.fixture
+def index(manager):
+    prefix_index = PrefixIndex()
+    prefix_index.load(manager.get_word_keys())
+    return prefix_index
+
+
+class TestPrefixIndex:
+    """Test cases cho gợi ý tiền tố và kiểm tra trùng"""
+
+    def test_complete(self, index):
+        """Gợi ý theo tiền tố, không phân biệt hoa/thường, có giới hạn"""
+        assert index.complete("RUN") == ["Run", "runner", "running"]
+        assert index.complete("ru", limit=2) == ["Run", "runner"]
+        assert index.complete("x") == []
+        assert index.complete("  ") == []
+
+    def test_lookup(self, manager, index):
+        """Kiểm tra từ đã tồn tại theo khóa chuẩn hóa"""
+        assert index.lookup("ｒｕｎ") == manager.get_by_word("run")['id']
+        assert index.lookup("ru") is None
+
+    def test_incremental_updates(self, manager, index):
+        """update/remove theo id giữ chỉ mục khớp với database"""
+        walk_id = index.lookup("walk")
+        index.update([(walk_id, "Walking")])
+        index.update([(100, "rum")])
+        index.remove([index.lookup("rust")])
+
+        assert index.lookup("walk") is None
+        assert index.complete("walk") == ["Walking"]
+        assert index.complete("ru") == ["rum", "Run", "runner", "running"]
+        assert len(index) == 5
+
+        index.remove([100, 12345])
+        assert index.complete("rum") == []
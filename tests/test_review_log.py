@@ -0,0 +1,96 @@
+"""
+Test cases cho nhật ký ôn tập và bảng tổng hợp theo ngày
+"""
+
+import pytest
+import sqlite3
+import sys
+from datetime import datetime
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager dùng database tạm, có sẵn hai từ"""
+    manager.add_vocabulary_many([{'word': "alpha", 'definition': "a"},
+                                 {'word': "beta", 'definition': "b"}])
+    return manager
+
+
+def rollup_matches_log(manager):
+    conn = manager.db.get_connection()
+    rollup = conn.execute('''
+        SELECT deck_id, day, reviews, lapses, latency_ms, timed_reviews FROM review_daily
+        WHERE reviews > 0 ORDER BY deck_id, day
+    ''').fetchall()
+    aggregated = conn.execute('''
+        SELECT deck_id, DATE(ts), COUNT(*), SUM(grade < 3), TOTAL(latency_ms), COUNT(latency_ms)
+        FROM review_log GROUP BY 1, 2 ORDER BY 1, 2
+    ''').fetchall()
+    return rollup == aggregated
+
+
+class TestReviewLog:
+    """Test cases cho review_log và review_daily"""
+
+    def test_grade_appends_log(self, manager):
+        """Mỗi lần chấm điểm là một hàng mới, kể cả khi ghi theo lô"""
+        alpha = manager.get_by_word("alpha")['id']
+        assert manager.grade(alpha, 2, latency_ms=4200)
+        assert manager.mark_as_reviewed(alpha)
+        assert manager.apply_writes([('grade', (alpha, 5, 800)), ('mark_as_reviewed', (alpha,))]) == [True, True]
+
+        history = manager.get_review_log(alpha)
+        assert [entry['grade'] for entry in history] == [4, 5, 4, 2]
+        assert [entry['latency_ms'] for entry in history] == [None, 800, None, 4200]
+        assert len(manager.get_review_log(alpha, limit=1)) == 1
+        assert manager.get_by_word("alpha")['review_count'] == 4
+
+        [today] = manager.get_daily_reviews()
+        assert (today['reviews'], today['lapses'], today['avg_latency_ms']) == (4, 1, 2500)
+        assert rollup_matches_log(manager)
+
+    def test_daily_window_and_deck(self, manager):
+        """Chỉ đọc `days` ngày gần nhất của bộ từ hiện tại"""
+        alpha = manager.get_by_word("alpha")['id']
+        conn = manager.db.get_connection()
+        with conn:
+            conn.executemany('INSERT INTO review_log (vocab_id, deck_id, ts, grade) VALUES (?, ?, ?, ?)',
+                             [(alpha, 1, '2024-01-01 23:59:59', 1), (alpha, 1, '2024-01-02 00:00:00', 4),
+                              (alpha, 1, '2024-01-02 08:00:00', 5), (alpha, 1, '2023-12-01 10:00:00', 3),
+                              (alpha, 7, '2024-01-02 09:00:00', 3)])
+        assert rollup_matches_log(manager)
+
+        now = datetime(2024, 1, 2, 12, 0)
+        assert [(row['day'], row['reviews']) for row in manager.get_daily_reviews(2, now)] == [
+            ('2024-01-01', 1), ('2024-01-02', 2)]
+        assert len(manager.get_daily_reviews(365, now)) == 3
+        with pytest.raises(ValueError):
+            manager.get_daily_reviews(0)
+
+        # Dọn nhật ký cũ vẫn giữ bảng tổng hợp khớp
+        with conn:
+            conn.execute("DELETE FROM review_log WHERE ts < '2024-01-01'")
+        assert rollup_matches_log(manager)
+        assert len(manager.get_daily_reviews(365, now)) == 2
+
+    def test_append_only(self, manager):
+        """Không sửa được hàng đã ghi"""
+        manager.mark_as_reviewed(manager.get_by_word("beta")['id'])
+        conn = manager.db.get_connection()
+        with pytest.raises(sqlite3.DatabaseError):
+            with conn:
+                conn.execute('UPDATE review_log SET grade = 0')
+
+    def test_cli(self, manager, capsys):
+        """hello-world-vocab reviews in số lần ôn mỗi ngày"""
+        manager.mark_as_reviewed(manager.get_by_word("beta")['id'])
+        manager.close()
+
+        assert cli.main(['--db', manager.db_path, 'reviews', '--days', '7']) == 0
+
+        assert "    1     0 sai  ####" in capsys.readouterr().out
@@ -0,0 +1,131 @@
+"""
+Test cases cho bộ lập lịch ôn tập SM-2
+"""
+
+import pytest
+import sqlite3
+import sys
+from datetime import timedelta
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.scheduler import (DEFAULT_EASE, MAX_INTERVAL, MIN_EASE, next_due, schedule_review,
+                                             utc_now)
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+
+class TestScheduleReview:
+    """Test cases cho thuật toán SM-2"""
+
+    def test_interval_progression(self):
+        """Trả lời đúng liên tiếp: 1 ngày, 6 ngày rồi nhân với hệ số dễ"""
+        state = schedule_review(4)
+        assert (state.repetitions, state.interval) == (1, 1.0)
+        state = schedule_review(4, *state)
+        assert (state.repetitions, state.interval) == (2, 6.0)
+        state = schedule_review(4, *state)
+        assert state.interval == round(6 * state.ease)
+
+    def test_failure_resets(self):
+        """Trả lời sai đưa thẻ về đầu chu kỳ và giảm hệ số dễ"""
+        state = schedule_review(1, repetitions=5, interval=40.0, ease=DEFAULT_EASE)
+        assert (state.repetitions, state.interval) == (0, 1.0)
+        assert state.ease < DEFAULT_EASE
+
+    def test_ease_floor(self):
+        """Hệ số dễ không xuống dưới mức tối thiểu"""
+        assert schedule_review(0, ease=MIN_EASE).ease == MIN_EASE
+
+    def test_interval_ceiling(self):
+        """Ôn đúng liên tục không làm khoảng ôn vượt giới hạn (tràn datetime)"""
+        state = schedule_review(5)
+        for _ in range(200):
+            state = schedule_review(5, *state)
+        assert state.interval == MAX_INTERVAL
+        assert next_due(state.interval)
+
+    def test_invalid_quality(self):
+        """Điểm ngoài khoảng 0-5 bị từ chối"""
+        with pytest.raises(ValueError):
+            schedule_review(6)
+
+
+class TestDueQueue:
+    """Test cases cho grade/get_due của VocabularyManager"""
+
+    def test_new_words_are_due(self, manager):
+        """Từ mới thêm đến hạn ngay"""
+        manager.add_vocabulary("alpha", "a")
+        manager.add_vocabulary_many([{'word': "beta", 'definition': "b"}])
+        assert {v['word'] for v in manager.get_due(10)} == {"alpha", "beta"}
+
+    def test_grade_reschedules(self, manager):
+        """Chấm điểm đẩy từ ra khỏi hàng đợi đến khi hết khoảng cách"""
+        manager.add_vocabulary("alpha", "a")
+        vocab_id = manager.get_by_word("alpha")['id']
+
+        assert manager.grade(vocab_id, 5)
+        assert manager.get_due(10) == []
+        later = utc_now() + timedelta(days=2)
+        assert [v['id'] for v in manager.get_due(10, now=later)] == [vocab_id]
+
+        vocab = manager.get_vocabulary_by_id(vocab_id)
+        assert vocab['repetitions'] == 1
+        assert vocab['review_count'] == 1
+        assert vocab['last_reviewed'] is not None
+
+    def test_grade_missing_and_invalid(self, manager):
+        """Từ không tồn tại trả về False, điểm sai báo ValueError"""
+        assert not manager.grade(12345, 3)
+        with pytest.raises(ValueError):
+            manager.grade(1, 9)
+
+    def test_due_order_and_limit(self, manager):
+        """Hàng đợi trả về từ quá hạn lâu nhất trước"""
+        for word in ("a1", "b2", "c3"):
+            manager.add_vocabulary(word, word)
+        conn = manager.db.get_connection()
+        with conn:
+            conn.execute("UPDATE vocabulary SET due_at = '2000-01-01 00:00:00' WHERE word = 'c3'")
+        assert [v['word'] for v in manager.get_due(1)] == ["c3"]
+
+    def test_due_query_uses_index(self, manager):
+        """get_due đọc theo chỉ mục (deck_id, due_at) thay vì sắp xếp toàn bảng"""
+        plan = manager.db.get_connection().execute(
+            'EXPLAIN QUERY PLAN SELECT id FROM vocabulary WHERE deck_id = ? AND due_at <= ? '
+            'ORDER BY due_at LIMIT 5', (1, '2100-01-01')).fetchall()
+        details = ' '.join(row[-1] for row in plan)
+        assert 'idx_vocabulary_deck_due' in details
+        assert 'TEMP B-TREE' not in details
+
+    def test_upgrade_existing_database(self, tmp_path):
+        """Database cũ được thêm cột lập lịch và từ cũ đến hạn từ lúc tạo"""
+        db_path = str(tmp_path / 'old.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('''
+            CREATE TABLE vocabulary (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT NOT NULL UNIQUE,
+                definition TEXT NOT NULL,
+                example TEXT,
+                pronunciation TEXT,
+                part_of_speech TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_reviewed TIMESTAMP,
+                review_count INTEGER DEFAULT 0
+            )
+        ''')
+        conn.execute("INSERT INTO vocabulary (word, definition, created_at) "
+                     "VALUES ('legacy', 'cũ', '2020-05-01 08:00:00')")
+        conn.commit()
+        conn.close()
+
+        upgraded = VocabularyManager(db_path)
+        try:
+            due = upgraded.get_due(10)
+            assert [v['word'] for v in due] == ["legacy"]
+            assert due[0]['due_at'] == '2020-05-01 08:00:00'
+            assert due[0]['ease'] == DEFAULT_EASE
+        finally:
+            upgraded.close()
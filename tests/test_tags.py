@@ -0,0 +1,110 @@
+"""
+Test cases cho nhãn và chỉ mục bitset theo nhãn
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+from hello_world_app.core.tag_index import TagIndex, parse_tag_query, split_tags
+
+
+def ids_of(manager, *words):
+    return [manager.get_by_word(word)['id'] for word in words]
+
+
+class TestTagIndex:
+    """Test cases cho bitset trong bộ nhớ"""
+
+    def test_boolean_query(self):
+        """AND/OR/NOT và ngoặc, NOT lấy phần bù trong bộ từ"""
+        index = TagIndex()
+        index.load([1, 2, 3, 4], [(1, 'travel'), (2, 'travel'), (2, 'mastered'), (3, 'food')])
+
+        assert index.match("tag:travel AND NOT tag:mastered") == [1]
+        assert index.match("tag:travel OR tag:food") == [3, 2, 1]
+        assert index.match("NOT (tag:travel OR tag:food)") == [4]
+        assert index.match("tag:Travel tag:mastered") == [2]
+        assert index.match("tag:unknown") == []
+
+    def test_set_rows_and_remove(self):
+        """Cập nhật theo hàng thay nhãn cũ, xóa id khỏi mọi nhãn"""
+        index = TagIndex()
+        index.load([1, 2], [(1, 'a'), (2, 'a')])
+
+        index.set_rows([1, 5], [(1, 'b'), (5, 'a')])
+        assert index.counts() == {'a': 2, 'b': 1}
+        index.remove([2, 5])
+        assert index.counts() == {'b': 1}
+        assert index.match("NOT tag:b") == []
+
+    @pytest.mark.parametrize('query', ["", "tag:a AND", "travel", "(tag:a", "tag:a)"])
+    def test_invalid_query(self, query):
+        """Biểu thức sai cú pháp raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_tag_query(query)
+
+    def test_split_tags(self):
+        """Nhãn được chuẩn hóa, bỏ trống và trùng"""
+        assert split_tags("Travel, ,  Phrasal Verb,travel") == ['travel', 'phrasal-verb']
+
+
+class TestManagerTags:
+    """Test cases cho nhãn trong VocabularyManager"""
+
+    def test_filter_and_search(self, manager):
+        """Lọc theo nhãn qua filter_by_tags và qua ô tìm kiếm"""
+        manager.add_vocabulary_many([{'word': word, 'definition': "d"}
+                                     for word in ("trip", "hotel", "apple")])
+        trip, hotel, apple = ids_of(manager, "trip", "hotel", "apple")
+        assert manager.add_tags([trip, hotel], ["travel"]) == 2
+        assert manager.add_tags([trip, hotel], ["travel"]) == 0
+        manager.add_tags([hotel], ["mastered"])
+
+        assert [v['word'] for v in manager.filter_by_tags("tag:travel AND NOT tag:mastered")] == ["trip"]
+        # Chỉ mục đã dựng được cập nhật theo các lần ghi sau
+        manager.remove_tags([hotel], ["mastered"])
+        manager.set_tags(apple, ["travel"])
+        assert [v['word'] for v in manager.search_vocabulary("tag:travel")] == ["apple", "hotel", "trip"]
+        manager.delete_vocabulary(trip)
+        assert manager.get_tag_counts() == {'travel': 2}
+        assert manager.get_tags(apple) == ["travel"]
+        assert manager.filter_by_tags("tag:travel AND") == []
+
+    def test_bulk_import_updates_index(self, manager):
+        """Từ nhập hàng loạt sau khi chỉ mục đã dựng vẫn được lọc thấy"""
+        manager.add_vocabulary("apple", "d")
+        manager.add_tags(ids_of(manager, "apple"), ["fruit"])
+        assert [v['word'] for v in manager.filter_by_tags("NOT tag:foo")] == ["apple"]
+
+        manager.add_vocabulary_many([{'word': "banana", 'definition': "d"}])
+        assert [v['word'] for v in manager.filter_by_tags("NOT tag:foo")] == ["banana", "apple"]
+
+    def test_scoped_to_deck(self, manager):
+        """Chỉ mục nhãn chỉ chứa từ của bộ từ hiện tại"""
+        manager.add_vocabulary("trip", "d")
+        manager.add_tags(ids_of(manager, "trip"), ["travel"])
+        assert manager.get_tag_counts() == {'travel': 1}
+
+        manager.set_deck(manager.add_deck("Other"))
+        manager.add_vocabulary("flight", "d")
+        manager.add_tags(ids_of(manager, "flight"), ["travel"])
+        assert [v['word'] for v in manager.filter_by_tags("tag:travel")] == ["flight"]
+        assert manager.filter_by_tags("NOT tag:travel") == []
+
+    def test_cli(self, tmp_path, capsys):
+        """hello-world-vocab tag gắn, gỡ và liệt kê nhãn"""
+        db_path = str(tmp_path / 'cli.db')
+        source = tmp_path / 'in.tsv'
+        source.write_text("trip\tchuyến đi\n", encoding='utf-8')
+        assert cli.main(['--db', db_path, 'import', str(source)]) == 0
+
+        assert cli.main(['--db', db_path, 'tag', 'trip', 'Travel', 'ielts']) == 0
+        assert cli.main(['--db', db_path, 'tag', 'trip', 'ielts', '--remove']) == 0
+        assert cli.main(['--db', db_path, 'tag', 'missing', 'x']) == 1
+        out = capsys.readouterr().out
+        assert "trip: ielts, travel\n" in out
+        assert "trip: travel\n" in out
@@ -0,0 +1,184 @@
+"""
+Test cases cho nén trong suốt các cột văn bản dài
+"""
+
+import pytest
+import sqlite3
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+from hello_world_app.core import text_codec
+from hello_world_app.core.events import UPDATED, EventBus
+from hello_world_app.core.migrations import fts_uses_text_codec
+from hello_world_app.core.text_codec import decode_text, encode_text, train_dictionary
+from hello_world_app.core.vocabulary_cache import VocabularyCache
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+SENTENCE = "The committee postponed the decision until further evidence was available."
+
+
+@pytest.fixture
+def manager_options():
+    """VocabularyManager bật nén"""
+    return {'text_compression': True}
+
+
+def stored_types(manager, word):
+    conn = manager.db.get_connection()
+    return conn.execute('SELECT typeof(definition), typeof(example), typeof(context_sentences) '
+                        'FROM vocabulary WHERE word = ?', (word,)).fetchone()
+
+
+class TestTextCodec:
+    """Test cases cho định dạng lưu trữ"""
+
+    def test_round_trip(self):
+        """Chuỗi dài được nén, chuỗi ngắn và giá trị cũ giữ nguyên"""
+        dictionary = train_dictionary([SENTENCE * 2, SENTENCE])
+        text_codec.register_dictionary(dictionary)
+        text = " ".join([SENTENCE] * 3)
+        for packed in (encode_text(text), encode_text(text, dictionary)):
+            assert isinstance(packed, bytes) and packed[0] == text_codec.FORMAT_ZLIB
+            assert decode_text(packed) == text
+        assert encode_text("ngắn") == "ngắn"
+        assert decode_text("văn bản cũ") == "văn bản cũ"
+        assert decode_text(None) is None
+
+    def test_prefix_decode(self):
+        """max_length chỉ giải nén phần đầu, không cắt đôi ký tự nhiều byte"""
+        text = "Tiếng Việt có dấu " * 10
+        assert decode_text(encode_text(text), 20) == text[:20]
+
+    def test_invalid_blob(self):
+        """BLOB không có byte định dạng hợp lệ raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_text(b'\x07abc')
+
+
+class TestManagerCompression:
+    """Test cases cho nén trong VocabularyManager"""
+
+    def test_transparent_reads(self, manager):
+        """Thêm, sửa, nhập đều nén; đọc, tìm kiếm và xuất thấy văn bản gốc"""
+        example = f"{SENTENCE} {SENTENCE}"
+        manager.add_vocabulary("postpone", SENTENCE, example=example, context_sentences="ngắn")
+        manager.add_vocabulary_many([{'word': "defer", 'definition': SENTENCE, 'example': "x"}])
+        assert stored_types(manager, "postpone") == ('blob', 'blob', 'text')
+        assert stored_types(manager, "defer") == ('blob', 'text', 'text')
+
+        vocab = next(v for v in manager.get_all_vocabulary() if v['word'] == "postpone")
+        assert vocab.preview('example', 20) == SENTENCE[:20] + "..."
+        assert not vocab.heavy_loaded
+        assert vocab.example == example
+        assert manager.get_by_word("postpone")['definition'] == SENTENCE
+
+        assert {v['word'] for v in manager.search_vocabulary("further evidence")} == {"postpone", "defer"}
+        batches = list(manager.iter_export_batches(('word', 'definition')))
+        assert batches == [[("postpone", SENTENCE), ("defer", SENTENCE)]]
+
+        vocab_id = manager.get_by_word("defer")['id']
+        manager.update_vocabulary(vocab_id, "defer", "hoãn lại", example=SENTENCE)
+        assert stored_types(manager, "defer") == ('text', 'blob', 'text')
+        assert [v['word'] for v in manager.search_vocabulary("hoãn")] == ["defer"]
+
+    def test_rewrite_existing_rows(self, tmp_path):
+        """Dữ liệu cũ được nén lại bằng từ điển, giải nén lại về TEXT, FTS vẫn đúng"""
+        db_path = str(tmp_path / 'plain.db')
+        plain = VocabularyManager(db_path)
+        plain.add_vocabulary_many([{'word': f"w{i}", 'definition': f"{SENTENCE} #{i}"}
+                                   for i in range(20)])
+        assert plain.train_text_dictionary()
+        assert plain.rewrite_text_storage() == 20
+        assert stored_types(plain, "w3") == ('blob', 'text', 'text')
+        plain.close()
+
+        # Process mới: từ điển được đọc lại từ database khi cần
+        text_codec._dictionaries.clear()
+        text_codec._decompressors.clear()
+        reopened = VocabularyManager(db_path)
+        try:
+            text_codec._dictionaries.clear()
+            text_codec._decompressors.clear()
+            assert reopened.get_by_word("w3")['definition'] == f"{SENTENCE} #3"
+            assert reopened.rewrite_text_storage(compress=False) == 20
+            assert stored_types(reopened, "w3") == ('text', 'text', 'text')
+            assert [v['word'] for v in reopened.search_vocabulary("available. #7")] == ["w7"]
+            conn = reopened.db.get_connection()
+            conn.execute("INSERT INTO vocabulary_fts(vocabulary_fts, rank) VALUES ('integrity-check', 1)")
+        finally:
+            reopened.close()
+
+    def test_rewrite_notifies_views(self, tmp_path):
+        """Ghi lại làm mất hiệu lực bộ nhớ đệm và phát UPDATED cho các hàng đã ghi"""
+        cached = VocabularyManager(str(tmp_path / 'cached.db'), cache=VocabularyCache(),
+                                   events=EventBus(dispatcher=lambda callback, event: callback(event)))
+        try:
+            cached.add_vocabulary_many([{'word': f"w{i}", 'definition': f"{SENTENCE} #{i}"}
+                                        for i in range(20)] + [{'word': "short", 'definition': "x"}])
+            before = cached.get_all_vocabulary()
+            assert cached.train_text_dictionary()
+            received = []
+            cached.events.subscribe(received.append)
+
+            assert cached.rewrite_text_storage(batch_size=8) == 20
+            assert all(event.kind == UPDATED for event in received)
+            assert sorted(i for event in received for i in event.ids) == sorted(
+                v['id'] for v in before if v['word'] != "short")
+            after = cached.get_all_vocabulary()
+            assert all(a is not b for a, b in zip(before, after))
+            assert [v.definition for v in after] == [v.definition for v in before]
+        finally:
+            cached.close()
+
+    def test_fts_triggers_only_when_compressing(self, tmp_path):
+        """Khi không nén, kết nối SQLite ngoài ứng dụng vẫn ghi được; trigger vocab_text() chỉ có khi nén"""
+        db_path = str(tmp_path / 'plain.db')
+        plain = VocabularyManager(db_path)
+        plain.add_vocabulary_many([{'word': f"w{i}", 'definition': f"{SENTENCE} #{i}"}
+                                   for i in range(20)])
+        assert not fts_uses_text_codec(plain.db.get_connection())
+        plain.close()
+
+        def external_write():
+            conn = sqlite3.connect(db_path)
+            try:
+                with conn:
+                    conn.execute("INSERT INTO vocabulary (word, definition, word_key) VALUES ('ext', 'x', 'ext')")
+                    conn.execute("DELETE FROM vocabulary WHERE word = 'ext'")
+            finally:
+                conn.close()
+
+        external_write()
+
+        compressed = VocabularyManager(db_path)
+        try:
+            compressed.text_compression = True
+            assert fts_uses_text_codec(compressed.db.get_connection())
+            assert compressed.train_text_dictionary()
+            assert compressed.rewrite_text_storage() == 20
+            with pytest.raises(sqlite3.OperationalError):
+                external_write()
+
+            # Giải nén hết khi không bật nén thì trả lại trigger thường
+            compressed.text_compression = False
+            assert compressed.rewrite_text_storage(compress=False) == 20
+            conn = compressed.db.get_connection()
+            assert not fts_uses_text_codec(conn)
+            external_write()
+            assert [v['word'] for v in compressed.search_vocabulary("available. #3")] == ["w3"]
+            conn.execute("INSERT INTO vocabulary_fts(vocabulary_fts, rank) VALUES ('integrity-check', 1)")
+        finally:
+            compressed.close()
+
+    def test_cli(self, tmp_path, capsys):
+        """hello-world-vocab compress nén các từ đã có"""
+        db_path = str(tmp_path / 'cli.db')
+        source = tmp_path / 'in.tsv'
+        source.write_text("".join(f"w{i}\t{SENTENCE} {i}\n" for i in range(5)), encoding='utf-8')
+        assert cli.main(['--db', db_path, 'import', str(source)]) == 0
+
+        assert cli.main(['--db', db_path, 'compress']) == 0
+        assert "Đã ghi lại 5 từ vựng" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+"""
+Test cases cho bộ nhớ đệm từ vựng
+"""
+
+import pytest
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.vocabulary_cache import VocabularyCache
+from hello_world_app.core.vocabulary_manager import VocabularyManager, get_vocabulary_manager
+
+
+@pytest.fixture
+def cached(tmp_path):
+    """VocabularyManager có bộ nhớ đệm và hai từ"""
+    vocab_manager = VocabularyManager(str(tmp_path / 'vocabulary.db'), cache=VocabularyCache())
+    vocab_manager.add_vocabulary("alpha", "a")
+    vocab_manager.add_vocabulary("beta", "b")
+    yield vocab_manager
+    vocab_manager.close()
+
+
+class TestVocabularyCache:
+    """Test cases cho đọc qua bộ nhớ đệm"""
+
+    def test_repeated_reads_hit_cache(self, cached):
+        """Đọc lại khi không có thay đổi dùng bản trong bộ nhớ"""
+        first = list(cached.iter_vocabulary())
+        misses = cached.cache.misses
+        second = list(cached.iter_vocabulary())
+
+        assert cached.cache.misses == misses
+        assert all(a is b for a, b in zip(first, second))
+        assert [v['word'] for v in cached.get_all_vocabulary()] == [v['word'] for v in first]
+
+    def test_local_write_invalidates(self, cached):
+        """Ghi qua manager làm mới danh sách và thống kê"""
+        assert cached.get_vocabulary_stats()['total_words'] == 2
+        list(cached.iter_vocabulary())
+
+        cached.add_vocabulary("gamma", "g")
+        assert cached.get_vocabulary_stats()['total_words'] == 3
+        assert "gamma" in {v['word'] for v in cached.iter_vocabulary()}
+
+        cached.delete_vocabulary(cached.get_by_word("gamma")['id'])
+        assert "gamma" not in {v['word'] for v in cached.iter_vocabulary()}
+
+    def test_external_write_detected(self, cached):
+        """Ghi từ kết nối khác (process khác) được phát hiện qua data_version"""
+        list(cached.iter_vocabulary())
+        other = sqlite3.connect(cached.db_path)
+        with other:
+            other.execute("INSERT INTO vocabulary (word, definition, due_at) "
+                          "VALUES ('external', 'x', CURRENT_TIMESTAMP)")
+        other.close()
+
+        assert "external" in {v['word'] for v in cached.iter_vocabulary()}
+        assert cached.get_vocabulary_stats()['total_words'] == 3
+
+    def test_reader_threads_keep_own_entries(self, cached):
+        """Đọc xen kẽ từ nhiều thread không đẩy mục đệm của nhau ra"""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for _ in range(20):
+                list(pool.map(lambda _: cached.get_all_vocabulary(), range(2)))
+        # Mở kết nối của thread thứ hai làm đổi data_version của thread đầu một lần
+        assert cached.cache.misses <= 3
+        assert cached.cache.hits >= 37
+
+    def test_shared_manager(self, tmp_path):
+        """get_vocabulary_manager trả về cùng một manager cho cùng đường dẫn"""
+        db_path = str(tmp_path / 'shared.db')
+        manager = get_vocabulary_manager(db_path)
+        try:
+            assert get_vocabulary_manager(db_path) is manager
+            assert manager.cache is not None
+        finally:
+            manager.close()
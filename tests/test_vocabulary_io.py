@@ -0,0 +1,121 @@
+"""
+Test cases cho nhập/xuất file từ vựng
+"""
+
+import json
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+from hello_world_app.core.vocabulary_io import (export_vocabulary_file, import_vocabulary_file,
+                                                read_tsv)
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+
+class TestImport:
+    """Test cases cho đọc file theo luồng"""
+
+    def test_csv_with_header_in_chunks(self, manager, tmp_path):
+        """CSV có tiêu đề được nhập theo lô và báo tiến độ"""
+        path = tmp_path / 'words.csv'
+        lines = ["word,definition,example"] + [f'w{i},nghĩa {i},"ví dụ, {i}"' for i in range(25)]
+        path.write_text("\n".join(lines), encoding='utf-8')
+        progress = []
+
+        counts = import_vocabulary_file(manager, str(path), chunk_size=10,
+                                        progress=lambda done, _: progress.append(done))
+
+        assert counts == {'inserted': 25}
+        assert progress == [10, 20, 25]
+        assert manager.get_by_word("w3")['example'] == "ví dụ, 3"
+
+    def test_tsv_without_header(self, tmp_path):
+        """TSV không có tiêu đề được đọc theo thứ tự cột mặc định"""
+        path = tmp_path / 'anki.txt'
+        path.write_text("run\tchạy\nwalk\tđi bộ\n", encoding='utf-8')
+
+        assert [r['word'] for r in read_tsv(str(path))] == ["run", "walk"]
+
+    def test_jsonl_skips_bad_lines(self, manager, tmp_path):
+        """Dòng JSON lỗi bị bỏ qua, từ đã có được cập nhật"""
+        manager.add_vocabulary("run", "chạy")
+        path = tmp_path / 'words.jsonl'
+        path.write_text("\n".join([
+            json.dumps({'word': "run", 'definition': "chạy nhanh"}),
+            "{not json",
+            json.dumps({'word': "jump", 'definition': "nhảy"}),
+        ]), encoding='utf-8')
+
+        counts = import_vocabulary_file(manager, str(path), on_conflict='update')
+
+        assert counts == {'updated': 1, 'inserted': 1}
+        assert manager.get_by_word("run")['definition'] == "chạy nhanh"
+
+
+class TestExport:
+    """Test cases cho xuất file theo luồng"""
+
+    @pytest.mark.parametrize('extension', ['csv', 'tsv', 'jsonl'])
+    def test_round_trip(self, manager, tmp_path, extension):
+        """File xuất nhập lại được vào database mới, báo tiến độ theo lô"""
+        manager.add_vocabulary_many([{'word': f"w{i}", 'definition': f"nghĩa {i}",
+                                      'example': "dòng 1\ndòng 2, \"trích\""} for i in range(25)])
+        path = str(tmp_path / f'words.{extension}')
+        progress = []
+
+        written = export_vocabulary_file(manager, path, batch_size=10,
+                                         progress=lambda done, total: progress.append((done, total)))
+
+        assert written == 25
+        assert progress == [(10, 25), (20, 25), (25, 25)]
+        copy = VocabularyManager(str(tmp_path / 'copy.db'))
+        try:
+            assert import_vocabulary_file(copy, path) == {'inserted': 25}
+            assert copy.get_by_word("w7")['example'] == "dòng 1\ndòng 2, \"trích\""
+        finally:
+            copy.close()
+
+    def test_anki_notes(self, manager, tmp_path):
+        """File Anki có dòng tiêu đề, escape HTML và gộp trường phụ vào mặt sau"""
+        manager.add_vocabulary("<b>run</b>", "chạy\nnhanh", example="I run.",
+                               pronunciation="rʌn", part_of_speech="phrasal verb")
+        path = tmp_path / 'deck.txt'
+
+        assert export_vocabulary_file(manager, str(path)) == 1
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert lines[:4] == ['#separator:tab', '#html:true', '#columns:Front\tBack\tTags',
+                             '#tags column:3']
+        assert lines[4].split('\t') == ["&lt;b&gt;run&lt;/b&gt;",
+                                        "chạy<br>nhanh<br>[rʌn]<br><i>I run.</i>",
+                                        "phrasal_verb"]
+
+    def test_failure_leaves_no_file(self, manager, tmp_path):
+        """Lỗi giữa chừng không để lại file đích hay file tạm"""
+        manager.add_vocabulary("run", "chạy")
+        path = tmp_path / 'words.csv'
+
+        def fail(done, total):
+            raise RuntimeError("hủy")
+
+        with pytest.raises(RuntimeError):
+            export_vocabulary_file(manager, str(path), progress=fail)
+        assert list(tmp_path.glob('words.csv*')) == []
+
+    def test_cli(self, tmp_path, capsys):
+        """hello-world-vocab import rồi export qua --db"""
+        db_path = str(tmp_path / 'cli.db')
+        source = tmp_path / 'in.tsv'
+        source.write_text("run\tchạy\nwalk\tđi bộ\n", encoding='utf-8')
+        target = tmp_path / 'out.jsonl'
+
+        assert cli.main(['--db', db_path, 'import', str(source)]) == 0
+        assert cli.main(['--db', db_path, 'export', str(target)]) == 0
+        assert cli.main(['--db', db_path, 'export', str(tmp_path / 'out.xyz')]) == 1
+
+        rows = [json.loads(line) for line in target.read_text(encoding='utf-8').splitlines()]
+        assert [row['word'] for row in rows] == ["run", "walk"]
+        assert "Đã xuất 2" in capsys.readouterr().out
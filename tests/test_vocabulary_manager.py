@@ -0,0 +1,347 @@
+"""
+Test cases cho VocabularyManager
+"""
+
+import pytest
+import random
+import sys
+import threading
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+
+
+class TestConnectionManager:
+    """Test cases cho lớp kết nối lâu dài"""
+
+    def test_connection_reused_within_thread(self, manager):
+        """Cùng một thread dùng lại cùng một kết nối"""
+        assert manager.db.get_connection() is manager.db.get_connection()
+
+    def test_connection_per_thread(self, manager):
+        """Mỗi thread có kết nối riêng"""
+        main_conn = manager.db.get_connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(manager.db.get_connection()))
+        thread.start()
+        thread.join()
+
+        assert other[0] is not main_conn
+
+    def test_pragmas_applied(self, manager):
+        """Kết nối được cấu hình WAL và synchronous=NORMAL"""
+        conn = manager.db.get_connection()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+
+    def test_close_then_reopen(self, manager):
+        """Sau khi close() vẫn có thể dùng tiếp với kết nối mới"""
+        old_conn = manager.db.get_connection()
+        manager.close()
+
+        assert manager.add_vocabulary("hello", "xin chào")
+        assert manager.db.get_connection() is not old_conn
+
+
+class TestVocabularyCrud:
+    """Test cases cho các thao tác thêm/sửa/xóa"""
+
+    def test_add_and_duplicate(self, manager):
+        """Thêm từ trùng trả về False và không làm hỏng transaction"""
+        assert manager.add_vocabulary("run", "chạy")
+        assert not manager.add_vocabulary("run", "chạy")
+        assert manager.add_vocabulary("walk", "đi bộ")
+
+        words = {v['word'] for v in manager.get_all_vocabulary()}
+        assert words == {"run", "walk"}
+
+    def test_update_delete_review(self, manager):
+        """Cập nhật, đánh dấu ôn tập và xóa"""
+        manager.add_vocabulary("run", "chạy")
+        vocab_id = manager.get_all_vocabulary()[0]['id']
+
+        assert manager.update_vocabulary(vocab_id, "run", "chạy nhanh")
+        assert manager.mark_as_reviewed(vocab_id)
+        vocab = manager.get_all_vocabulary()[0]
+        assert vocab['definition'] == "chạy nhanh"
+        assert vocab['review_count'] == 1
+
+        stats = manager.get_vocabulary_stats()
+        assert stats['total_words'] == 1
+        assert stats['reviewed_words'] == 1
+
+        assert manager.delete_vocabulary(vocab_id)
+        assert manager.get_all_vocabulary() == []
+
+
+class TestSearch:
+    """Test cases cho tìm kiếm full-text"""
+
+    @pytest.fixture
+    def populated(self, manager):
+        manager.add_vocabulary("receive", "nhận", example="I receive letters")
+        manager.add_vocabulary("deceive", "lừa dối")
+        manager.add_vocabulary("perceive", "nhận thức", synonyms="notice, sense")
+        manager.add_vocabulary("run", "chạy", context_sentences="He will receive a prize")
+        return manager
+
+    def test_fts_enabled(self, populated):
+        """Bản SQLite trong môi trường test hỗ trợ FTS5"""
+        assert populated.fts_enabled
+
+    @pytest.mark.parametrize("term", ["cei", "eive", "RECEIVE", "notice", "prize", "zzz"])
+    def test_fts_matches_like(self, populated, term):
+        """Kết quả FTS trùng với đường LIKE cho truy vấn chuỗi con"""
+        fts_ids = {v['id'] for v in populated.search_vocabulary(term)}
+        populated.fts_enabled = False
+        like_ids = {v['id'] for v in populated.search_vocabulary(term)}
+
+        assert fts_ids == like_ids
+
+    def test_ranked_by_bm25(self, populated):
+        """Khớp ở cột word được xếp trên khớp ở cột phụ"""
+        results = populated.search_vocabulary("receive")
+        assert results[0]['word'] == "receive"
+        assert {v['word'] for v in results} == {"receive", "run"}
+
+    def test_prefix_query(self, populated):
+        """Truy vấn kết thúc bằng '*' chỉ tìm từ bắt đầu bằng chuỗi đó"""
+        assert [v['word'] for v in populated.search_vocabulary("per*")] == ["perceive"]
+        assert [v['word'] for v in populated.search_vocabulary("de*")] == ["deceive"]
+
+    def test_index_follows_updates_and_deletes(self, populated):
+        """Trigger giữ chỉ mục đồng bộ khi sửa và xóa"""
+        vocab = populated.search_vocabulary("deceive")[0]
+        populated.update_vocabulary(vocab['id'], "mislead", "lừa dối")
+        assert populated.search_vocabulary("deceive") == []
+        assert [v['word'] for v in populated.search_vocabulary("mislead")] == ["mislead"]
+
+        populated.delete_vocabulary(vocab['id'])
+        assert populated.search_vocabulary("mislead") == []
+
+    def test_special_characters(self, populated):
+        """Dấu ngoặc kép trong truy vấn không gây lỗi cú pháp FTS"""
+        assert populated.search_vocabulary('re"ce') == []
+
+
+class TestPagination:
+    """Test cases cho đọc tuần tự và phân trang keyset"""
+
+    @pytest.fixture
+    def populated(self, manager):
+        # Các từ thêm trong cùng một giây có created_at trùng nhau
+        for i in range(25):
+            manager.add_vocabulary(f"word{i:02d}", f"nghĩa {i}")
+        return manager
+
+    def test_iter_vocabulary_matches_get_all(self, populated):
+        """iter_vocabulary trả về cùng thứ tự với get_all_vocabulary kể cả khi created_at trùng"""
+        streamed = list(populated.iter_vocabulary(batch_size=7))
+        assert len(streamed) == 25
+        assert [v['id'] for v in streamed] == [v['id'] for v in populated.get_all_vocabulary()]
+
+    @pytest.mark.parametrize("order", ["desc", "asc"])
+    def test_pages_cover_all_rows_once(self, populated, order):
+        """Các trang nối tiếp nhau không trùng, không sót kể cả khi created_at trùng"""
+        seen = []
+        after = None
+        while True:
+            page = populated.get_vocabulary_page(after=after, limit=10, order=order)
+            if not page:
+                break
+            seen.extend(v['id'] for v in page)
+            after = (page[-1]['created_at'], page[-1]['id'])
+
+        assert len(seen) == len(set(seen)) == 25
+        assert seen == sorted(seen, reverse=(order == "desc"))
+
+    def test_invalid_order(self, populated):
+        """order không hợp lệ bị từ chối"""
+        with pytest.raises(ValueError):
+            populated.get_vocabulary_page(order="sideways")
+
+
+class TestPointLookups:
+    """Test cases cho tra cứu theo id và theo từ"""
+
+    def test_get_by_id_and_word(self, manager):
+        """Tra theo id và theo từ trả về cùng một bản ghi"""
+        manager.add_vocabulary("apple", "quả táo")
+        vocab = manager.get_by_word("  apple ")
+
+        assert vocab['definition'] == "quả táo"
+        assert manager.get_vocabulary_by_id(vocab['id']) == vocab
+        assert manager.get_vocabulary_by_id(vocab['id'] + 100) is None
+        assert manager.get_by_word("banana") is None
+
+    def test_get_many_keeps_order(self, manager):
+        """get_many giữ thứ tự yêu cầu, bỏ id thiếu và id trùng"""
+        for word in ("a1", "b2", "c3"):
+            manager.add_vocabulary(word, word)
+        ids = {v['word']: v['id'] for v in manager.get_all_vocabulary()}
+
+        result = manager.get_many([ids["c3"], 9999, ids["a1"], ids["c3"]])
+        assert [v['word'] for v in result] == ["c3", "a1"]
+        assert manager.get_many([]) == []
+
+    def test_get_many_chunks_large_input(self, manager):
+        """Danh sách id dài hơn MAX_QUERY_PARAMS vẫn hoạt động"""
+        manager.add_vocabulary("only", "duy nhất")
+        vocab_id = manager.get_by_word("only")['id']
+        ids = list(range(vocab_id + 1, vocab_id + 2000)) + [vocab_id]
+
+        assert [v['word'] for v in manager.get_many(ids)] == ["only"]
+
+
+class TestBulkImport:
+    """Test cases cho nhập hàng loạt"""
+
+    def test_outcomes_per_row(self, manager):
+        """Mỗi hàng có một kết quả, từ trùng trong cùng lô bị bỏ qua"""
+        manager.add_vocabulary("run", "chạy")
+        outcomes = manager.add_vocabulary_many([
+            {'word': "run", 'definition': "chạy bộ"},
+            {'word': "walk", 'definition': "đi bộ"},
+            {'word': "walk", 'definition': "đi"},
+            {'word': "", 'definition': "trống"},
+            {'word': "fly"},
+        ])
+
+        assert [o.status for o in outcomes] == ["skipped", "inserted", "skipped", "invalid", "invalid"]
+        assert manager.get_by_word("run")['definition'] == "chạy"
+        assert manager.get_by_word("walk")['definition'] == "đi bộ"
+
+    def test_update_mode(self, manager):
+        """'update' ghi đè giá trị mới nhưng giữ giá trị cũ khi trường nhập trống"""
+        manager.add_vocabulary("run", "chạy", example="I run")
+        outcomes = manager.add_vocabulary_many(
+            [{'word': "run", 'definition': "chạy nhanh", 'example': ""}], on_conflict='update')
+
+        assert outcomes[0].status == "updated"
+        vocab = manager.get_by_word("run")
+        assert (vocab['definition'], vocab['example']) == ("chạy nhanh", "I run")
+
+    def test_fill_missing_mode(self, manager):
+        """'fill_missing' chỉ điền các trường đang trống"""
+        manager.add_vocabulary("run", "chạy")
+        manager.add_vocabulary_many(
+            [{'word': "run", 'definition': "khác", 'synonyms': "sprint"}], on_conflict='fill_missing')
+
+        vocab = manager.get_by_word("run")
+        assert (vocab['definition'], vocab['synonyms']) == ("chạy", "sprint")
+        assert [v['word'] for v in manager.search_vocabulary("sprint")] == ["run"]
+
+    def test_invalid_mode(self, manager):
+        """Chế độ xử lý trùng không hợp lệ bị từ chối"""
+        with pytest.raises(ValueError):
+            manager.add_vocabulary_many([], on_conflict="merge")
+
+
+class TestStats:
+    """Test cases cho bộ đếm thống kê"""
+
+    def _recount(self, manager):
+        conn = manager.db.get_connection()
+        total = conn.execute('SELECT COUNT(*) FROM vocabulary').fetchone()[0]
+        reviewed = conn.execute(
+            'SELECT COUNT(*) FROM vocabulary WHERE last_reviewed IS NOT NULL').fetchone()[0]
+        today = conn.execute(
+            "SELECT COUNT(*) FROM vocabulary WHERE DATE(created_at) = DATE('now')").fetchone()[0]
+        return {'total_words': total, 'reviewed_words': reviewed,
+                'unreviewed_words': total - reviewed, 'today_words': today}
+
+    def test_counters_stay_exact(self, manager):
+        """Bộ đếm khớp với COUNT(*) sau thêm, ôn tập, nhập hàng loạt và xóa"""
+        for word in ("a1", "b2", "c3"):
+            manager.add_vocabulary(word, word)
+        manager.add_vocabulary_many([{'word': "d4", 'definition': "d"}, {'word': "a1", 'definition': "x"}])
+        ids = [v['id'] for v in manager.get_all_vocabulary()]
+        manager.mark_as_reviewed(ids[0])
+        manager.mark_as_reviewed(ids[0])
+        manager.mark_as_reviewed(ids[1])
+        manager.delete_vocabulary(ids[1])
+        manager.delete_vocabulary(ids[2])
+
+        stats = manager.get_vocabulary_stats()
+        assert stats == self._recount(manager)
+        assert stats['total_words'] == 2
+        assert stats['reviewed_words'] == 1
+
+    def test_counters_seeded_for_existing_database(self, manager, tmp_path):
+        """Database cũ chưa có bảng bộ đếm được đếm lại một lần khi mở"""
+        manager.add_vocabulary("a1", "a")
+        manager.add_vocabulary("b2", "b")
+        conn = manager.db.get_connection()
+        conn.execute('DROP TABLE deck_stats')
+        for suffix in ('ai', 'ad', 'au'):
+            conn.execute(f'DROP TRIGGER deck_stats_{suffix}')
+        # Database tạo trước khi có migration có user_version = 0
+        conn.execute('PRAGMA user_version = 0')
+        manager.close()
+
+        reopened = VocabularyManager(manager.db_path)
+        assert reopened.get_vocabulary_stats()['total_words'] == 2
+        # Bộ đếm toàn kho cũ (migration 3) được bỏ khi có deck_stats
+        assert not reopened.db.get_connection().execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE 'vocabulary_stats%'").fetchall()
+        reopened.close()
+
+
+class TestRandomSampling:
+    """Test cases cho lấy mẫu ngẫu nhiên"""
+
+    @pytest.fixture
+    def sparse(self, manager):
+        """40 từ, xóa bớt để dãy id có khoảng trống"""
+        manager.add_vocabulary_many({'word': f"w{i:02d}", 'definition': "x"} for i in range(40))
+        for vocab_id in range(5, 41, 3):
+            manager.delete_vocabulary(vocab_id)
+        return manager
+
+    def test_distinct_and_existing(self, sparse):
+        """Mẫu không trùng lặp và chỉ gồm từ đang tồn tại"""
+        existing = {v['id'] for v in sparse.get_all_vocabulary()}
+        for _ in range(50):
+            sample = sparse.get_random_vocabulary(10)
+            ids = [v['id'] for v in sample]
+            assert len(ids) == len(set(ids)) == 10
+            assert set(ids) <= existing
+
+    def test_small_table_returns_everything(self, manager):
+        """Bảng nhỏ hơn limit trả về toàn bộ"""
+        manager.add_vocabulary("a1", "a")
+        manager.add_vocabulary("b2", "b")
+        assert {v['word'] for v in manager.get_random_vocabulary(10)} == {"a1", "b2"}
+        assert manager.get_random_vocabulary(0) == []
+
+    def test_uniform_distribution(self, sparse):
+        """Kiểm định chi bình phương: mọi từ có xác suất như nhau dù id có khoảng trống"""
+        random.seed(1234)
+        existing = [v['id'] for v in sparse.get_all_vocabulary()]
+        counts = dict.fromkeys(existing, 0)
+        draws = 3000
+        for _ in range(draws // 3):
+            for vocab in sparse.get_random_vocabulary(3):
+                counts[vocab['id']] += 1
+
+        expected = draws / len(existing)
+        chi_square = sum((observed - expected) ** 2 / expected for observed in counts.values())
+        # Giá trị tới hạn chi bình phương với 27 bậc tự do, p = 0.001
+        assert len(existing) == 28
+        assert chi_square < 55.5
+
+    def test_weighted_prefers_rarely_reviewed(self, sparse):
+        """Lấy mẫu có trọng số ưu tiên từ chưa ôn"""
+        random.seed(99)
+        ids = [v['id'] for v in sparse.get_all_vocabulary()]
+        drilled = set(ids[:14])
+        conn = sparse.db.get_connection()
+        with conn:
+            conn.executemany('UPDATE vocabulary SET review_count = 20 WHERE id = ?',
+                             [(vocab_id,) for vocab_id in drilled])
+
+        picks = [v['id'] for _ in range(200) for v in sparse.get_random_vocabulary(2, weighted=True)]
+        drilled_share = sum(vocab_id in drilled for vocab_id in picks) / len(picks)
+        assert drilled_share < 0.2
@@ -0,0 +1,57 @@
+"""
+Test cases cho VocabularyRecord
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.vocabulary_record import VocabularyRecord
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có một từ với ví dụ dài"""
+    manager.add_vocabulary("serendipity", "sự tình cờ may mắn",
+                           example="A fortunate accident. " * 20,
+                           context_sentences="Short context")
+    return manager
+
+
+class TestVocabularyRecord:
+    """Test cases cho bản ghi gọn nhẹ"""
+
+    def test_slots_without_dict(self):
+        """Bản ghi không có __dict__ riêng"""
+        record = VocabularyRecord({'id': 1, 'word': 'a'})
+        assert not hasattr(record, '__dict__')
+
+    def test_heavy_fields_loaded_lazily(self, manager):
+        """Cột nặng chỉ được nạp khi truy cập"""
+        record = manager.get_all_vocabulary()[0]
+        assert not record.heavy_loaded
+
+        assert record.preview('example') == ("A fortunate accident. " * 20)[:50] + "..."
+        assert record.preview('context_sentences') == "Short context"
+        assert not record.heavy_loaded
+
+        assert record['example'] == ("A fortunate accident. " * 20).strip()
+        assert record.heavy_loaded
+
+    def test_point_lookup_is_complete(self, manager):
+        """Tra cứu theo từ trả về bản ghi đã có cột nặng"""
+        record = manager.get_by_word("serendipity")
+        assert record.heavy_loaded
+        assert record.context_sentences == "Short context"
+
+    def test_dict_compatibility(self, manager):
+        """Bản ghi dùng được như dict cũ"""
+        record = manager.get_all_vocabulary()[0]
+        assert record.get('word') == "serendipity"
+        assert record.get('missing', 'x') == 'x'
+        assert 'definition' in record
+        assert dict(record) == record.to_dict() == manager.get_by_word("serendipity")
+        with pytest.raises(KeyError):
+            record['missing']
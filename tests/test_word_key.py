@@ -0,0 +1,106 @@
+"""
+Test cases cho khóa từ chuẩn hóa word_key
+"""
+
+import sqlite3
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.migrations import MIGRATIONS, migrate
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+from hello_world_app.core.word_key import find_duplicate_groups, merge_duplicates, normalize_word
+
+
+def old_database(tmp_path) -> str:
+    """Database trước migration word_key, có ba biến thể của 'run'"""
+    db_path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(db_path)
+    migrate(conn, MIGRATIONS[:5])
+    conn.executemany('''
+        INSERT INTO vocabulary (word, definition, example, review_count, last_reviewed, due_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [("Run", "chạy", "", 2, '2024-01-01 00:00:00', '2024-02-01 00:00:00'),
+          ("run", "chạy bộ", "I run.", 3, '2024-03-01 00:00:00', '2024-01-15 00:00:00'),
+          ("ＲＵＮ", "", "", 0, None, '2024-05-01 00:00:00'),
+          ("walk", "đi", "", 0, None, '2024-01-01 00:00:00')])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+class TestWordKey:
+    """Test cases cho chuẩn hóa và tra cứu theo word_key"""
+
+    def test_normalize_word(self):
+        """NFKC + casefold + gộp khoảng trắng"""
+        assert normalize_word("Run") == normalize_word(" run ") == normalize_word("ｒｕｎ") == "run"
+        assert normalize_word("Straße") == "strasse"
+        assert normalize_word("café") == normalize_word("café")
+        assert normalize_word("give   UP\t") == "give up"
+
+    def test_variants_are_duplicates(self, manager):
+        """Biến thể hoa/thường hoặc Unicode bị coi là trùng, tra cứu không phân biệt"""
+        assert manager.add_vocabulary("Run", "chạy")
+        assert not manager.add_vocabulary("ｒｕｎ", "chạy")
+        assert manager.get_by_word("RUN")['word'] == "Run"
+
+        outcomes = manager.add_vocabulary_many([{'word': "run ", 'definition': "chạy nhanh"},
+                                                {'word': "Walk", 'definition': "đi"},
+                                                {'word': "walk", 'definition': "đi bộ"}],
+                                               on_conflict='update')
+        assert [outcome.status for outcome in outcomes] == ['updated', 'inserted', 'updated']
+        assert manager.get_by_word("run")['definition'] == "chạy nhanh"
+        assert manager.get_by_word("WALK")['definition'] == "đi bộ"
+        assert manager.get_vocabulary_stats()['total_words'] == 2
+
+    def test_update_to_existing_key_fails(self, manager):
+        """Đổi từ thành biến thể của một từ khác bị từ chối"""
+        manager.add_vocabulary("alpha", "a")
+        manager.add_vocabulary("beta", "b")
+        assert not manager.update_vocabulary(manager.get_by_word("beta")['id'], "ALPHA", "b")
+
+    def test_migration_marks_duplicates(self, tmp_path):
+        """Nâng cấp không xóa từ trùng: bản cũ nhất giữ khóa, bản trùng có word_key NULL"""
+        upgraded = VocabularyManager(old_database(tmp_path))
+        try:
+            conn = upgraded.db.get_connection()
+            assert upgraded.get_vocabulary_stats()['total_words'] == 4
+            assert upgraded.get_by_word("run")['word'] == "Run"
+            assert conn.execute('SELECT word FROM vocabulary WHERE word_key IS NULL ORDER BY id'
+                                ).fetchall() == [("run",), ("ＲＵＮ",)]
+            assert [group[:2] for group in find_duplicate_groups(conn.cursor())] == [("run", 3)]
+        finally:
+            upgraded.close()
+
+    def test_merge_duplicates(self, tmp_path):
+        """Gộp các bản trùng đã đánh dấu vào bản cũ nhất, giữ lịch ôn của bản ôn nhiều nhất"""
+        upgraded = VocabularyManager(old_database(tmp_path))
+        try:
+            conn = upgraded.db.get_connection()
+            duplicate = conn.execute("SELECT id FROM vocabulary WHERE word = 'run'").fetchone()[0]
+            upgraded.add_tags([duplicate], ["verb"])
+            # Bản ôn nhiều nhất: lịch ôn của nó được giữ dù due_at không phải sớm nhất
+            with conn:
+                conn.execute("UPDATE vocabulary SET repetitions = 4, interval = 12, ease = 2.7, "
+                             "due_at = '2024-06-01 00:00:00' WHERE id = ?", (duplicate,))
+            with conn:
+                keepers = merge_duplicates(conn.cursor())
+            record = upgraded.get_by_word("run")
+            assert keepers == [record['id']]
+            assert record['word'] == "Run"
+            assert record['definition'] == "chạy"
+            assert record['example'] == "I run."
+            assert record['review_count'] == 5
+            assert record['last_reviewed'] == '2024-03-01 00:00:00'
+            assert record['due_at'] == '2024-06-01 00:00:00'
+            assert conn.execute('SELECT repetitions, interval, ease FROM vocabulary WHERE id = ?',
+                                (record['id'],)).fetchone() == (4, 12, 2.7)
+            assert upgraded.get_tags(record['id']) == ["verb"]
+            stats = upgraded.get_vocabulary_stats()
+            assert (stats['total_words'], stats['reviewed_words']) == (2, 1)
+            assert not find_duplicate_groups(conn.cursor())
+            assert conn.execute('SELECT COUNT(*) FROM vocabulary WHERE word_key IS NULL').fetchone()[0] == 0
+        finally:
+            upgraded.close()
@@ -0,0 +1,104 @@
+"""
+Test cases cho bảng quan hệ đồng nghĩa/trái nghĩa và đồ thị từ
+"""
+
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app import cli
+from hello_world_app.core.vocabulary_manager import VocabularyManager
+from hello_world_app.core.word_relations import ANTONYM, SYNONYM, split_related_words
+
+
+def relations(manager):
+    conn = manager.db.get_connection()
+    return sorted(conn.execute('SELECT word_key, relation, related_key FROM word_relations'))
+
+
+class TestWordRelations:
+    """Test cases cho việc tách và đồng bộ quan hệ"""
+
+    def test_split_related_words(self):
+        """Tách theo dấu phẩy/chấm phẩy/xuống dòng, bỏ trống và trùng khóa"""
+        assert split_related_words("glad,  Joyful ; joyful\n,cheerful ") == [
+            ('glad', 'glad'), ('joyful', 'Joyful'), ('cheerful', 'cheerful')]
+        assert split_related_words(None) == []
+
+    def test_kept_in_sync_with_writes(self, manager):
+        """Thêm, sửa, nhập và xóa đều cập nhật word_relations"""
+        manager.add_vocabulary("happy", "vui", synonyms="glad, happy", antonyms="sad")
+        vocab_id = manager.get_by_word("happy")['id']
+        assert relations(manager) == [('happy', ANTONYM, 'sad'), ('happy', SYNONYM, 'glad')]
+
+        manager.update_vocabulary(vocab_id, "Happy", "vui", synonyms="cheerful")
+        assert relations(manager) == [('happy', SYNONYM, 'cheerful')]
+
+        manager.add_vocabulary_many([{'word': "happy", 'definition': "vui", 'antonyms': "unhappy"},
+                                     {'word': "sad", 'definition': "buồn", 'antonyms': "happy"}],
+                                    on_conflict='update')
+        assert relations(manager) == [('happy', ANTONYM, 'unhappy'), ('happy', SYNONYM, 'cheerful'),
+                                      ('sad', ANTONYM, 'happy')]
+
+        manager.delete_vocabulary(vocab_id)
+        assert relations(manager) == [('sad', ANTONYM, 'happy')]
+
+    def test_backfill_existing_rows(self, manager):
+        """Migration tách quan hệ của các hàng có sẵn"""
+        manager.add_vocabulary_many([{'word': f"w{i}", 'definition': "d", 'synonyms': f"s{i}, t{i}"}
+                                     for i in range(10)])
+        conn = manager.db.get_connection()
+        with conn:
+            conn.execute('DROP TABLE word_relations')
+            conn.execute('PRAGMA user_version = 9')
+        manager.close()
+
+        reopened = VocabularyManager(manager.db_path)
+        try:
+            assert len(relations(reopened)) == 20
+            assert [v['word'] for v in reopened.get_words_listing("T3")] == ["w3"]
+        finally:
+            reopened.close()
+
+
+class TestWordGraph:
+    """Test cases cho duyệt đồ thị bằng CTE đệ quy"""
+
+    @pytest.fixture
+    def graph_manager(self, manager):
+        manager.add_vocabulary("happy", "vui", synonyms="glad, joyful", antonyms="sad")
+        manager.add_vocabulary("glad", "vui", synonyms="pleased")
+        manager.add_vocabulary("sad", "buồn", synonyms="unhappy")
+        manager.add_vocabulary("content", "hài lòng", synonyms="pleased")
+        return manager
+
+    def test_depth_bounded_neighbourhood(self, graph_manager):
+        """Đi theo cả cạnh ra và cạnh vào, dừng ở max_depth"""
+        graph = graph_manager.get_word_graph("Happy", max_depth=2)
+        depths = {node['key']: node['depth'] for node in graph['nodes']}
+        assert depths == {'happy': 0, 'glad': 1, 'joyful': 1, 'sad': 1, 'pleased': 2, 'unhappy': 2}
+        assert ('glad', SYNONYM, 'pleased') in graph['edges']
+        owned = {node['key'] for node in graph['nodes'] if node['vocab_id'] is not None}
+        assert owned == {'happy', 'glad', 'sad'}
+
+        # 'content' chỉ tới được qua cạnh vào của 'pleased'
+        deeper = graph_manager.get_word_graph("happy", max_depth=3, relations=[SYNONYM])
+        assert {node['key'] for node in deeper['nodes']} == {'happy', 'glad', 'joyful',
+                                                             'pleased', 'content'}
+
+    def test_invalid_arguments(self, graph_manager):
+        """Độ sâu hoặc loại quan hệ sai là lỗi lập trình"""
+        with pytest.raises(ValueError):
+            graph_manager.get_word_graph("happy", max_depth=VocabularyManager.GRAPH_MAX_DEPTH + 1)
+        with pytest.raises(ValueError):
+            graph_manager.get_word_graph("happy", relations=['hypernym'])
+
+    def test_cli(self, graph_manager, capsys):
+        """hello-world-vocab related in cây theo khoảng cách"""
+        graph_manager.close()
+
+        assert cli.main(['--db', graph_manager.db_path, 'related', 'happy', '--depth', '1']) == 0
+
+        assert "\nglad *\njoyful\nsad *\n" in capsys.readouterr().out
@@ -0,0 +1,97 @@
+"""
+Test cases cho WriteBuffer
+"""
+
+import pytest
+import sys
+import threading
+
+# Add src to path for testing
+sys.path.insert(0, 'src')
+
+from hello_world_app.core.write_buffer import WriteBuffer
+
+
+@pytest.fixture
+def manager(manager):
+    """VocabularyManager có vài từ"""
+    for word in ("alpha", "beta", "gamma"):
+        manager.add_vocabulary(word, f"nghĩa của {word}")
+    return manager
+
+
+def vocab_ids(manager):
+    return {vocab['word']: vocab['id'] for vocab in manager.get_all_vocabulary()}
+
+
+class TestWriteBuffer:
+    """Test cases cho việc gom thao tác ghi"""
+
+    def test_review_burst_uses_few_commits(self, manager):
+        """500 lần ôn tập liên tiếp chỉ tốn vài lần commit"""
+        ids = list(vocab_ids(manager).values())
+        buffer = WriteBuffer(manager, flush_interval_ms=10000, max_operations=100)
+        for i in range(500):
+            buffer.mark_as_reviewed(ids[i % len(ids)])
+        buffer.close()
+
+        assert buffer.commits <= 5
+        assert buffer.pending == 0
+        total = sum(vocab['review_count'] for vocab in manager.get_all_vocabulary())
+        assert total == 500
+
+    def test_flush_on_interval(self, manager):
+        """Lô chưa đầy vẫn được ghi sau flush_interval_ms"""
+        vocab_id = vocab_ids(manager)['alpha']
+        done = threading.Event()
+        results = []
+
+        def on_done(result):
+            results.append(result)
+            done.set()
+
+        buffer = WriteBuffer(manager, flush_interval_ms=20, max_operations=100)
+        try:
+            buffer.grade(vocab_id, 5, callback=on_done)
+            assert done.wait(timeout=5)
+        finally:
+            buffer.close()
+
+        assert results == [True]
+        assert buffer.commits == 1
+        assert manager.get_vocabulary_by_id(vocab_id)['repetitions'] == 1
+
+    def test_flush_applies_in_order(self, manager):
+        """flush() ghi ngay, theo đúng thứ tự gửi và trả kết quả từng thao tác"""
+        ids = vocab_ids(manager)
+        results = {}
+        buffer = WriteBuffer(manager, flush_interval_ms=10000)
+        try:
+            buffer.update_vocabulary(ids['beta'], "beta", "nghĩa mới",
+                                     callback=lambda ok: results.setdefault('update', ok))
+            buffer.delete_vocabulary(ids['beta'], callback=lambda ok: results.setdefault('delete', ok))
+            buffer.mark_as_reviewed(ids['beta'], callback=lambda ok: results.setdefault('review', ok))
+            assert buffer.flush() == 3
+        finally:
+            buffer.close()
+
+        assert results == {'update': True, 'delete': True, 'review': False}
+        assert 'beta' not in vocab_ids(manager)
+
+    def test_invalid_arguments(self, manager):
+        """Tham số sai bị từ chối ngay khi gửi, không đợi tới lúc ghi"""
+        with pytest.raises(ValueError):
+            WriteBuffer(manager, durability='sometimes')
+
+        buffer = WriteBuffer(manager, durability='full')
+        try:
+            with pytest.raises(ValueError):
+                buffer.grade(1, 9)
+            with pytest.raises(ValueError):
+                buffer.submit('add_vocabulary', "delta", "nghĩa")
+            assert buffer.pending == 0
+        finally:
+            buffer.close()
+
+        with pytest.raises(RuntimeError):
+            buffer.mark_as_reviewed(1)